@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import json
 from datetime import datetime, timezone
 from uuid import uuid4
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 
 from db.supabase import (
     check_free_limit,
@@ -26,14 +28,34 @@ from models.schemas import (
     RecomputeQueriesResponse,
     MonitoringJobStatusResponse,
 )
-from services.analyzer import run_analysis
-from services.monitoring_runner import get_monitoring_job_status, start_onboarding_job
+from services.analyzer import run_analysis, stream_analysis
+from services.monitoring_runner import (
+    estimate_job_duration_sec,
+    get_monitoring_job_status,
+    job_registry_stats,
+    start_onboarding_job,
+    stream_job_events,
+)
 from services.onboarding_suggester import (
-    infer_business_profile,
-    suggest_competitors,
+    bootstrap_onboarding,
     suggest_queries,
 )
+from services import (
+    openai_service,
+    perplexity_service,
+    query_capture as query_capture_service,
+    scraper,
+)
+from services.capture_scheduler import capture_scheduler
+from services.competitor_catalog import competitor_catalog
+from services.domain_cache import domain_cache
+from services.job_events import job_events
+from services.job_queue import job_queue
+from services.monitoring_scheduler import monitoring_scheduler
 from services.query_capture import run_query_capture
+from services.rate_limiter import openai_limiter, perplexity_limiter
+from services.response_cache import response_cache
+from services.suggestion_cache import suggestion_cache
 
 router = APIRouter()
 
@@ -68,6 +90,46 @@ async def analyze(request: AnalysisRequest):
     return result
 
 
+@router.post("/analyze/stream")
+async def analyze_stream(request: AnalysisRequest):
+    """Run a free analysis and stream scored mentions as Server-Sent Events."""
+    if not request.url and not request.prompt and not request.brand_name:
+        raise HTTPException(
+            status_code=400,
+            detail="Oppgi en URL, et søkeord, eller et merkevarenavn.",
+        )
+
+    allowed = await check_free_limit(request.email)
+    if not allowed:
+        raise HTTPException(
+            status_code=429,
+            detail="Du har allerede brukt din gratis analyse. Opprett en konto for flere analyser.",
+        )
+
+    async def events():
+        result = None
+        try:
+            async for event in stream_analysis(request):
+                if event["event"] == "result":
+                    result = event["data"]
+                yield _sse(event["event"], event["data"])
+        except ValueError as exc:
+            yield _sse("error", {"detail": str(exc)})
+            return
+        except Exception as exc:
+            yield _sse("error", {"detail": f"Analysefeil: {str(exc)}"})
+            return
+
+        if result is not None:
+            await store_analysis(request.email, result)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/query-capture", response_model=QueryCaptureResult)
 async def query_capture(request: QueryCaptureRequest):
     """Run exact query capture mode for free-text prompts."""
@@ -103,9 +165,9 @@ async def onboarding_bootstrap(request: OnboardingBootstrapRequest):
         raise HTTPException(status_code=400, detail="Oppgi et virksomhetsnavn eller nettadresse.")
 
     try:
-        profile = await infer_business_profile(raw_input, request.locale)
-        competitors = await suggest_competitors(profile, limit=8)
-        queries = await suggest_queries(profile, competitors[:5], limit=12)
+        profile, competitors, queries = await bootstrap_onboarding(
+            raw_input, request.locale, competitor_limit=8, query_limit=12
+        )
         return OnboardingBootstrapResponse(
             profile=profile,
             suggested_competitors=competitors,
@@ -174,7 +236,9 @@ async def onboarding_complete(request: OnboardingCompleteRequest):
     if stored_id:
         config_id = stored_id
 
-    estimated_duration_sec = max(30, len(request.active_queries) * len(request.platforms) * 8)
+    estimated_duration_sec = await estimate_job_duration_sec(
+        request.active_queries, request.platforms
+    )
 
     job_id: str | None = None
     status = "configured"
@@ -206,6 +270,56 @@ async def onboarding_job_status(job_id: str):
     return job
 
 
+@router.get("/onboarding/jobs/{job_id}/events")
+async def onboarding_job_events(job_id: str):
+    """Stream job progress, top entities and completion as Server-Sent Events."""
+    job = await get_monitoring_job_status(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Jobben finnes ikke.")
+
+    async def events():
+        async for event in stream_job_events(job_id):
+            if event["event"] == "keepalive":
+                # Comment line: keeps proxies from closing an idle stream.
+                yield ": keepalive\n\n"
+                continue
+            yield _sse(event["event"], event["data"])
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
 @router.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+@router.get("/metrics")
+async def metrics():
+    """Expose in-process cache, call-coalescing, rate limiter and retry counters."""
+    return {
+        "monitoring_jobs": job_registry_stats(),
+        "capture_scheduler": capture_scheduler.stats,
+        "competitor_catalog": competitor_catalog.stats,
+        "domain_cache": domain_cache.stats,
+        "job_events": job_events.stats,
+        "job_queue": await job_queue.stats() if job_queue is not None else {"backend": "inline"},
+        "monitoring_scheduler": monitoring_scheduler.stats,
+        "onboarding_suggestions": suggestion_cache.stats,
+        "rate_limiters": [openai_limiter.stats, perplexity_limiter.stats],
+        "retries": [openai_service.retry_policy.stats, perplexity_service.retry_policy.stats],
+        "response_cache": response_cache.stats,
+        "single_flight": [
+            openai_service.batch_flight.stats,
+            perplexity_service.batch_flight.stats,
+            query_capture_service.platform_flight.stats,
+            scraper.scrape_flight.stats,
+        ],
+    }
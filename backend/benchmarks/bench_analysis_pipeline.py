@@ -0,0 +1,96 @@
+"""End-to-end /analyze latency: score-after-gather vs as_completed pipeline.
+
+Providers are replaced by delayed stubs returning long answers, so scoring
+CPU time is comparable to the network wait. Run from the backend directory:
+
+    python -m benchmarks.bench_analysis_pipeline --runs 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from models.schemas import AnalysisRequest
+from services import analyzer
+from services.query_generator import generate_queries
+from services.scoring import analyze_response, calculate_visibility_score
+
+BRAND = "Grov Sykkel"
+_PARAGRAPH = (
+    "Grov Sykkel er en anbefalt og pålitelig sykkelbutikk i Bergen, men noen "
+    "kunder nevner at prisene kan være dyre sammenlignet med konkurrenter. "
+)
+
+
+def _stub_provider(seed: int, response_chars: int, max_delay_sec: float):
+    rng = random.Random(seed)
+    body = (_PARAGRAPH * (response_chars // len(_PARAGRAPH) + 1))[:response_chars]
+
+    async def query(text: str) -> dict:
+        await asyncio.sleep(rng.uniform(0.05, max_delay_sec))
+        return {
+            "query": text,
+            "model": "stub",
+            "response": f"1. {BRAND}\n2. Bergen Bike Shop\n{body} https://grovsykkel.no",
+            "citations": ["https://grovsykkel.no"],
+            "error": None,
+        }
+
+    return query
+
+
+async def _score_after_gather(openai_query, perplexity_query) -> float:
+    # Previous behaviour: wait for every answer, then score in two loops.
+    queries = generate_queries(BRAND)
+    chatgpt, perplexity = await asyncio.gather(
+        asyncio.gather(*[openai_query(q) for q in queries]),
+        asyncio.gather(*[perplexity_query(q) for q in queries]),
+    )
+    analyses = [analyze_response(r["response"], BRAND) for r in chatgpt]
+    analyses += [analyze_response(r["response"], BRAND) for r in perplexity]
+    return calculate_visibility_score(analyses)
+
+
+async def _time(coro_factory, runs: int) -> list[float]:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await coro_factory()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def main(runs: int, response_chars: int, max_delay_sec: float) -> None:
+    request = AnalysisRequest(email="bench@example.com", brand_name=BRAND)
+
+    openai_stub = _stub_provider(1, response_chars, max_delay_sec)
+    perplexity_stub = _stub_provider(2, response_chars, max_delay_sec)
+    before = await _time(lambda: _score_after_gather(openai_stub, perplexity_stub), runs)
+
+    openai_stub = _stub_provider(1, response_chars, max_delay_sec)
+    perplexity_stub = _stub_provider(2, response_chars, max_delay_sec)
+    with patch.object(analyzer, "openai_query", openai_stub), patch.object(
+        analyzer, "perplexity_query", perplexity_stub
+    ):
+        after = await _time(lambda: analyzer.run_analysis(request), runs)
+
+    print(f"score after gather   mean={statistics.mean(before):8.2f}ms")
+    print(f"as_completed pipeline mean={statistics.mean(after):8.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--response-chars", type=int, default=400_000)
+    parser.add_argument("--max-delay", type=float, default=0.5)
+    args = parser.parse_args()
+    asyncio.run(main(args.runs, args.response_chars, args.max_delay))
@@ -0,0 +1,93 @@
+"""Per-query latency of Perplexity calls: fresh client per call vs shared pool.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_perplexity_client --queries 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx
+
+from benchmarks.stub_server import start_stub_server
+from config import settings
+from services import perplexity_service
+
+
+async def _fresh_client_query(url: str, query: str) -> None:
+    # Mirrors the previous implementation: one AsyncClient per query.
+    async with httpx.AsyncClient(timeout=30) as client:
+        resp = await client.post(
+            url,
+            json={
+                "model": perplexity_service.PERPLEXITY_MODEL,
+                "messages": [{"role": "user", "content": query}],
+            },
+        )
+        resp.raise_for_status()
+        resp.json()
+
+
+async def _shared_client_query(query: str) -> None:
+    result = await perplexity_service.query_perplexity(query)
+    if result["error"]:
+        raise RuntimeError(result["error"])
+
+
+async def _measure(call, queries: list[str], concurrency: int) -> list[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def run(query: str) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await call(query)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*[run(q) for q in queries])
+    return latencies
+
+
+def _report(label: str, latencies: list[float]) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(
+        f"{label:<16} n={len(ordered):<5} mean={statistics.mean(ordered):7.2f}ms "
+        f"p50={statistics.median(ordered):7.2f}ms p95={p95:7.2f}ms"
+    )
+
+
+async def main(queries: int, concurrency: int) -> None:
+    server, base_url = start_stub_server()
+    url = f"{base_url}/chat/completions"
+    settings.perplexity_api_key = settings.perplexity_api_key or "bench"
+    perplexity_service.PERPLEXITY_API_URL = url
+    payload = [f"beste sykkelbutikk i Bergen {idx}" for idx in range(queries)]
+
+    try:
+        before = await _measure(lambda q: _fresh_client_query(url, q), payload, concurrency)
+        await perplexity_service.open_http_client()
+        after = await _measure(_shared_client_query, payload, concurrency)
+    finally:
+        await perplexity_service.close_http_client()
+        server.shutdown()
+
+    _report("fresh client", before)
+    _report("shared pool", after)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.queries, args.concurrency))
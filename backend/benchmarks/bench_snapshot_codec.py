@@ -0,0 +1,135 @@
+"""Snapshot payload size and encode/decode time: model_dump vs compact codec.
+
+Builds a synthetic monitoring snapshot (queries x platforms with long
+answers and ranked entities). Run from the backend directory:
+
+    python -m benchmarks.bench_snapshot_codec --queries 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from models.schemas import (
+    BusinessProfile,
+    EntityIndexItem,
+    ModelOutput,
+    MonitoringSnapshot,
+    Platform,
+    QueryCaptureResult,
+    SuggestedQuery,
+)
+from services.query_capture import build_snippet
+from services.snapshot_codec import decode_snapshot, encode_snapshot
+
+_PARAGRAPH = (
+    "Grov Sykkel er en anbefalt sykkelbutikk i Bergen med godt utvalg og service. "
+    "Bergen Bike Shop og Sykkelhuset er også populære alternativer i området. "
+)
+
+
+def _snapshot(queries: int, answer_chars: int, entities_per_output: int) -> MonitoringSnapshot:
+    runs = []
+    for q in range(queries):
+        text = f"beste sykkelbutikk i Bergen {q}"
+        outputs = []
+        entity_index = []
+        for platform in (Platform.CHATGPT, Platform.PERPLEXITY):
+            body = (f"{platform.value} {q}: " + _PARAGRAPH * (answer_chars // len(_PARAGRAPH)))
+            outputs.append(
+                ModelOutput(
+                    platform=platform,
+                    model="stub",
+                    query=text,
+                    raw_output=body,
+                    snippet=build_snippet(body),
+                    citations=["https://grovsykkel.no", "https://bergenbike.no"],
+                )
+            )
+            entity_index.extend(
+                EntityIndexItem(
+                    platform=platform,
+                    entity=f"Aktør {index}",
+                    position=index + 1,
+                    mention_type="list",
+                    sentiment="neutral",
+                    confidence=0.9,
+                )
+                for index in range(entities_per_output)
+            )
+        runs.append(
+            QueryCaptureResult(
+                query=text,
+                query_normalized=text.lower(),
+                run_id=f"run_{q}",
+                created_at="2026-10-18T00:00:00+00:00",
+                outputs=outputs,
+                entity_index=entity_index,
+                summary="ok",
+            )
+        )
+    return MonitoringSnapshot(
+        config_id="config_1",
+        run_id="run",
+        created_at="2026-10-18T00:00:00+00:00",
+        profile=BusinessProfile(
+            business_name="Grov Sykkel", industry="bike_shop", size_band="local"
+        ),
+        selected_competitors=[],
+        active_queries=[
+            SuggestedQuery(text=run.query, category="local_discovery", priority=1) for run in runs
+        ],
+        platforms=[Platform.CHATGPT, Platform.PERPLEXITY],
+        query_runs=runs,
+        aggregated_entities=[row for run in runs for row in run.entity_index],
+        summary="ok",
+    )
+
+
+def _time(fn, runs: int) -> float:
+    started = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    return (time.perf_counter() - started) / runs * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--answer-chars", type=int, default=3000)
+    parser.add_argument("--entities", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    snapshot = _snapshot(args.queries, args.answer_chars, args.entities)
+    plain = snapshot.model_dump()
+    compact = encode_snapshot(snapshot)
+
+    plain_bytes = len(json.dumps(plain, ensure_ascii=False).encode("utf-8"))
+    compact_bytes = len(json.dumps(compact, ensure_ascii=False).encode("utf-8"))
+    print(
+        f"payload   model_dump {plain_bytes / 1024:8.1f} KiB  "
+        f"compact {compact_bytes / 1024:8.1f} KiB"
+    )
+
+    encode_plain = _time(
+        lambda: json.dumps(snapshot.model_dump(), ensure_ascii=False), args.runs
+    )
+    encode_compact = _time(
+        lambda: json.dumps(encode_snapshot(snapshot), ensure_ascii=False), args.runs
+    )
+    print(f"encode    model_dump {encode_plain:8.2f} ms   compact {encode_compact:8.2f} ms")
+
+    decode_plain = _time(lambda: MonitoringSnapshot(**plain), args.runs)
+    decode_compact = _time(lambda: decode_snapshot(compact), args.runs)
+    print(f"decode    validate   {decode_plain:8.2f} ms   compact {decode_compact:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
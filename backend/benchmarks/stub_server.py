@@ -0,0 +1,48 @@
+"""Local HTTP stub that mimics provider endpoints for benchmarks."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    delay_sec = 0.0
+
+    def do_POST(self):  # noqa: N802 - http.server naming
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b"{}"
+        try:
+            query = json.loads(raw)["messages"][-1]["content"]
+        except Exception:
+            query = ""
+        if self.delay_sec:
+            time.sleep(self.delay_sec)
+        body = json.dumps(
+            {
+                "choices": [{"message": {"content": f"1. Stub svar for {query}"}}],
+                "citations": ["https://example.no"],
+            }
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002 - http.server signature
+        return
+
+
+def start_stub_server(delay_sec: float = 0.0) -> tuple[ThreadingHTTPServer, str]:
+    """Start a stub server on a free port and return it with its base URL."""
+    handler = type("StubHandler", (_StubHandler,), {"delay_sec": delay_sec})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
@@ -9,6 +9,9 @@ class Settings(BaseSettings):
     # Supabase
     supabase_url: str = ""
     supabase_key: str = ""
+    supabase_max_workers: int = 8
+    query_run_flush_rows: int = 50
+    query_run_flush_interval_sec: float = 2.0
 
     # CORS
     frontend_url: str = "http://localhost:3000"
@@ -16,6 +19,87 @@ class Settings(BaseSettings):
     # Rate limiting
     free_analysis_limit: int = 1
 
+    # Perplexity HTTP client pool (shared for the app lifetime)
+    perplexity_timeout_sec: float = 30.0
+    perplexity_http2: bool = True
+    perplexity_max_connections: int = 20
+    perplexity_max_keepalive_connections: int = 10
+    perplexity_keepalive_expiry_sec: float = 30.0
+
+    # Provider rate limits (process-wide; a tpm of 0 disables the token budget)
+    openai_rpm: int = 500
+    openai_tpm: int = 200_000
+    openai_max_concurrency: int = 32
+    openai_completion_tokens_estimate: int = 1200
+    perplexity_rpm: int = 50
+    perplexity_tpm: int = 0
+    perplexity_max_concurrency: int = 16
+    perplexity_completion_tokens_estimate: int = 800
+    provider_min_concurrency: int = 1
+
+    # Provider retries and hedged requests (hedges duplicate paid calls; opt in)
+    provider_max_attempts: int = 3
+    provider_retry_base_delay_sec: float = 0.5
+    provider_retry_max_delay_sec: float = 8.0
+    provider_retry_budget_ratio: float = 0.2
+    provider_hedge_enabled: bool = False
+    provider_hedge_min_samples: int = 20
+
+    # Monitoring jobs
+    monitoring_job_registry_max: int = 500
+    monitoring_job_ttl_sec: float = 3600.0
+    # Job event streams (SSE): keepalive comment and idle cut-off
+    job_events_keepalive_sec: float = 15.0
+    job_events_idle_timeout_sec: float = 10 * 60
+
+    # Recurring monitoring runs (enable in one API process only)
+    monitoring_scheduler_enabled: bool = False
+    monitoring_default_cadence_sec: float = 24 * 60 * 60
+    monitoring_schedule_jitter_ratio: float = 0.1
+    monitoring_scheduler_poll_sec: float = 60.0
+    # Scheduled runs re-query a sample and carry the rest forward unless it drifted
+    monitoring_delta_enabled: bool = True
+    monitoring_delta_sample_ratio: float = 0.25
+    monitoring_delta_drift_threshold: float = 0.2
+    # A query is re-captured after being carried this many runs in a row
+    monitoring_delta_max_carries: int = 3
+
+    # Monitoring job queue ("inline" runs jobs inside the API process)
+    job_queue_backend: str = "inline"
+    job_queue_path: str = "monitoring_jobs.sqlite3"
+    job_queue_lease_sec: float = 60.0
+    job_queue_poll_interval_sec: float = 1.0
+    job_queue_max_attempts: int = 3
+
+    # Provider response cache (path enables the SQLite tier)
+    llm_cache_enabled: bool = True
+    llm_cache_ttl_sec: float = 6 * 60 * 60
+    llm_cache_max_entries: int = 2048
+    llm_cache_path: str = ""
+
+    # Onboarding suggestion cache (profile / competitor / query LLM calls)
+    onboarding_cache_enabled: bool = True
+    onboarding_cache_ttl_sec: float = 6 * 60 * 60
+    onboarding_cache_max_entries: int = 1024
+
+    # Competitor catalog (bundled CSV unless a path is set). Entries learned by
+    # whichever process runs monitoring jobs are appended to the learned path
+    # (shared file, locked appends) and re-read by the other processes
+    competitor_catalog_path: str = ""
+    competitor_catalog_learned_path: str = ""
+    # Bootstraps skip the competitor LLM call with this many hits in the
+    # business's market (city/region, or national for country-scope businesses)
+    competitor_catalog_min_candidates: int = 5
+    competitor_catalog_promote_mentions: int = 3
+
+    # Brand scraping (only the <head> of a page is read)
+    scraper_timeout_sec: float = 10.0
+    scraper_max_head_bytes: int = 256 * 1024
+    domain_cache_ttl_sec: float = 24 * 60 * 60
+    domain_cache_stale_sec: float = 7 * 24 * 60 * 60
+    domain_cache_negative_ttl_sec: float = 10 * 60
+    domain_cache_max_entries: int = 4096
+
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
 
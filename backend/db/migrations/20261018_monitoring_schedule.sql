@@ -0,0 +1,2 @@
+alter table monitoring_configs add column if not exists cadence_sec integer;
+alter table monitoring_configs add column if not exists schedule_enabled boolean not null default true;
@@ -0,0 +1 @@
+alter table query_runs add column if not exists carried boolean not null default false;
@@ -1,9 +1,13 @@
 """Supabase client for storing analyses and onboarding monitoring payloads."""
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 from supabase import create_client
 from config import settings
 
 _client = None
+_executor: ThreadPoolExecutor | None = None
 
 
 def get_client():
@@ -17,6 +21,34 @@ def get_client():
     return _client
 
 
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.supabase_max_workers),
+            thread_name_prefix="supabase",
+        )
+    return _executor
+
+
+async def _execute(request):
+    """Run a blocking PostgREST request on the bounded DB executor.
+
+    The supabase client is synchronous, so calling ``.execute()`` directly
+    would stall the event loop for the whole network round trip.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), request.execute)
+
+
+def shutdown_executor() -> None:
+    """Release the DB executor threads (called from the app lifespan)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+
+
 async def check_free_limit(email: str) -> bool:
     """Check if this email has already used their free analysis."""
     client = get_client()
@@ -24,11 +56,10 @@ async def check_free_limit(email: str) -> bool:
         # No Supabase configured — allow (dev mode)
         return True
 
-    result = (
+    result = await _execute(
         client.table("free_analyses")
         .select("id")
         .eq("email", email.lower())
-        .execute()
     )
     return len(result.data) < settings.free_analysis_limit
 
@@ -39,17 +70,19 @@ async def store_analysis(email: str, result: dict) -> None:
     if not client:
         return
 
-    client.table("free_analyses").insert(
-        {
-            "email": email.lower(),
-            "brand_name": result.get("brand_name", ""),
-            "domain": result.get("domain", ""),
-            "visibility_score": result.get("visibility_score", 0),
-            "total_mentions": result.get("total_mentions", 0),
-            "total_citations": result.get("total_citations", 0),
-            "result_json": result,
-        }
-    ).execute()
+    await _execute(
+        client.table("free_analyses").insert(
+            {
+                "email": email.lower(),
+                "brand_name": result.get("brand_name", ""),
+                "domain": result.get("domain", ""),
+                "visibility_score": result.get("visibility_score", 0),
+                "total_mentions": result.get("total_mentions", 0),
+                "total_citations": result.get("total_citations", 0),
+                "result_json": result,
+            }
+        )
+    )
 
 
 async def store_query_capture(
@@ -60,9 +93,18 @@ async def store_query_capture(
     if not client:
         return
 
+    rows = build_query_run_rows(email, result, metadata)
+    if rows:
+        await store_query_run_rows(rows)
+
+
+def build_query_run_rows(
+    email: str, result: dict, metadata: dict | None = None
+) -> list[dict]:
+    """Build one ``query_runs`` row per platform output of a capture result."""
     outputs = result.get("outputs") or []
     if not outputs:
-        return
+        return []
 
     query = result.get("query", "")
     query_normalized = result.get("query_normalized") or _normalize_query(query)
@@ -77,28 +119,130 @@ async def store_query_capture(
             continue
         platform_index.setdefault(platform, []).append(row)
 
+    rows: list[dict] = []
     for output in outputs:
         platform = output.get("platform", "")
-        payload = {
-            "email": email_normalized,
-            "query": query,
-            "query_normalized": query_normalized,
-            "platform": platform,
-            "model": output.get("model", ""),
-            "raw_output": output.get("raw_output", ""),
-            "citations_json": output.get("citations") or [],
-            "entity_index_json": platform_index.get(platform, []),
-            "created_at": created_at,
-            "config_id": metadata.get("config_id"),
-            "job_id": metadata.get("job_id"),
-            "query_category": metadata.get("query_category"),
-            "scope_level": metadata.get("scope_level"),
-        }
+        rows.append(
+            {
+                "email": email_normalized,
+                "query": query,
+                "query_normalized": query_normalized,
+                "platform": platform,
+                "model": output.get("model", ""),
+                "raw_output": output.get("raw_output", ""),
+                "citations_json": output.get("citations") or [],
+                "entity_index_json": platform_index.get(platform, []),
+                "created_at": created_at,
+                "config_id": metadata.get("config_id"),
+                "job_id": metadata.get("job_id"),
+                "query_category": metadata.get("query_category"),
+                "scope_level": metadata.get("scope_level"),
+                "carried": bool(metadata.get("carried")),
+            }
+        )
+    return rows
+
+
+async def store_query_run_rows(rows: list[dict]) -> int:
+    """Insert ``query_runs`` rows in one request and return how many were stored.
+
+    If the multi-row insert fails, rows are retried one by one so a single bad
+    row does not lose the rest of the batch.
+    """
+    client = get_client()
+    if not client or not rows:
+        return 0
+
+    try:
+        await _execute(client.table("query_runs").insert(rows))
+        return len(rows)
+    except Exception:
+        pass
+
+    stored = 0
+    for row in rows:
         try:
-            client.table("query_runs").insert(payload).execute()
+            await _execute(client.table("query_runs").insert(row))
+            stored += 1
         except Exception:
             # Keep API responses resilient when optional table/indexes are missing.
             continue
+    return stored
+
+
+class QueryRunWriteBuffer:
+    """Write-behind buffer that flushes ``query_runs`` rows in batches.
+
+    Rows from many captures are collected and inserted together once
+    ``max_rows`` are pending or ``flush_interval_sec`` has passed since the
+    first pending row, whichever comes first. Call ``close`` to flush the rest.
+    """
+
+    def __init__(
+        self,
+        max_rows: int | None = None,
+        flush_interval_sec: float | None = None,
+    ):
+        self.max_rows = max(1, max_rows or settings.query_run_flush_rows)
+        self.flush_interval_sec = (
+            settings.query_run_flush_interval_sec
+            if flush_interval_sec is None
+            else flush_interval_sec
+        )
+        self._pending: list[dict] = []
+        self._timer: asyncio.Task | None = None
+        self.flushes = 0
+        self.stored_rows = 0
+
+    async def add(
+        self, email: str, result: dict, metadata: dict | None = None
+    ) -> None:
+        rows = build_query_run_rows(email, result, metadata)
+        if not rows:
+            return
+        self._pending.extend(rows)
+        if len(self._pending) >= self.max_rows:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def flush(self) -> None:
+        self._cancel_timer()
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        self.flushes += 1
+        self.stored_rows += await store_query_run_rows(rows)
+
+    async def close(self) -> None:
+        await self.flush()
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval_sec)
+        self._timer = None
+        await self.flush()
+
+    def _cancel_timer(self) -> None:
+        timer, self._timer = self._timer, None
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+
+
+async def fetch_query_runs(job_id: str) -> list[dict]:
+    """Fetch the ``query_runs`` rows already stored for a monitoring job."""
+    client = get_client()
+    if not client:
+        return []
+
+    try:
+        resp = await _execute(
+            client.table("query_runs")
+            .select("query, query_normalized, platform, model, raw_output, citations_json")
+            .eq("job_id", job_id)
+        )
+    except Exception:
+        return []
+    return [row for row in resp.data or [] if isinstance(row, dict)]
 
 
 async def store_monitoring_config(email: str, payload: dict) -> str | None:
@@ -118,7 +262,7 @@ async def store_monitoring_config(email: str, payload: dict) -> str | None:
         "created_at": payload.get("created_at"),
     }
     try:
-        resp = client.table("monitoring_configs").insert(data).execute()
+        resp = await _execute(client.table("monitoring_configs").insert(data))
         rows = resp.data or []
         if rows and isinstance(rows[0], dict):
             return rows[0].get("id")
@@ -127,20 +271,105 @@ async def store_monitoring_config(email: str, payload: dict) -> str | None:
     return None
 
 
-async def store_monitoring_job(payload: dict) -> None:
-    """Store monitoring job status updates when the optional table exists."""
+async def fetch_monitoring_configs() -> list[dict]:
+    """Fetch stored monitoring configs that are enabled for scheduled runs."""
     client = get_client()
     if not client:
-        return
+        return []
 
     try:
-        client.table("monitoring_jobs").upsert(payload, on_conflict="job_id").execute()
+        resp = await _execute(
+            client.table("monitoring_configs").select("*").eq("schedule_enabled", True)
+        )
+    except Exception:
+        return []
+    return [row for row in resp.data or [] if isinstance(row, dict)]
+
+
+async def load_latest_job_created_at(config_id: str) -> str | None:
+    """Return when the most recent monitoring job for a config was created."""
+    client = get_client()
+    if not client:
+        return None
+
+    try:
+        resp = await _execute(
+            client.table("monitoring_jobs")
+            .select("created_at")
+            .eq("config_id", config_id)
+            .order("created_at", desc=True)
+            .limit(1)
+        )
+    except Exception:
+        return None
+    rows = resp.data or []
+    if rows and isinstance(rows[0], dict):
+        return rows[0].get("created_at")
+    return None
+
+
+async def load_latest_snapshot(config_id: str) -> dict | None:
+    """Load the snapshot of the most recent completed job for a config."""
+    client = get_client()
+    if not client:
+        return None
+
+    try:
+        resp = await _execute(
+            client.table("monitoring_jobs")
+            .select("snapshot_json")
+            .eq("config_id", config_id)
+            .eq("status", "completed")
+            .order("created_at", desc=True)
+            .limit(1)
+        )
+    except Exception:
+        return None
+    rows = resp.data or []
+    if rows and isinstance(rows[0], dict) and isinstance(rows[0].get("snapshot_json"), dict):
+        return rows[0]["snapshot_json"]
+    return None
+
+
+async def store_monitoring_job(payload: dict) -> bool:
+    """Store monitoring job status updates when the optional table exists.
+
+    Returns True when the payload was persisted.
+    """
+    client = get_client()
+    if not client:
+        return False
+
+    try:
+        await _execute(
+            client.table("monitoring_jobs").upsert(payload, on_conflict="job_id")
+        )
+        return True
     except Exception:
         try:
-            client.table("monitoring_jobs").insert(payload).execute()
+            await _execute(client.table("monitoring_jobs").insert(payload))
+            return True
         except Exception:
             # Optional persistence should never break runtime flow.
-            return
+            return False
+
+
+async def load_monitoring_job(job_id: str) -> dict | None:
+    """Load a persisted monitoring job row by job id."""
+    client = get_client()
+    if not client:
+        return None
+
+    try:
+        resp = await _execute(
+            client.table("monitoring_jobs").select("*").eq("job_id", job_id).limit(1)
+        )
+    except Exception:
+        return None
+    rows = resp.data or []
+    if rows and isinstance(rows[0], dict):
+        return rows[0]
+    return None
 
 
 def _normalize_query(query: str) -> str:
@@ -1,5 +1,7 @@
 """FastAPI application entry point."""
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import Limiter
@@ -8,13 +10,34 @@ from slowapi.middleware import SlowAPIMiddleware
 
 from config import settings
 from api.routes import router
+from db import supabase as supabase_db
+from services import perplexity_service
+from services.capture_scheduler import capture_scheduler
+from services.monitoring_scheduler import monitoring_scheduler
 
 limiter = Limiter(key_func=get_remote_address)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared provider clients on startup and close them on shutdown."""
+    await perplexity_service.open_http_client()
+    if settings.monitoring_scheduler_enabled:
+        monitoring_scheduler.start()
+    try:
+        yield
+    finally:
+        await monitoring_scheduler.stop()
+        await capture_scheduler.close()
+        await perplexity_service.close_http_client()
+        supabase_db.shutdown_executor()
+
+
 app = FastAPI(
     title="LGPSM AI Visibility Analyzer",
     description="API for analyzing brand visibility in AI search engines",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.state.limiter = limiter
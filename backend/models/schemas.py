@@ -84,6 +84,7 @@ class ModelOutput(BaseModel):
     snippet: str
     citations: list[str] = Field(default_factory=list)
     error: Optional[str] = None
+    cached: bool = False
 
 
 class QueryCaptureResult(BaseModel):
@@ -164,6 +165,11 @@ class MonitoringSnapshot(BaseModel):
     query_runs: list[QueryCaptureResult]
     aggregated_entities: list[EntityIndexItem]
     summary: str
+    run_mode: str = "full"
+    carried_queries: list[str] = Field(default_factory=list)
+    # Consecutive runs each carried query has gone without a fresh capture.
+    carried_runs: dict[str, int] = Field(default_factory=dict)
+    drift: Optional[float] = None
 
 
 class OnboardingCompleteRequest(BaseModel):
@@ -1,6 +1,8 @@
 """Main analysis orchestrator — coordinates scraping, querying, and scoring."""
 
 import asyncio
+from typing import AsyncIterator
+
 from models.schemas import (
     AnalysisRequest,
     AnalysisResult,
@@ -10,145 +12,238 @@ from models.schemas import (
 )
 from services.scraper import extract_brand_from_url
 from services.query_generator import generate_queries
-from services.openai_service import batch_query as openai_batch
-from services.perplexity_service import batch_query as perplexity_batch
-from services.scoring import analyze_response, calculate_visibility_score
+from services.openai_service import coalesced_query as openai_query
+from services.perplexity_service import coalesced_query as perplexity_query
+from services.scoring import analyze_response, response_points
+
+_PLATFORMS = (Platform.CHATGPT, Platform.PERPLEXITY)
+_SENTIMENT_SCORE = {"positive": 1, "neutral": 0, "mixed": -0.5, "negative": -1}
 
 
 async def run_analysis(request: AnalysisRequest) -> AnalysisResult:
     """Run a full AI visibility analysis for a brand."""
 
     # Step 1: Determine brand info
-    brand_name = request.brand_name or ""
-    domain = ""
-    description = ""
-
-    if request.url:
-        brand_info = await extract_brand_from_url(request.url)
-        brand_name = brand_name or brand_info["brand_name"]
-        domain = brand_info["domain"]
-        description = brand_info.get("description", "")
-    elif request.prompt and not brand_name:
-        # Use the prompt as-is, try to extract brand name
-        brand_name = request.prompt.strip()
-
-    if not brand_name:
-        raise ValueError("Kunne ikke bestemme merkevarenavn. Oppgi en URL eller merkevarenavn.")
+    brand_name, domain, description = await _resolve_brand(request)
 
     # Step 2: Generate queries
     queries = generate_queries(brand_name, domain, description)
 
-    # Step 3: Query AI platforms in parallel
-    openai_results, perplexity_results = await asyncio.gather(
-        openai_batch(queries),
-        perplexity_batch(queries),
-    )
+    # Step 3 + 4: Query AI platforms in parallel, scoring each response as it lands
+    pipeline = _AnalysisPipeline(brand_name, queries)
+    async for _ in pipeline.run():
+        pass
 
-    # Step 4: Analyze responses
-    all_mentions: list[Mention] = []
-    chatgpt_analyses = []
-    perplexity_analyses = []
-
-    # Analyze ChatGPT responses
-    for result in openai_results:
-        if result.get("error") and not result.get("response"):
-            continue
-        analysis = analyze_response(result["response"], brand_name)
-        chatgpt_analyses.append(analysis)
-        all_mentions.append(
-            Mention(
-                platform=Platform.CHATGPT,
-                query=result["query"],
-                response_snippet=analysis["snippet"],
-                mentioned=analysis["mentioned"],
-                mention_type=analysis["mention_type"],
-                sentiment=analysis["sentiment"],
-                citation_url=analysis["citation_url"],
-                position=analysis["position"],
-            )
-        )
+    # Step 5: Build the result from the incremental aggregates
+    return pipeline.result(domain)
 
-    # Analyze Perplexity responses
-    for result in perplexity_results:
-        if result.get("error") and not result.get("response"):
-            continue
-        analysis = analyze_response(result["response"], brand_name)
-        perplexity_analyses.append(analysis)
-        all_mentions.append(
-            Mention(
-                platform=Platform.PERPLEXITY,
-                query=result["query"],
-                response_snippet=analysis["snippet"],
-                mentioned=analysis["mentioned"],
-                mention_type=analysis["mention_type"],
-                sentiment=analysis["sentiment"],
-                citation_url=analysis.get("citation_url") or _get_perplexity_citation(result, brand_name),
-                position=analysis["position"],
-            )
-        )
 
-    # Step 5: Calculate scores
-    chatgpt_score = calculate_visibility_score(chatgpt_analyses)
-    perplexity_score = calculate_visibility_score(perplexity_analyses)
+async def stream_analysis(request: AnalysisRequest) -> AsyncIterator[dict]:
+    """Run an analysis and yield events as each provider response is scored.
 
-    all_analyses = chatgpt_analyses + perplexity_analyses
-    overall_score = calculate_visibility_score(all_analyses)
+    Yields ``mention`` events (one per scored response), ``score`` events with
+    running per-platform and overall scores, and a final ``result`` event with
+    the same ``AnalysisResult`` that ``run_analysis`` would return.
+    """
+    brand_name, domain, description = await _resolve_brand(request)
+    queries = generate_queries(brand_name, domain, description)
+    pipeline = _AnalysisPipeline(brand_name, queries)
+
+    yield {
+        "event": "started",
+        "data": {
+            "brand_name": brand_name,
+            "domain": domain or None,
+            "total_queries": len(queries) * len(_PLATFORMS),
+        },
+    }
+
+    async for platform, mention in pipeline.run():
+        tally = pipeline.tallies[platform]
+        yield {"event": "mention", "data": mention.model_dump(mode="json")}
+        yield {
+            "event": "score",
+            "data": {
+                "platform": platform.value,
+                "score": tally.score,
+                "completed": tally.total_queries,
+                "visibility_score": pipeline.overall.score,
+            },
+        }
+
+    yield {"event": "result", "data": pipeline.result(domain).model_dump(mode="json")}
+
+
+class _PlatformTally:
+    """Running score aggregates for one platform (or all platforms combined)."""
+
+    def __init__(self):
+        self.total_queries = 0
+        self.points = 0
+        self.mentions = 0
+        self.citations = 0
+        self.negative = 0
+        self.sentiment_total = 0.0
+
+    def add(self, analysis: dict) -> None:
+        self.total_queries += 1
+        self.points += response_points(analysis)
+        if analysis.get("mentioned"):
+            self.mentions += 1
+            self.sentiment_total += _SENTIMENT_SCORE.get(
+                analysis.get("sentiment", "neutral"), 0
+            )
+        if analysis.get("citation_url"):
+            self.citations += 1
+        if analysis.get("sentiment") == "negative":
+            self.negative += 1
+
+    @property
+    def score(self) -> float:
+        """Same value as ``calculate_visibility_score`` over the added analyses."""
+        if not self.total_queries:
+            return 0.0
+        return round(self.points / self.total_queries, 1)
+
+    @property
+    def avg_sentiment(self) -> str:
+        if not self.mentions:
+            return "neutral"
+        avg = self.sentiment_total / self.mentions
+        if avg > 0.3:
+            return "positive"
+        if avg < -0.3:
+            return "negative"
+        return "neutral"
 
-    # Build platform scores
-    platform_scores = []
 
-    if chatgpt_analyses:
-        chatgpt_mentions = [a for a in chatgpt_analyses if a.get("mentioned")]
-        chatgpt_citations = [a for a in chatgpt_analyses if a.get("citation_url")]
-        platform_scores.append(
+class _AnalysisPipeline:
+    """Queries every platform concurrently and scores responses as they complete."""
+
+    def __init__(self, brand_name: str, queries: list[str]):
+        self.brand_name = brand_name
+        self.queries = queries
+        self.tallies = {platform: _PlatformTally() for platform in _PLATFORMS}
+        self.overall = _PlatformTally()
+        self._mentions: dict[Platform, dict[int, Mention]] = {
+            platform: {} for platform in _PLATFORMS
+        }
+
+    async def run(self) -> AsyncIterator[tuple[Platform, Mention]]:
+        tasks = [
+            asyncio.ensure_future(self._call(platform, index, query))
+            for platform in _PLATFORMS
+            for index, query in enumerate(self.queries)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                platform, index, result = await next_done
+                if result.get("error") and not result.get("response"):
+                    continue
+                analysis = analyze_response(result["response"], self.brand_name)
+                self.tallies[platform].add(analysis)
+                self.overall.add(analysis)
+                mention = _build_mention(platform, result, analysis, self.brand_name)
+                self._mentions[platform][index] = mention
+                yield platform, mention
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    async def _call(platform: Platform, index: int, query: str):
+        if platform == Platform.CHATGPT:
+            return platform, index, await openai_query(query)
+        return platform, index, await perplexity_query(query)
+
+    def result(self, domain: str) -> AnalysisResult:
+        # Keep the response order stable: by platform, then by query
+        all_mentions = [
+            rows[index]
+            for rows in self._mentions.values()
+            for index in sorted(rows)
+        ]
+        platform_scores = [
             PlatformScore(
-                platform=Platform.CHATGPT,
-                score=chatgpt_score,
-                mentions_found=len(chatgpt_mentions),
-                total_queries=len(chatgpt_analyses),
-                citations=len(chatgpt_citations),
-                avg_sentiment=_avg_sentiment(chatgpt_analyses),
+                platform=platform,
+                score=tally.score,
+                mentions_found=tally.mentions,
+                total_queries=tally.total_queries,
+                citations=tally.citations,
+                avg_sentiment=tally.avg_sentiment,
             )
+            for platform, tally in self.tallies.items()
+            if tally.total_queries
+        ]
+        overall_score = self.overall.score
+
+        # Total counts
+        total_mentions = sum(1 for m in all_mentions if m.mentioned)
+        total_citations = sum(1 for m in all_mentions if m.citation_url)
+
+        # Top queries (ones where brand was mentioned)
+        top_queries = [m.query for m in all_mentions if m.mentioned][:5]
+
+        # Generate summary & recommendations
+        summary = _generate_summary(
+            self.brand_name, overall_score, total_mentions, len(all_mentions)
+        )
+        recommendations = _generate_recommendations(
+            self.brand_name,
+            overall_score,
+            self.tallies[Platform.CHATGPT],
+            self.tallies[Platform.PERPLEXITY],
         )
 
-    if perplexity_analyses:
-        perp_mentions = [a for a in perplexity_analyses if a.get("mentioned")]
-        perp_citations = [a for a in perplexity_analyses if a.get("citation_url")]
-        platform_scores.append(
-            PlatformScore(
-                platform=Platform.PERPLEXITY,
-                score=perplexity_score,
-                mentions_found=len(perp_mentions),
-                total_queries=len(perplexity_analyses),
-                citations=len(perp_citations),
-                avg_sentiment=_avg_sentiment(perplexity_analyses),
-            )
+        return AnalysisResult(
+            brand_name=self.brand_name,
+            domain=domain or None,
+            visibility_score=overall_score,
+            platform_scores=platform_scores,
+            mentions=all_mentions,
+            total_mentions=total_mentions,
+            total_citations=total_citations,
+            top_queries=top_queries,
+            summary=summary,
+            recommendations=recommendations,
         )
 
-    # Total counts
-    total_mentions = sum(1 for m in all_mentions if m.mentioned)
-    total_citations = sum(1 for m in all_mentions if m.citation_url)
 
-    # Top queries (ones where brand was mentioned)
-    top_queries = [m.query for m in all_mentions if m.mentioned][:5]
+async def _resolve_brand(request: AnalysisRequest) -> tuple[str, str, str]:
+    brand_name = request.brand_name or ""
+    domain = ""
+    description = ""
 
-    # Generate summary & recommendations
-    summary = _generate_summary(brand_name, overall_score, total_mentions, len(all_mentions))
-    recommendations = _generate_recommendations(
-        brand_name, overall_score, chatgpt_analyses, perplexity_analyses
-    )
+    if request.url:
+        brand_info = await extract_brand_from_url(request.url)
+        brand_name = brand_name or brand_info["brand_name"]
+        domain = brand_info["domain"]
+        description = brand_info.get("description", "")
+    elif request.prompt and not brand_name:
+        # Use the prompt as-is, try to extract brand name
+        brand_name = request.prompt.strip()
+
+    if not brand_name:
+        raise ValueError("Kunne ikke bestemme merkevarenavn. Oppgi en URL eller merkevarenavn.")
 
-    return AnalysisResult(
-        brand_name=brand_name,
-        domain=domain or None,
-        visibility_score=overall_score,
-        platform_scores=platform_scores,
-        mentions=all_mentions,
-        total_mentions=total_mentions,
-        total_citations=total_citations,
-        top_queries=top_queries,
-        summary=summary,
-        recommendations=recommendations,
+    return brand_name, domain, description
+
+
+def _build_mention(
+    platform: Platform, result: dict, analysis: dict, brand_name: str
+) -> Mention:
+    citation_url = analysis["citation_url"]
+    if platform == Platform.PERPLEXITY:
+        citation_url = citation_url or _get_perplexity_citation(result, brand_name)
+    return Mention(
+        platform=platform,
+        query=result["query"],
+        response_snippet=analysis["snippet"],
+        mentioned=analysis["mentioned"],
+        mention_type=analysis["mention_type"],
+        sentiment=analysis["sentiment"],
+        citation_url=citation_url,
+        position=analysis["position"],
     )
 
 
@@ -162,23 +257,6 @@ def _get_perplexity_citation(result: dict, brand_name: str) -> str | None:
     return citations[0] if citations else None
 
 
-def _avg_sentiment(analyses: list[dict]) -> str:
-    """Calculate the average sentiment from analyses."""
-    mentioned = [a for a in analyses if a.get("mentioned")]
-    if not mentioned:
-        return "neutral"
-
-    sentiment_score = {"positive": 1, "neutral": 0, "mixed": -0.5, "negative": -1}
-    total = sum(sentiment_score.get(a.get("sentiment", "neutral"), 0) for a in mentioned)
-    avg = total / len(mentioned)
-
-    if avg > 0.3:
-        return "positive"
-    if avg < -0.3:
-        return "negative"
-    return "neutral"
-
-
 def _generate_summary(brand_name: str, score: float, mentions: int, total: int) -> str:
     """Generate a Norwegian summary of the analysis."""
     if score >= 70:
@@ -204,13 +282,13 @@ def _generate_summary(brand_name: str, score: float, mentions: int, total: int)
 
 
 def _generate_recommendations(
-    brand_name: str, score: float, chatgpt: list, perplexity: list
+    brand_name: str, score: float, chatgpt: "_PlatformTally", perplexity: "_PlatformTally"
 ) -> list[str]:
     """Generate actionable recommendations in Norwegian."""
     recs = []
 
-    chatgpt_mentioned = sum(1 for a in chatgpt if a.get("mentioned"))
-    perp_mentioned = sum(1 for a in perplexity if a.get("mentioned"))
+    chatgpt_mentioned = chatgpt.mentions
+    perp_mentioned = perplexity.mentions
 
     if score < 50:
         recs.append(
@@ -218,26 +296,26 @@ def _generate_recommendations(
             "for å bli sitert av AI-modeller."
         )
 
-    chatgpt_citations = sum(1 for a in chatgpt if a.get("citation_url"))
+    chatgpt_citations = chatgpt.citations
     if chatgpt_citations == 0:
         recs.append(
             "Publiser autorativt innhold (bransjerapporter, guider) som AI-modeller "
             "kan bruke som kilder."
         )
 
-    if chatgpt_mentioned < len(chatgpt) // 2:
+    if chatgpt_mentioned < chatgpt.total_queries // 2:
         recs.append(
             f"Bygg sterkere merkevareautoritet — {brand_name} nevnes i under halvparten "
             f"av relevante ChatGPT-spørringer."
         )
 
-    if len(perplexity) > 0 and perp_mentioned == 0:
+    if perplexity.total_queries > 0 and perp_mentioned == 0:
         recs.append(
             "Fokuser på Perplexity-synlighet ved å sørge for at nettstedet ditt er "
             "godt indeksert og har oppdatert innhold."
         )
 
-    negative = sum(1 for a in chatgpt + perplexity if a.get("sentiment") == "negative")
+    negative = chatgpt.negative + perplexity.negative
     if negative > 0:
         recs.append(
             "Adresser negativ omtale — noen AI-svar inneholder kritikk. Vurder å "
@@ -0,0 +1,192 @@
+"""Process-wide scheduler for monitoring (query, platform) captures.
+
+Monitoring jobs submit one task per (query, platform). Each platform has its
+own worker pool sized to the provider's concurrency limit, and workers pick
+the next task round-robin across jobs. A slow provider never holds back a
+fast one, and one large job cannot starve the others.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import Callable
+
+from models.schemas import Platform
+from services.query_capture import capture_platform
+from services.rate_limiter import ProviderLimiter, openai_limiter, perplexity_limiter
+
+# Assumed seconds per capture until a platform has measured throughput.
+DEFAULT_TASK_SEC = 8.0
+# Weight of the newest sample in the per-platform duration average.
+_EWMA_ALPHA = 0.2
+
+
+class _PlatformLane:
+    """Per-job FIFO queues for one platform, served round-robin."""
+
+    def __init__(self, platform: Platform, limiter: ProviderLimiter):
+        self.platform = platform
+        self.limiter = limiter
+        self.queues: dict[str, deque] = {}
+        self.rotation: deque[str] = deque()
+        self.pending = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.avg_task_sec = DEFAULT_TASK_SEC
+        self.workers: list[asyncio.Task] = []
+        self.ready = asyncio.Event()
+        self.loop: asyncio.AbstractEventLoop | None = None
+
+    def push(self, job_id: str, item: tuple) -> None:
+        queue = self.queues.get(job_id)
+        if queue is None:
+            queue = self.queues[job_id] = deque()
+            self.rotation.append(job_id)
+        queue.append(item)
+        self.pending += 1
+        self.ready.set()
+
+    def pop(self) -> tuple | None:
+        while self.rotation:
+            job_id = self.rotation.popleft()
+            queue = self.queues[job_id]
+            item = queue.popleft()
+            if queue:
+                self.rotation.append(job_id)
+            else:
+                del self.queues[job_id]
+            self.pending -= 1
+            return item
+        self.ready.clear()
+        return None
+
+    def record(self, elapsed_sec: float) -> None:
+        self.completed += 1
+        self.avg_task_sec += _EWMA_ALPHA * (elapsed_sec - self.avg_task_sec)
+
+    def throughput_per_sec(self) -> float:
+        """Captures per second given the limiter's window and request budget."""
+        concurrency = max(1.0, min(float(self.limiter.max_concurrency), self.limiter.window))
+        rate = concurrency / max(self.avg_task_sec, 0.1)
+        if self.limiter.request_rate_per_sec > 0:
+            rate = min(rate, self.limiter.request_rate_per_sec)
+        return rate
+
+    def estimate_sec(self, extra_tasks: int = 0) -> float:
+        depth = self.pending + self.in_flight + extra_tasks
+        if depth == 0:
+            return 0.0
+        return depth / self.throughput_per_sec()
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "platform": self.platform.value,
+            "workers": len(self.workers),
+            "jobs": len(self.queues),
+            "pending": self.pending,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "avg_task_sec": round(self.avg_task_sec, 2),
+        }
+
+
+class CaptureScheduler:
+    """Dispatches (query, platform) captures across per-provider worker pools."""
+
+    def __init__(self, limiters: dict[Platform, ProviderLimiter]):
+        self._limiters = limiters
+        self._lanes: dict[Platform, _PlatformLane] = {}
+
+    def _lane(self, platform: Platform) -> _PlatformLane:
+        loop = asyncio.get_running_loop()
+        lane = self._lanes.get(platform)
+        if lane is None or lane.loop not in (None, loop):
+            # Workers are bound to one event loop; start over on a new one.
+            previous = lane
+            lane = self._lanes[platform] = _PlatformLane(platform, self._limiters[platform])
+            if previous is not None:
+                lane.completed = previous.completed
+                lane.avg_task_sec = previous.avg_task_sec
+        if not lane.workers:
+            lane.loop = loop
+            lane.workers = [
+                asyncio.create_task(self._work(lane))
+                for _ in range(lane.limiter.max_concurrency)
+            ]
+        return lane
+
+    async def submit(
+        self,
+        job_id: str,
+        platform: Platform,
+        query: str,
+        on_start: Callable[[], None] | None = None,
+    ) -> dict:
+        """Queue one capture for ``job_id`` and wait for its output payload."""
+        future = asyncio.get_running_loop().create_future()
+        self._lane(platform).push(job_id, (query, on_start, future))
+        return await future
+
+    async def _work(self, lane: _PlatformLane) -> None:
+        while True:
+            item = lane.pop()
+            if item is None:
+                await lane.ready.wait()
+                continue
+            query, on_start, future = item
+            if future.cancelled():
+                continue
+            if on_start is not None:
+                on_start()
+            lane.in_flight += 1
+            started = time.monotonic()
+            try:
+                payload = await capture_platform(lane.platform, query)
+            except Exception as exc:
+                if not future.done():
+                    future.set_exception(exc)
+            else:
+                lane.record(time.monotonic() - started)
+                if not future.done():
+                    future.set_result(payload)
+            finally:
+                lane.in_flight -= 1
+
+    def estimate_duration_sec(
+        self,
+        new_tasks: dict[Platform, int],
+        backlog: dict[Platform, int] | None = None,
+    ) -> int:
+        """Seconds until ``new_tasks`` would finish behind the current backlog.
+
+        ``backlog`` adds captures queued outside this process's lanes (jobs
+        waiting for or running in queue workers).
+        """
+        backlog = backlog or {}
+        slowest = 0.0
+        for platform, count in new_tasks.items():
+            lane = self._lanes.get(platform) or _PlatformLane(platform, self._limiters[platform])
+            extra = count + backlog.get(platform, 0)
+            slowest = max(slowest, lane.estimate_sec(extra_tasks=extra))
+        return math.ceil(slowest)
+
+    async def close(self) -> None:
+        workers = [task for lane in self._lanes.values() for task in lane.workers]
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        for lane in self._lanes.values():
+            lane.workers = []
+
+    @property
+    def stats(self) -> list[dict]:
+        return [lane.stats for lane in self._lanes.values()]
+
+
+capture_scheduler = CaptureScheduler(
+    {Platform.CHATGPT: openai_limiter, Platform.PERPLEXITY: perplexity_limiter}
+)
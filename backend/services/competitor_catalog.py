@@ -0,0 +1,316 @@
+"""Competitor catalog indexed by industry and geography."""
+
+from __future__ import annotations
+
+import bisect
+import csv
+import os
+import re
+from dataclasses import dataclass
+from typing import Iterable
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends go unlocked
+    fcntl = None
+
+from config import settings
+from models.schemas import CompetitorCandidate, QueryCaptureResult
+from services.ttl_cache import TTLCache
+
+BUNDLED_CATALOG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "competitor_catalog.csv",
+)
+CSV_FIELDS = ("name", "domain", "industry", "region", "city", "weight")
+LEARNED_WEIGHT = 0.5
+# Free-text extraction picks up any capitalized phrase; only list/bullet
+# entities are trusted enough to become catalog entries.
+MIN_ENTITY_CONFIDENCE = 0.75
+_OBSERVATION_TTL_SEC = 30 * 24 * 60 * 60
+_TIER_FACTOR = {"city": 1.0, "region": 0.9, "country": 0.8}
+# For a local business only same-city/region hits say the catalog knows its
+# market; national chains are listed everywhere and would make any market look
+# covered. A country-scope business competes nationally, so those hits count.
+LOCAL_SCOPES = frozenset({"city", "region"})
+_TIER_REASON = {
+    "city": "Etablert aktør i {city}",
+    "region": "Etablert aktør i {region}",
+    "country": "Etablert konkurrent i norsk marked",
+}
+_LEARNED_REASON = "Gjentatte ganger nevnt i AI-svar for samme marked"
+
+
+def _key(value: str | None) -> str:
+    return re.sub(r"[^a-z0-9]+", "", (value or "").lower())
+
+
+def _label(value: str | None) -> str:
+    return (value or "").strip().lower()
+
+
+@dataclass
+class CatalogEntry:
+    name: str
+    industry: str
+    domain: str | None = None
+    region: str | None = None
+    city: str | None = None
+    weight: float = LEARNED_WEIGHT
+    learned: bool = False
+
+
+class CompetitorCatalog:
+    """In-memory competitor index: industry -> national / region / city lists.
+
+    Each list is kept sorted by weight when entries are added, so a lookup is
+    three dict hits and a short merge. Entities that keep showing up in
+    monitoring runs for the same market are promoted into the catalog (and
+    appended to ``learned_path`` when set, so they survive restarts).
+
+    Mentions are counted per process, so promotion happens in whichever
+    process runs the monitoring job (a queue worker, not the API). Other
+    processes pick promoted entries up from ``learned_path``: it is re-read
+    on lookup whenever it changed, and appends hold an exclusive lock so
+    workers sharing the file do not interleave rows.
+    """
+
+    def __init__(
+        self,
+        *,
+        promote_mentions: int,
+        learned_path: str = "",
+        max_observations: int = 10_000,
+    ):
+        self.promote_mentions = max(1, promote_mentions)
+        self.learned_path = learned_path
+        self._national: dict[str, list[CatalogEntry]] = {}
+        self._by_region: dict[tuple[str, str], list[CatalogEntry]] = {}
+        self._by_city: dict[tuple[str, str], list[CatalogEntry]] = {}
+        self._names: set[tuple[str, str, str]] = set()
+        self._industries: set[str] = set()
+        self._observations = TTLCache(max_entries=max_observations, ttl_sec=_OBSERVATION_TTL_SEC)
+        self._learned_version: tuple[int, int] | None = None
+        self.lookups = 0
+        self.covered = 0
+        self.promoted = 0
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def load_csv(self, path: str, learned: bool = False) -> int:
+        """Add every row of a catalog CSV; returns the number of new entries."""
+        added = 0
+        with open(path, newline="", encoding="utf-8") as handle:
+            for row in csv.DictReader(handle):
+                if not (row.get("name") or "").strip() or not (row.get("industry") or "").strip():
+                    continue
+                entry = CatalogEntry(
+                    name=row["name"].strip(),
+                    industry=_label(row["industry"]),
+                    domain=(row.get("domain") or "").strip() or None,
+                    region=(row.get("region") or "").strip() or None,
+                    city=(row.get("city") or "").strip() or None,
+                    weight=float(row.get("weight") or LEARNED_WEIGHT),
+                    learned=learned,
+                )
+                added += self.add(entry)
+        return added
+
+    def add(self, entry: CatalogEntry) -> bool:
+        token = (entry.industry, _label(entry.city) or _label(entry.region), _key(entry.name))
+        if token in self._names:
+            return False
+        self._names.add(token)
+        self._industries.add(entry.industry)
+        if entry.city:
+            bucket = self._by_city.setdefault((entry.industry, _label(entry.city)), [])
+        elif entry.region:
+            bucket = self._by_region.setdefault((entry.industry, _label(entry.region)), [])
+        else:
+            bucket = self._national.setdefault(entry.industry, [])
+        bisect.insort(bucket, entry, key=lambda item: -item.weight)
+        # City entries also compete at region level for nearby businesses.
+        if entry.city and entry.region:
+            bisect.insort(
+                self._by_region.setdefault((entry.industry, _label(entry.region)), []),
+                entry,
+                key=lambda item: -item.weight,
+            )
+        return True
+
+    def has_industry(self, industry: str) -> bool:
+        return _label(industry) in self._industries
+
+    def lookup(
+        self,
+        *,
+        industry: str,
+        city: str | None = None,
+        region: str | None = None,
+        exclude: Iterable[str | None] = (),
+        limit: int = 8,
+        min_candidates: int = 0,
+        scope_level: str | None = None,
+    ) -> list[CompetitorCandidate]:
+        """Ranked candidates for a market: same city, then region, then national.
+
+        The lookup counts as covered when at least ``min_candidates`` rows
+        match the business's scope (see ``coverage_hits``).
+        """
+        self.lookups += 1
+        self.refresh_learned()
+        label = _label(industry)
+        excluded = {_key(value) for value in exclude if value}
+        tiers = (
+            ("city", self._by_city.get((label, _label(city)), []) if city else []),
+            ("region", self._by_region.get((label, _label(region)), []) if region else []),
+            ("country", self._national.get(label, [])),
+        )
+        rows: list[CompetitorCandidate] = []
+        seen: set[str] = set()
+        for scope, entries in tiers:
+            for entry in entries:
+                name_key = _key(entry.name)
+                if name_key in seen or name_key in excluded:
+                    continue
+                if entry.domain and _key(entry.domain) in excluded:
+                    continue
+                seen.add(name_key)
+                reason = _LEARNED_REASON if entry.learned else _TIER_REASON[scope]
+                rows.append(
+                    CompetitorCandidate(
+                        name=entry.name,
+                        domain=entry.domain,
+                        scope_match=scope,
+                        relevance_score=round(entry.weight * _TIER_FACTOR[scope], 3),
+                        reason=reason.format(city=city, region=region),
+                    )
+                )
+                if len(rows) >= limit:
+                    break
+            if len(rows) >= limit:
+                break
+        if min_candidates and coverage_hits(rows, scope_level) >= min_candidates:
+            self.covered += 1
+        return rows
+
+    def refresh_learned(self) -> int:
+        """Load entries other processes appended to ``learned_path`` since the last read."""
+        if not self.learned_path:
+            return 0
+        try:
+            stat = os.stat(self.learned_path)
+        except OSError:
+            return 0
+        version = (stat.st_mtime_ns, stat.st_size)
+        if version == self._learned_version:
+            return 0
+        self._learned_version = version
+        try:
+            # Already-known rows are skipped by add(), so a full re-read is safe.
+            return self.load_csv(self.learned_path, learned=True)
+        except (OSError, ValueError, csv.Error):
+            return 0
+
+    def observe(
+        self,
+        *,
+        industry: str,
+        scope_level: str,
+        city: str | None,
+        region: str | None,
+        query_runs: Iterable[QueryCaptureResult],
+        exclude: Iterable[str | None] = (),
+    ) -> list[CatalogEntry]:
+        """Count entities per market across query runs and promote recurring ones."""
+        label = _label(industry)
+        if not label:
+            return []
+        self.refresh_learned()
+        if scope_level == "city" and city:
+            geo = {"city": city, "region": region}
+        elif scope_level in {"city", "region"} and region:
+            geo = {"region": region}
+        else:
+            geo = {}
+        market = _label(geo.get("city")) or _label(geo.get("region"))
+        excluded = {_key(value) for value in exclude if value}
+
+        promoted: list[CatalogEntry] = []
+        for run in query_runs:
+            names: dict[str, str] = {}
+            for item in run.entity_index:
+                name_key = _key(item.entity)
+                if item.confidence >= MIN_ENTITY_CONFIDENCE and name_key and name_key not in excluded:
+                    names.setdefault(name_key, item.entity.strip())
+            for name_key, name in names.items():
+                token = (label, market, name_key)
+                if token in self._names or (label, "", name_key) in self._names:
+                    continue
+                count = self._observations.get(token, 0) + 1
+                self._observations.set(token, count)
+                if count < self.promote_mentions:
+                    continue
+                entry = CatalogEntry(name=name, industry=label, learned=True, **geo)
+                if self.add(entry):
+                    self._observations.pop(token)
+                    self.promoted += 1
+                    promoted.append(entry)
+        if promoted and self.learned_path:
+            self._append_learned(promoted)
+        return promoted
+
+    def _append_learned(self, entries: list[CatalogEntry]) -> None:
+        try:
+            with open(self.learned_path, "a", newline="", encoding="utf-8") as handle:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_EX)
+                writer = csv.DictWriter(handle, fieldnames=CSV_FIELDS)
+                if handle.tell() == 0:
+                    writer.writeheader()
+                for entry in entries:
+                    writer.writerow(
+                        {
+                            "name": entry.name,
+                            "domain": entry.domain or "",
+                            "industry": entry.industry,
+                            "region": entry.region or "",
+                            "city": entry.city or "",
+                            "weight": entry.weight,
+                        }
+                    )
+        except OSError:
+            # The in-memory catalog already has them; persistence is best-effort.
+            pass
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._names),
+            "lookups": self.lookups,
+            "covered": self.covered,
+            "promoted": self.promoted,
+            "pending_observations": len(self._observations),
+        }
+
+
+def coverage_hits(rows: list[CompetitorCandidate], scope_level: str | None) -> int:
+    """Rows that show the catalog knows the market of a business at ``scope_level``."""
+    if scope_level == "country":
+        return len(rows)
+    return sum(1 for row in rows if row.scope_match in LOCAL_SCOPES)
+
+
+def build_competitor_catalog() -> CompetitorCatalog:
+    catalog = CompetitorCatalog(
+        promote_mentions=settings.competitor_catalog_promote_mentions,
+        learned_path=settings.competitor_catalog_learned_path,
+    )
+    catalog.load_csv(settings.competitor_catalog_path or BUNDLED_CATALOG_PATH)
+    catalog.refresh_learned()
+    return catalog
+
+
+competitor_catalog = build_competitor_catalog()
@@ -0,0 +1,108 @@
+"""Delta planning for recurring monitoring runs.
+
+A delta run re-captures a sample of the previous run's queries. When the
+sample's answers barely moved, the remaining queries carry their previous
+capture (outputs and ``EntityIndexItem``s) forward instead of hitting the
+providers again; otherwise the run escalates to a full capture. A query is
+carried at most ``max_carries`` runs in a row before it is re-captured.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import random
+from dataclasses import dataclass, field
+
+from models.schemas import MonitoringSnapshot, Platform, QueryCaptureResult, SuggestedQuery
+
+
+@dataclass
+class DeltaPlan:
+    sample: list[SuggestedQuery] = field(default_factory=list)
+    rest: list[SuggestedQuery] = field(default_factory=list)
+    previous: dict[str, QueryCaptureResult] = field(default_factory=dict)
+    carried_runs: dict[str, int] = field(default_factory=dict)
+
+
+def plan_delta(
+    previous: MonitoringSnapshot,
+    queries: list[SuggestedQuery],
+    platforms: list[Platform],
+    sample_ratio: float,
+    seed: str,
+    max_carries: int = 3,
+) -> DeltaPlan:
+    """Split ``queries`` into a re-captured sample and carry-forward candidates.
+
+    Queries without a complete previous capture on every platform always go
+    into the sample, as do queries already carried ``max_carries`` runs in a
+    row. ``seed`` (the job id) keeps the sample stable when a job is resumed.
+    """
+    previous_by_query = {
+        query_key(result.query): result
+        for result in previous.query_runs
+        if _covers(result, platforms)
+    }
+    known = [item for item in queries if query_key(item.text) in previous_by_query]
+    new = [item for item in queries if query_key(item.text) not in previous_by_query]
+    stale = [
+        item
+        for item in known
+        if previous.carried_runs.get(query_key(item.text), 0) >= max(0, max_carries)
+    ]
+    stale_keys = {query_key(item.text) for item in stale}
+    known = [item for item in known if query_key(item.text) not in stale_keys]
+
+    sample_size = min(len(known), max(1, math.ceil(len(known) * sample_ratio))) if known else 0
+    sampled = random.Random(seed).sample(known, sample_size)
+    sampled_keys = {query_key(item.text) for item in sampled}
+    return DeltaPlan(
+        sample=new + stale + sampled,
+        rest=[item for item in known if query_key(item.text) not in sampled_keys],
+        previous=previous_by_query,
+        carried_runs=dict(previous.carried_runs),
+    )
+
+
+def query_drift(previous: QueryCaptureResult, current: QueryCaptureResult) -> float:
+    """0.0 for an unchanged answer, up to 1.0 when no indexed entity overlaps."""
+    if _content_hashes(previous) == _content_hashes(current):
+        return 0.0
+    before = _entity_keys(previous)
+    after = _entity_keys(current)
+    if not before and not after:
+        return 0.0
+    return 1.0 - len(before & after) / len(before | after)
+
+
+def sample_drift(plan: DeltaPlan, captured: list[QueryCaptureResult]) -> float:
+    """Mean drift over the sampled queries that have a previous capture."""
+    drifts = [
+        query_drift(plan.previous[query_key(result.query)], result)
+        for result in captured
+        if query_key(result.query) in plan.previous
+    ]
+    return sum(drifts) / len(drifts) if drifts else 0.0
+
+
+def query_key(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _covers(result: QueryCaptureResult, platforms: list[Platform]) -> bool:
+    captured = {output.platform for output in result.outputs if output.raw_output}
+    return all(platform in captured for platform in platforms)
+
+
+def _content_hashes(result: QueryCaptureResult) -> dict[str, str]:
+    return {
+        output.platform.value: hashlib.sha256(
+            " ".join(output.raw_output.split()).encode("utf-8")
+        ).hexdigest()
+        for output in result.outputs
+    }
+
+
+def _entity_keys(result: QueryCaptureResult) -> set[tuple[str, str]]:
+    return {(row.platform.value, row.entity.lower().strip()) for row in result.entity_index}
@@ -0,0 +1,107 @@
+"""Cache of scraped brand metadata keyed by normalized host."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+from config import settings
+from services.ttl_cache import TTLCache
+
+
+@dataclass
+class DomainEntry:
+    result: dict
+    fresh_until: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.fresh_until
+
+    def validators(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class DomainCache:
+    """Fresh/stale brand entries plus a negative cache for unreachable hosts.
+
+    Entries are served directly for ``fresh_ttl_sec``. After that they stay
+    around for ``stale_ttl_sec`` so the next lookup can revalidate them with a
+    conditional GET (or fall back to them if the host is down). Hosts that
+    failed to load are remembered for ``negative_ttl_sec``.
+    """
+
+    def __init__(
+        self,
+        *,
+        fresh_ttl_sec: float,
+        stale_ttl_sec: float,
+        negative_ttl_sec: float,
+        max_entries: int,
+    ):
+        self.fresh_ttl_sec = fresh_ttl_sec
+        self._entries = TTLCache(max_entries=max_entries, ttl_sec=fresh_ttl_sec + stale_ttl_sec)
+        self._unreachable = TTLCache(max_entries=max_entries, ttl_sec=negative_ttl_sec)
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.revalidations = 0
+        self.not_modified = 0
+
+    def get(self, host: str) -> DomainEntry | None:
+        return self._entries.get(host)
+
+    def is_unreachable(self, host: str) -> bool:
+        return self._unreachable.get(host) is not None
+
+    def store(
+        self, host: str, result: dict, etag: str | None = None, last_modified: str | None = None
+    ) -> None:
+        self._unreachable.pop(host)
+        self._entries.set(
+            host,
+            DomainEntry(
+                result=dict(result),
+                fresh_until=time.monotonic() + self.fresh_ttl_sec,
+                etag=etag,
+                last_modified=last_modified,
+            ),
+        )
+
+    def refresh(self, host: str, entry: DomainEntry) -> None:
+        """Extend a revalidated (304) entry for another fresh period."""
+        self.store(host, entry.result, entry.etag, entry.last_modified)
+
+    def mark_unreachable(self, host: str) -> None:
+        self._unreachable.set(host, True)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._unreachable.clear()
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "unreachable": len(self._unreachable),
+            "hits": self.hits,
+            "misses": self.misses,
+            "negative_hits": self.negative_hits,
+            "revalidations": self.revalidations,
+            "not_modified": self.not_modified,
+        }
+
+
+domain_cache = DomainCache(
+    fresh_ttl_sec=settings.domain_cache_ttl_sec,
+    stale_ttl_sec=settings.domain_cache_stale_sec,
+    negative_ttl_sec=settings.domain_cache_negative_ttl_sec,
+    max_entries=settings.domain_cache_max_entries,
+)
@@ -0,0 +1,61 @@
+"""In-process fan-out of monitoring job progress events to subscribers."""
+
+from __future__ import annotations
+
+import asyncio
+
+from services.job_registry import FINISHED_STATUSES
+
+# Events that end a job's stream: a finished job's last event is its status.
+TERMINAL_EVENTS = FINISHED_STATUSES
+
+
+class JobEventBus:
+    """Per-job publish/subscribe channel backed by bounded asyncio queues.
+
+    Publishing never blocks the job: when a subscriber falls behind, its
+    oldest queued event is dropped (progress events supersede each other).
+    """
+
+    def __init__(self, max_queue: int = 100):
+        self.max_queue = max_queue
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue)
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(job_id)
+        if not subscribers:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[job_id]
+
+    def publish(self, job_id: str, event: str, data: dict) -> None:
+        subscribers = self._subscribers.get(job_id)
+        if not subscribers:
+            return
+        self.published += 1
+        message = {"event": event, "data": data}
+        for queue in subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(message)
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "jobs": len(self._subscribers),
+            "subscribers": sum(len(queues) for queues in self._subscribers.values()),
+            "published": self.published,
+            "dropped": self.dropped,
+        }
+
+
+job_events = JobEventBus()
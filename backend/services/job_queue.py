@@ -0,0 +1,248 @@
+"""Durable queue for monitoring jobs with claim and lease semantics.
+
+The default ``inline`` backend keeps the original behaviour: jobs run as tasks
+inside the API process. With ``job_queue_backend="sqlite"`` the API only
+enqueues jobs and one or more ``worker.py`` processes claim and run them, and
+job status is shared through the queue so any API worker can answer polls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+from config import settings
+
+
+@dataclass
+class QueuedJob:
+    job_id: str
+    payload: dict
+    attempts: int
+
+
+class JobQueue(ABC):
+    """Interface for queue backends shared by the API and job workers."""
+
+    @abstractmethod
+    async def enqueue(self, job_id: str, payload: dict, status: dict) -> None:
+        ...
+
+    @abstractmethod
+    async def claim(self, worker_id: str, lease_sec: float) -> QueuedJob | None:
+        """Lease the oldest runnable job (queued, or running with an expired lease)."""
+
+    @abstractmethod
+    async def heartbeat(self, job_id: str, worker_id: str, lease_sec: float) -> bool:
+        """Extend a lease; False means the job is no longer held by ``worker_id``."""
+
+    @abstractmethod
+    async def finish(self, job_id: str, worker_id: str, failed: bool = False) -> None:
+        ...
+
+    @abstractmethod
+    async def save_status(self, job_id: str, status: dict) -> None:
+        ...
+
+    @abstractmethod
+    async def load_status(self, job_id: str) -> dict | None:
+        ...
+
+    @abstractmethod
+    async def backlog(self) -> dict[str, int]:
+        """Captures still to run per platform across queued and running jobs."""
+
+
+class SQLiteJobQueue(JobQueue):
+    """Queue stored in a SQLite file shared by every process on the host."""
+
+    def __init__(self, path: str, max_attempts: int = 3):
+        self.max_attempts = max(1, max_attempts)
+        self._lock = threading.Lock()
+        # Autocommit mode so claims can take an explicit write lock.
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, timeout=30, isolation_level=None
+        )
+        self._conn.execute("pragma journal_mode=wal")
+        self._conn.execute(
+            "create table if not exists monitoring_queue ("
+            " job_id text primary key,"
+            " payload text not null,"
+            " state text not null,"
+            " worker_id text,"
+            " lease_expires_at real,"
+            " attempts integer not null default 0,"
+            " status_json text,"
+            " enqueued_at real not null,"
+            " updated_at real not null)"
+        )
+        self._conn.execute(
+            "create index if not exists monitoring_queue_state_idx"
+            " on monitoring_queue (state, enqueued_at)"
+        )
+
+    async def _run(self, fn, *args):
+        return await asyncio.to_thread(fn, *args)
+
+    async def enqueue(self, job_id: str, payload: dict, status: dict) -> None:
+        await self._run(self._enqueue, job_id, payload, status)
+
+    def _enqueue(self, job_id: str, payload: dict, status: dict) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "insert or replace into monitoring_queue"
+                " (job_id, payload, state, attempts, status_json, enqueued_at, updated_at)"
+                " values (?, ?, 'queued', 0, ?, ?, ?)",
+                (
+                    job_id,
+                    json.dumps(payload, ensure_ascii=False),
+                    json.dumps(status, ensure_ascii=False),
+                    now,
+                    now,
+                ),
+            )
+
+    async def claim(self, worker_id: str, lease_sec: float) -> QueuedJob | None:
+        return await self._run(self._claim, worker_id, lease_sec)
+
+    def _claim(self, worker_id: str, lease_sec: float) -> QueuedJob | None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("begin immediate")
+            try:
+                # Jobs whose workers died too often are failed instead of retried.
+                self._conn.execute(
+                    "update monitoring_queue set state = 'failed', worker_id = null,"
+                    " status_json = case when status_json is null then null else"
+                    " json_set(status_json, '$.status', 'failed',"
+                    " '$.error', 'Jobben ble avbrutt for mange ganger.') end,"
+                    " updated_at = ?"
+                    " where state = 'running' and lease_expires_at < ? and attempts >= ?",
+                    (now, now, self.max_attempts),
+                )
+                row = self._conn.execute(
+                    "select job_id, payload, attempts from monitoring_queue"
+                    " where state = 'queued'"
+                    " or (state = 'running' and lease_expires_at < ?)"
+                    " order by enqueued_at limit 1",
+                    (now,),
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("commit")
+                    return None
+                job_id, payload, attempts = row
+                self._conn.execute(
+                    "update monitoring_queue set state = 'running', worker_id = ?,"
+                    " lease_expires_at = ?, attempts = ?, updated_at = ?"
+                    " where job_id = ?",
+                    (worker_id, now + lease_sec, attempts + 1, now, job_id),
+                )
+                self._conn.execute("commit")
+            except Exception:
+                self._conn.execute("rollback")
+                raise
+        return QueuedJob(job_id=job_id, payload=json.loads(payload), attempts=attempts + 1)
+
+    async def heartbeat(self, job_id: str, worker_id: str, lease_sec: float) -> bool:
+        return await self._run(self._heartbeat, job_id, worker_id, lease_sec)
+
+    def _heartbeat(self, job_id: str, worker_id: str, lease_sec: float) -> bool:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "update monitoring_queue set lease_expires_at = ?, updated_at = ?"
+                " where job_id = ? and worker_id = ? and state = 'running'",
+                (now + lease_sec, now, job_id, worker_id),
+            )
+        return cursor.rowcount == 1
+
+    async def finish(self, job_id: str, worker_id: str, failed: bool = False) -> None:
+        await self._run(self._finish, job_id, worker_id, failed)
+
+    def _finish(self, job_id: str, worker_id: str, failed: bool) -> None:
+        with self._lock:
+            self._conn.execute(
+                "update monitoring_queue set state = ?, lease_expires_at = null,"
+                " updated_at = ? where job_id = ? and worker_id = ?",
+                ("failed" if failed else "done", time.time(), job_id, worker_id),
+            )
+
+    async def save_status(self, job_id: str, status: dict) -> None:
+        await self._run(self._save_status, job_id, status)
+
+    def _save_status(self, job_id: str, status: dict) -> None:
+        with self._lock:
+            self._conn.execute(
+                "update monitoring_queue set status_json = ?, updated_at = ?"
+                " where job_id = ?",
+                (json.dumps(status, ensure_ascii=False), time.time(), job_id),
+            )
+
+    async def load_status(self, job_id: str) -> dict | None:
+        return await self._run(self._load_status, job_id)
+
+    def _load_status(self, job_id: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "select status_json from monitoring_queue where job_id = ?",
+                (job_id,),
+            ).fetchone()
+        if not row or not row[0]:
+            return None
+        return json.loads(row[0])
+
+    async def backlog(self) -> dict[str, int]:
+        return await self._run(self._backlog)
+
+    def _backlog(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "select payload, status_json from monitoring_queue"
+                " where state in ('queued', 'running')"
+            ).fetchall()
+        backlog: dict[str, int] = {}
+        for payload, status_json in rows:
+            payload = json.loads(payload)
+            remaining = len(payload.get("active_queries") or [])
+            progress = (json.loads(status_json) if status_json else {}).get("progress") or {}
+            if progress:
+                done = progress.get("completed_queries", 0) + progress.get("failed_queries", 0)
+                remaining = max(0, progress.get("total_queries", remaining) - done)
+            for platform in payload.get("platforms") or []:
+                backlog[platform] = backlog.get(platform, 0) + remaining
+        return backlog
+
+    async def stats(self) -> dict:
+        # Off the event loop: a worker holding the write lock can block the
+        # query for up to the connection timeout.
+        return await self._run(self._stats)
+
+    def _stats(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute(
+                "select state, count(*) from monitoring_queue group by state"
+            ).fetchall()
+        return {"backend": "sqlite", **{state: count for state, count in rows}}
+
+
+def build_job_queue(backend: str, path: str, max_attempts: int = 3) -> JobQueue | None:
+    """Return the configured queue, or None for in-process (inline) jobs."""
+    backend = (backend or "inline").lower()
+    if backend == "inline":
+        return None
+    if backend == "sqlite":
+        return SQLiteJobQueue(path, max_attempts=max_attempts)
+    raise ValueError(f"Unsupported job_queue_backend: {backend}")
+
+
+job_queue = build_job_queue(
+    settings.job_queue_backend,
+    settings.job_queue_path,
+    max_attempts=settings.job_queue_max_attempts,
+)
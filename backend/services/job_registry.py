@@ -0,0 +1,107 @@
+"""Bounded in-memory registry of monitoring job status objects."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+
+from models.schemas import MonitoringJobStatusResponse, MonitoringSnapshot
+from services.ttl_cache import TTLCache
+
+FINISHED_STATUSES = {"completed", "failed"}
+
+
+class JobRegistry:
+    """Keeps active jobs plus a bounded, time-limited set of finished ones.
+
+    Active jobs are never evicted. Finished jobs are dropped once they are
+    older than ``finished_ttl_sec`` or when more than ``max_jobs`` entries
+    are held (oldest finished first). Callers reload evicted jobs from the
+    ``monitoring_jobs`` table.
+    """
+
+    def __init__(self, max_jobs: int, finished_ttl_sec: float, max_hydrated: int = 16):
+        self.max_jobs = max(1, max_jobs)
+        self.finished_ttl_sec = finished_ttl_sec
+        self._jobs: dict[str, MonitoringJobStatusResponse] = {}
+        self._finished_at: OrderedDict[str, float] = OrderedDict()
+        self._offloaded: set[str] = set()
+        self._compact: dict[str, dict] = {}
+        # Decoded snapshots of recently polled jobs, so repeated polls of a
+        # finished job skip decode + validation. Small: the point of the
+        # compact form is not to keep every snapshot resident.
+        self._hydrated = TTLCache(max_entries=max_hydrated, ttl_sec=finished_ttl_sec)
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._jobs
+
+    def get(self, job_id: str) -> MonitoringJobStatusResponse | None:
+        return self._jobs.get(job_id)
+
+    def put(self, job: MonitoringJobStatusResponse) -> None:
+        self._jobs[job.job_id] = job
+        self.evict()
+
+    def mark_finished(self, job_id: str) -> None:
+        if job_id not in self._jobs:
+            return
+        self._finished_at[job_id] = time.monotonic()
+        self._finished_at.move_to_end(job_id)
+        self.evict()
+
+    def offload_snapshot(self, job_id: str, compact: dict | None = None) -> None:
+        """Replace the resident snapshot of a finished job.
+
+        With ``compact`` the snapshot stays available in its compact encoding;
+        without it callers reload the snapshot from storage.
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job_id not in self._finished_at:
+            return
+        job.snapshot = None
+        self._offloaded.add(job_id)
+        if compact is not None:
+            self._compact[job_id] = compact
+
+    def is_offloaded(self, job_id: str) -> bool:
+        return job_id in self._offloaded
+
+    def compact_snapshot(self, job_id: str) -> dict | None:
+        return self._compact.get(job_id)
+
+    def hydrated_snapshot(self, job_id: str) -> MonitoringSnapshot | None:
+        return self._hydrated.get(job_id)
+
+    def keep_hydrated(self, job_id: str, snapshot: MonitoringSnapshot) -> None:
+        if job_id in self._compact:
+            self._hydrated.set(job_id, snapshot)
+
+    def evict(self) -> None:
+        cutoff = time.monotonic() - self.finished_ttl_sec
+        while self._finished_at:
+            job_id, finished_at = next(iter(self._finished_at.items()))
+            if finished_at > cutoff and len(self._jobs) <= self.max_jobs:
+                break
+            self._drop(job_id)
+
+    def _drop(self, job_id: str) -> None:
+        self._finished_at.pop(job_id, None)
+        self._offloaded.discard(job_id)
+        self._compact.pop(job_id, None)
+        self._hydrated.pop(job_id)
+        if self._jobs.pop(job_id, None) is not None:
+            self.evictions += 1
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "jobs": len(self._jobs),
+            "finished": len(self._finished_at),
+            "offloaded": len(self._offloaded),
+            "hydrated": len(self._hydrated),
+            "evictions": self.evictions,
+        }
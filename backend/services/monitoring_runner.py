@@ -3,14 +3,25 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
+import logging
+from collections.abc import AsyncIterator
 from datetime import datetime, timezone
 from uuid import uuid4
 
-from db.supabase import store_monitoring_job, store_query_capture
+from config import settings
+from db.supabase import (
+    QueryRunWriteBuffer,
+    fetch_query_runs,
+    load_latest_snapshot,
+    load_monitoring_job,
+    store_monitoring_job,
+)
 from models.schemas import (
     BusinessProfile,
     CompetitorCandidate,
     EntityIndexItem,
+    ModelOutput,
     MonitoringJobProgress,
     MonitoringJobStatusResponse,
     MonitoringSnapshot,
@@ -19,15 +30,88 @@ from models.schemas import (
     QueryCaptureResult,
     SuggestedQuery,
 )
-from services.query_capture import run_query_capture
+from services.capture_scheduler import capture_scheduler
+from services.delta_monitoring import DeltaPlan, plan_delta, query_key, sample_drift
+from services.job_events import TERMINAL_EVENTS, job_events
+from services.job_queue import QueuedJob, job_queue
+from services.job_registry import FINISHED_STATUSES, JobRegistry
+from services.onboarding_suggester import record_competitor_observations
+from services.query_capture import output_from_query_run, run_query_capture
+from services.snapshot_codec import decode_snapshot, encode_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Keeps inline job tasks referenced until they finish.
+_INLINE_TASKS: set[asyncio.Task] = set()
+KEEPALIVE_EVENT = {"event": "keepalive", "data": {}}
+# Queued jobs also wait for a worker to claim them and warm up.
+QUEUED_JOB_MIN_SEC = 30
+
+_JOBS = JobRegistry(
+    max_jobs=settings.monitoring_job_registry_max,
+    finished_ttl_sec=settings.monitoring_job_ttl_sec,
+)
 
-_JOBS: dict[str, MonitoringJobStatusResponse] = {}
-_JOBS_LOCK = asyncio.Lock()
+
+def job_registry_stats() -> dict:
+    return _JOBS.stats
 
 
 async def get_monitoring_job_status(job_id: str) -> MonitoringJobStatusResponse | None:
-    async with _JOBS_LOCK:
-        return _JOBS.get(job_id)
+    _JOBS.evict()
+    job = _JOBS.get(job_id)
+    offloaded = _JOBS.is_offloaded(job_id)
+    if job and not offloaded:
+        return job
+
+    # Finished jobs keep their snapshot in compact form; hydrate it per read.
+    compact = _JOBS.compact_snapshot(job_id)
+    if job and compact is not None:
+        snapshot = _JOBS.hydrated_snapshot(job_id)
+        if snapshot is None:
+            snapshot = decode_snapshot(compact)
+            _JOBS.keep_hydrated(job_id, snapshot)
+        return job.model_copy(update={"snapshot": snapshot})
+
+    # Jobs run by queue workers share their status through the queue.
+    if job_queue is not None:
+        status = await job_queue.load_status(job_id)
+        if status:
+            try:
+                return _job_from_status(status)
+            except Exception:
+                pass
+
+    # Finished jobs are evicted (or stripped of their snapshot) once persisted;
+    # read them back from monitoring_jobs without re-caching.
+    row = await load_monitoring_job(job_id)
+    if row:
+        try:
+            return _job_from_row(row)
+        except Exception:
+            pass
+    return job
+
+
+async def estimate_job_duration_sec(
+    active_queries: list[SuggestedQuery], platforms: list[Platform]
+) -> int:
+    """Seconds a new job would take behind the captures already waiting."""
+    new_tasks = {platform: len(active_queries) for platform in platforms}
+    if job_queue is None:
+        return capture_scheduler.estimate_duration_sec(new_tasks)
+    # Queue workers run the captures, so this process's lanes are empty; the
+    # backlog comes from the queue itself.
+    backlog: dict[Platform, int] = {}
+    for value, count in (await job_queue.backlog()).items():
+        try:
+            backlog[Platform(value)] = count
+        except ValueError:
+            continue
+    return max(
+        QUEUED_JOB_MIN_SEC,
+        capture_scheduler.estimate_duration_sec(new_tasks, backlog=backlog),
+    )
 
 
 async def start_onboarding_job(
@@ -38,8 +122,13 @@ async def start_onboarding_job(
     selected_competitors: list[CompetitorCandidate],
     active_queries: list[SuggestedQuery],
     platforms: list[Platform],
+    mode: str = "full",
 ) -> str:
-    """Create and start an asynchronous monitoring job."""
+    """Create and start an asynchronous monitoring job.
+
+    ``mode="delta"`` re-captures only a sample of the queries when the config
+    has a previous snapshot (see ``services.delta_monitoring``).
+    """
     job_id = str(uuid4())
     progress = MonitoringJobProgress(
         total_queries=len(active_queries),
@@ -56,13 +145,27 @@ async def start_onboarding_job(
         error=None,
     )
 
-    async with _JOBS_LOCK:
-        _JOBS[job_id] = job
-
     await _persist_job(config_id=config_id, job=job)
 
-    asyncio.create_task(
-        _run_job(
+    if job_queue is not None:
+        payload = {
+            "config_id": config_id,
+            "email": email,
+            "profile": profile.model_dump(mode="json"),
+            "selected_competitors": [
+                row.model_dump(mode="json") for row in selected_competitors
+            ],
+            "active_queries": [row.model_dump(mode="json") for row in active_queries],
+            "platforms": [platform.value for platform in platforms],
+            "mode": mode,
+        }
+        await job_queue.enqueue(job_id, payload, job.model_dump(mode="json"))
+        return job_id
+
+    _JOBS.put(job)
+
+    task = asyncio.create_task(
+        _run_inline_job(
             job_id=job_id,
             config_id=config_id,
             email=email,
@@ -70,11 +173,98 @@ async def start_onboarding_job(
             selected_competitors=selected_competitors,
             active_queries=active_queries,
             platforms=platforms,
+            mode=mode,
         )
     )
+    _INLINE_TASKS.add(task)
+    task.add_done_callback(_INLINE_TASKS.discard)
     return job_id
 
 
+async def _run_inline_job(*, job_id: str, config_id: str, **kwargs) -> None:
+    """Run a job inside the API process, failing it (not leaving it running) on errors."""
+    try:
+        await _run_job(job_id=job_id, config_id=config_id, **kwargs)
+    except Exception as exc:
+        logger.exception("Monitoring job %s failed", job_id)
+        state = _job_state(job_id)
+        state.fail(str(exc))
+        await _persist_job(config_id=config_id, job=state.job)
+
+
+async def run_queued_job(queued: QueuedJob, worker_id: str) -> None:
+    """Run a job claimed from the queue, renewing its lease until it finishes."""
+    payload = queued.payload
+    status = await job_queue.load_status(queued.job_id)
+    job = _job_from_status(status) if status else MonitoringJobStatusResponse(
+        job_id=queued.job_id,
+        status="queued",
+        progress=MonitoringJobProgress(
+            total_queries=len(payload["active_queries"]),
+            completed_queries=0,
+            failed_queries=0,
+        ),
+    )
+    # Progress is recounted as the job (re)runs; checkpointed queries finish instantly.
+    job.progress.completed_queries = 0
+    job.progress.failed_queries = 0
+    job.partial_top_entities = []
+    _JOBS.put(job)
+
+    lease_sec = settings.job_queue_lease_sec
+    run = asyncio.create_task(
+        _run_job(
+            job_id=queued.job_id,
+            config_id=payload["config_id"],
+            email=payload["email"],
+            profile=BusinessProfile(**payload["profile"]),
+            selected_competitors=[
+                CompetitorCandidate(**row) for row in payload["selected_competitors"]
+            ],
+            active_queries=[SuggestedQuery(**row) for row in payload["active_queries"]],
+            platforms=[Platform(value) for value in payload["platforms"]],
+            resume=queued.attempts > 1,
+            mode=payload.get("mode", "full"),
+        )
+    )
+    heartbeat = asyncio.create_task(_keep_lease(queued.job_id, worker_id, lease_sec))
+    try:
+        await asyncio.wait({run, heartbeat}, return_when=asyncio.FIRST_COMPLETED)
+        if not run.done():
+            # The lease is gone and another worker may already have reclaimed
+            # the job; stop here and leave finishing it to that worker.
+            run.cancel()
+            await asyncio.gather(run, return_exceptions=True)
+            logger.warning("Lost lease on job %s; stopped running it", queued.job_id)
+            return
+        run.result()
+    except Exception as exc:
+        state = _job_state(queued.job_id)
+        state.fail(str(exc))
+        await _share_status(state)
+        if not await _persist_job(config_id=payload["config_id"], job=state.job):
+            logger.warning("Failed monitoring job %s was not persisted", queued.job_id)
+        await job_queue.finish(queued.job_id, worker_id, failed=True)
+        raise
+    else:
+        await job_queue.finish(queued.job_id, worker_id)
+    finally:
+        heartbeat.cancel()
+        run.cancel()
+
+
+async def _keep_lease(job_id: str, worker_id: str, lease_sec: float) -> None:
+    """Renew a job lease until it is lost (returns) or the caller cancels."""
+    while True:
+        await asyncio.sleep(lease_sec / 3)
+        try:
+            if not await job_queue.heartbeat(job_id, worker_id, lease_sec):
+                return
+        except Exception:
+            logger.exception("Heartbeat for job %s failed", job_id)
+            return
+
+
 async def _run_job(
     *,
     job_id: str,
@@ -84,21 +274,111 @@ async def _run_job(
     selected_competitors: list[CompetitorCandidate],
     active_queries: list[SuggestedQuery],
     platforms: list[Platform],
+    resume: bool = False,
+    mode: str = "full",
 ) -> None:
-    await _set_job_status(job_id=job_id, status="running")
+    state = _job_state(job_id)
+    state.set_status("running")
+    await _share_status(state)
+
+    # A resumed job reuses the outputs an earlier attempt already stored in
+    # query_runs and only queries the missing (query, platform) pairs.
+    checkpoints = await _load_checkpoints(job_id) if resume else {}
 
-    semaphore = asyncio.Semaphore(2)
+    run_buffer = QueryRunWriteBuffer()
     query_results: list[QueryCaptureResult] = []
     all_entities: list[EntityIndexItem] = []
 
+    # Every (query, platform) pair goes to the shared capture scheduler, which
+    # bounds provider concurrency and shares it fairly between jobs.
+    def capture(platform: Platform, query: str):
+        return capture_scheduler.submit(
+            job_id, platform, query, on_start=lambda: state.set_current_query(query)
+        )
+
     async def worker(item: SuggestedQuery) -> tuple[QueryCaptureResult | None, Exception | None]:
-        async with semaphore:
-            await _set_current_query(job_id, item.text)
-            try:
-                result = await run_query_capture(
-                    QueryCaptureRequest(email=email, query=item.text, platforms=platforms)
+        checkpointed = checkpoints.get(_checkpoint_key(item.text), [])
+        try:
+            result = await run_query_capture(
+                QueryCaptureRequest(email=email, query=item.text, platforms=platforms),
+                checkpointed=checkpointed or None,
+                capture=capture,
+            )
+            # Each finished query is checkpointed through its query_runs rows.
+            captured = result.model_dump()
+            reused = {output.platform for output in checkpointed}
+            captured["outputs"] = [
+                output for output in captured["outputs"] if output["platform"] not in reused
+            ]
+            await run_buffer.add(
+                email,
+                captured,
+                metadata={
+                    "config_id": config_id,
+                    "job_id": job_id,
+                    "query_category": item.category,
+                    "scope_level": profile.scope_level,
+                },
+            )
+            return result, None
+        except Exception as exc:
+            return None, exc
+
+    async def capture_all(items: list[SuggestedQuery]) -> list[QueryCaptureResult]:
+        captured: list[QueryCaptureResult] = []
+        tasks = [asyncio.create_task(worker(item)) for item in items]
+        try:
+            for task in asyncio.as_completed(tasks):
+                result, error = await task
+                if result is None:
+                    state.record_failure(error)
+                    await _share_status(state)
+                    continue
+
+                captured.append(result)
+                query_results.append(result)
+                all_entities.extend(result.entity_index)
+                state.record_result(result.entity_index)
+                await _share_status(state)
+        finally:
+            # A cancelled job (e.g. lost lease) must not leave captures running.
+            for task in tasks:
+                task.cancel()
+        return captured
+
+    plan = None
+    if mode == "delta":
+        plan = await _plan_delta(job_id, config_id, active_queries, platforms)
+    run_mode = "full"
+    carried_queries: list[str] = []
+    carried_runs: dict[str, int] = {}
+    drift: float | None = None
+    if plan is None:
+        await capture_all(active_queries)
+    else:
+        drift = sample_drift(plan, await capture_all(plan.sample))
+        if drift > settings.monitoring_delta_drift_threshold:
+            run_mode = "escalated"
+            await capture_all(plan.rest)
+        else:
+            run_mode = "delta"
+            # Unchanged sample: the remaining queries keep their previous
+            # capture, re-stamped as part of this run and stored in query_runs
+            # (flagged as carried) so history built from it has no gaps.
+            carried_at = datetime.now(timezone.utc).isoformat()
+            for item in plan.rest:
+                key = query_key(item.text)
+                result = plan.previous[key].model_copy(
+                    update={"run_id": str(uuid4()), "created_at": carried_at}
                 )
-                await store_query_capture(
+                carried_queries.append(item.text)
+                carried_runs[key] = plan.carried_runs.get(key, 0) + 1
+                query_results.append(result)
+                all_entities.extend(result.entity_index)
+                state.record_result(result.entity_index)
+                if key in checkpoints:
+                    continue  # stored by an earlier attempt of this job
+                await run_buffer.add(
                     email,
                     result.model_dump(),
                     metadata={
@@ -106,26 +386,12 @@ async def _run_job(
                         "job_id": job_id,
                         "query_category": item.category,
                         "scope_level": profile.scope_level,
+                        "carried": True,
                     },
                 )
-                return result, None
-            except Exception as exc:
-                return None, exc
-
-    tasks = [asyncio.create_task(worker(item)) for item in active_queries]
-
-    for task in asyncio.as_completed(tasks):
-        result, error = await task
-        if result is None:
-            await _increment_progress(job_id, failed=True)
-            if error:
-                await _set_job_error(job_id, str(error))
-            continue
+            await _share_status(state)
 
-        query_results.append(result)
-        all_entities.extend(result.entity_index)
-        await _increment_progress(job_id, failed=False)
-        await _set_partial_entities(job_id, all_entities)
+    await run_buffer.close()
 
     created_at = datetime.now(timezone.utc).isoformat()
     snapshot = MonitoringSnapshot(
@@ -139,12 +405,65 @@ async def _run_job(
         query_runs=query_results,
         aggregated_entities=all_entities,
         summary=_build_summary(profile, query_results, all_entities),
+        run_mode=run_mode,
+        carried_queries=carried_queries,
+        carried_runs=carried_runs,
+        drift=drift,
+    )
+
+    state.complete(snapshot)
+    compact = encode_snapshot(snapshot)
+    await _share_status(state, compact)
+    if not await _persist_job(config_id=config_id, job=state.job, compact=compact):
+        # The compact copy below still serves polls, but only until eviction.
+        logger.warning("Completed monitoring job %s was not persisted", job_id)
+    _JOBS.offload_snapshot(job_id, compact)
+
+    # Carried-forward captures were already counted when they were fresh.
+    carried = set(carried_queries)
+    record_competitor_observations(
+        profile, [result for result in query_results if result.query not in carried]
+    )
+
+
+async def _plan_delta(
+    job_id: str,
+    config_id: str,
+    active_queries: list[SuggestedQuery],
+    platforms: list[Platform],
+) -> DeltaPlan | None:
+    """Plan a delta run against the config's last completed snapshot, if any."""
+    stored = await load_latest_snapshot(config_id)
+    if not stored:
+        return None
+    try:
+        previous = decode_snapshot(stored)
+    except Exception:
+        return None
+    return plan_delta(
+        previous,
+        active_queries,
+        platforms,
+        sample_ratio=settings.monitoring_delta_sample_ratio,
+        seed=job_id,
+        max_carries=settings.monitoring_delta_max_carries,
     )
 
-    await _set_job_complete(job_id=job_id, snapshot=snapshot)
-    job = await get_monitoring_job_status(job_id)
-    if job:
-        await _persist_job(config_id=config_id, job=job)
+
+async def _load_checkpoints(job_id: str) -> dict[str, list[ModelOutput]]:
+    """Group successful stored outputs of a job by normalized query text."""
+    checkpoints: dict[str, dict[Platform, ModelOutput]] = {}
+    for row in await fetch_query_runs(job_id):
+        output = output_from_query_run(row)
+        if output is None:
+            continue
+        key = row.get("query_normalized") or _checkpoint_key(output.query)
+        checkpoints.setdefault(key, {})[output.platform] = output
+    return {key: list(outputs.values()) for key, outputs in checkpoints.items()}
+
+
+def _checkpoint_key(query: str) -> str:
+    return " ".join(query.lower().split())
 
 
 def _build_summary(
@@ -159,76 +478,233 @@ def _build_summary(
     )
 
 
-async def _set_job_status(*, job_id: str, status: str) -> None:
-    async with _JOBS_LOCK:
-        job = _JOBS.get(job_id)
-        if not job:
+class _JobState:
+    """Progress of one running job, owned by the task that runs it.
+
+    Updates happen on the event loop without awaiting, so they never
+    interleave and need no lock; status reads return the live ``job``.
+    ``partial_top_entities`` is kept as a bounded top-k instead of being
+    re-sorted from every entity seen so far.
+    """
+
+    TOP_K = 10
+
+    def __init__(self, job: MonitoringJobStatusResponse):
+        self.job = job
+
+    def _publish(self, event: str, data: dict) -> None:
+        job_events.publish(self.job.job_id, event, data)
+
+    def set_status(self, status: str) -> None:
+        self.job.status = status
+        self._publish("status", {"status": status})
+
+    def set_current_query(self, query: str) -> None:
+        self.job.progress.current_query = query
+        self._publish("progress", _progress_event(self.job))
+
+    def record_failure(self, error: Exception | None) -> None:
+        self.job.progress.completed_queries += 1
+        self.job.progress.failed_queries += 1
+        if error:
+            self.job.error = str(error)
+        self._publish("progress", _progress_event(self.job))
+
+    def record_result(self, entities: list[EntityIndexItem]) -> None:
+        self.job.progress.completed_queries += 1
+        self._publish("progress", _progress_event(self.job))
+        if entities:
+            # nsmallest is stable like sorted()[:k], so ties keep arrival order.
+            top = heapq.nsmallest(
+                self.TOP_K,
+                [*self.job.partial_top_entities, *entities],
+                key=_entity_rank,
+            )
+            if top != self.job.partial_top_entities:
+                self.job.partial_top_entities = top
+                self._publish("entities", _entities_event(self.job))
+
+    def complete(self, snapshot: MonitoringSnapshot) -> None:
+        self.job.status = "completed"
+        self.job.progress.current_query = None
+        self.job.snapshot = snapshot
+        _JOBS.mark_finished(self.job.job_id)
+        self._publish("completed", _completed_event(self.job))
+
+    def fail(self, error: str) -> None:
+        self.job.status = "failed"
+        self.job.progress.current_query = None
+        self.job.error = error
+        _JOBS.mark_finished(self.job.job_id)
+        self._publish("failed", {"error": error})
+
+
+async def stream_job_events(job_id: str) -> AsyncIterator[dict]:
+    """Yield compact progress events for a job until it completes or fails.
+
+    Starts with the current state (without the snapshot). Jobs running in
+    this process push events through ``job_events``; jobs run by queue
+    workers elsewhere are followed by polling the shared status. A
+    ``KEEPALIVE_EVENT`` is yielded after ``job_events_keepalive_sec`` without
+    news, and the stream ends after ``job_events_idle_timeout_sec`` without a
+    real event (clients reconnect and get the current state again).
+    """
+    loop = asyncio.get_running_loop()
+    keepalive_sec = settings.job_events_keepalive_sec
+    idle_timeout_sec = settings.job_events_idle_timeout_sec
+    # Subscribe first so no event slips between the state read and the stream.
+    queue = job_events.subscribe(job_id)
+    try:
+        job = await get_monitoring_job_status(job_id)
+        if job is None:
+            return
+        for event in _state_events(job):
+            yield event
+        if job.status in FINISHED_STATUSES:
             return
-        job.status = status
-        _JOBS[job_id] = job
 
+        last_event_at = loop.time()
+        if _JOBS.get(job_id) is job:
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), keepalive_sec)
+                except asyncio.TimeoutError:
+                    if loop.time() - last_event_at >= idle_timeout_sec:
+                        return
+                    yield KEEPALIVE_EVENT
+                    continue
+                last_event_at = loop.time()
+                yield message
+                if message["event"] in TERMINAL_EVENTS:
+                    return
+
+        seen = _event_data(job)
+        last_sent_at = last_event_at
+        while True:
+            await asyncio.sleep(settings.job_queue_poll_interval_sec)
+            job = await get_monitoring_job_status(job_id)
+            if job is None:
+                return
+            current = _event_data(job)
+            for event, data in current.items():
+                if data != seen.get(event):
+                    last_event_at = last_sent_at = loop.time()
+                    yield {"event": event, "data": data}
+            seen = current
+            if job.status in FINISHED_STATUSES:
+                return
+            now = loop.time()
+            if now - last_event_at >= idle_timeout_sec:
+                return
+            if now - last_sent_at >= keepalive_sec:
+                last_sent_at = now
+                yield KEEPALIVE_EVENT
+    finally:
+        job_events.unsubscribe(job_id, queue)
+
+
+def _progress_event(job: MonitoringJobStatusResponse) -> dict:
+    return job.progress.model_dump()
+
+
+def _entities_event(job: MonitoringJobStatusResponse) -> dict:
+    return {
+        "partial_top_entities": [
+            row.model_dump(mode="json") for row in job.partial_top_entities
+        ]
+    }
 
-async def _set_current_query(job_id: str, query: str) -> None:
-    async with _JOBS_LOCK:
-        job = _JOBS.get(job_id)
-        if not job:
-            return
-        job.progress.current_query = query
-        _JOBS[job_id] = job
+
+def _completed_event(job: MonitoringJobStatusResponse) -> dict:
+    snapshot = job.snapshot
+    return {
+        "summary": snapshot.summary if snapshot else None,
+        "run_mode": snapshot.run_mode if snapshot else None,
+        "query_runs": len(snapshot.query_runs) if snapshot else 0,
+        "entities": len(snapshot.aggregated_entities) if snapshot else 0,
+    }
 
 
-async def _set_partial_entities(job_id: str, entities: list[EntityIndexItem]) -> None:
-    async with _JOBS_LOCK:
-        job = _JOBS.get(job_id)
-        if not job:
-            return
-        ordered = sorted(
-            entities,
-            key=lambda row: ((row.position or 999), row.platform, row.entity.lower()),
-        )
-        job.partial_top_entities = ordered[:10]
-        _JOBS[job_id] = job
+def _event_data(job: MonitoringJobStatusResponse) -> dict[str, dict]:
+    data = {
+        "status": {"status": job.status},
+        "progress": _progress_event(job),
+        "entities": _entities_event(job),
+    }
+    if job.status == "completed":
+        data["completed"] = _completed_event(job)
+    elif job.status == "failed":
+        data["failed"] = {"error": job.error}
+    return data
 
 
-async def _increment_progress(job_id: str, failed: bool) -> None:
-    async with _JOBS_LOCK:
-        job = _JOBS.get(job_id)
-        if not job:
-            return
-        job.progress.completed_queries += 1
-        if failed:
-            job.progress.failed_queries += 1
-        _JOBS[job_id] = job
+def _state_events(job: MonitoringJobStatusResponse) -> list[dict]:
+    return [{"event": event, "data": data} for event, data in _event_data(job).items()]
 
 
-async def _set_job_error(job_id: str, error: str) -> None:
-    async with _JOBS_LOCK:
-        job = _JOBS.get(job_id)
-        if not job:
-            return
-        job.error = error
-        _JOBS[job_id] = job
+def _entity_rank(row: EntityIndexItem) -> tuple:
+    return (row.position or 999), row.platform, row.entity.lower()
 
 
-async def _set_job_complete(job_id: str, snapshot: MonitoringSnapshot) -> None:
-    async with _JOBS_LOCK:
-        job = _JOBS.get(job_id)
-        if not job:
-            return
-        job.status = "completed"
-        job.progress.current_query = None
-        job.snapshot = snapshot
-        _JOBS[job_id] = job
+def _job_state(job_id: str) -> _JobState:
+    job = _JOBS.get(job_id)
+    if job is None:
+        job = MonitoringJobStatusResponse(
+            job_id=job_id,
+            status="queued",
+            progress=MonitoringJobProgress(
+                total_queries=0, completed_queries=0, failed_queries=0
+            ),
+        )
+        _JOBS.put(job)
+    return _JobState(job)
+
+
+async def _share_status(state: _JobState, compact: dict | None = None) -> None:
+    """Publish the job status to the queue so other processes can read it."""
+    if job_queue is None:
+        return
+    status = state.job.model_dump(mode="json", exclude={"snapshot"})
+    if state.job.snapshot is not None:
+        status["snapshot"] = compact or encode_snapshot(state.job.snapshot)
+    await job_queue.save_status(state.job.job_id, status)
 
 
-async def _persist_job(config_id: str, job: MonitoringJobStatusResponse) -> None:
+def _job_from_status(status: dict) -> MonitoringJobStatusResponse:
+    snapshot = status.get("snapshot")
+    job = MonitoringJobStatusResponse(**{**status, "snapshot": None})
+    if snapshot:
+        job.snapshot = decode_snapshot(snapshot)
+    return job
+
+
+async def _persist_job(
+    config_id: str, job: MonitoringJobStatusResponse, compact: dict | None = None
+) -> bool:
     payload = {
         "job_id": job.job_id,
         "config_id": config_id,
         "status": job.status,
         "progress_json": job.progress.model_dump(),
         "partial_top_entities_json": [row.model_dump() for row in job.partial_top_entities],
-        "snapshot_json": job.snapshot.model_dump() if job.snapshot else None,
+        "snapshot_json": (
+            compact or encode_snapshot(job.snapshot) if job.snapshot else None
+        ),
         "error": job.error,
     }
-    await store_monitoring_job(payload)
+    return await store_monitoring_job(payload)
+
+
+def _job_from_row(row: dict) -> MonitoringJobStatusResponse:
+    return MonitoringJobStatusResponse(
+        job_id=row["job_id"],
+        status=row.get("status") or "queued",
+        progress=MonitoringJobProgress(**(row.get("progress_json") or {})),
+        partial_top_entities=[
+            EntityIndexItem(**item) for item in row.get("partial_top_entities_json") or []
+        ],
+        snapshot=(
+            decode_snapshot(row["snapshot_json"]) if row.get("snapshot_json") else None
+        ),
+        error=row.get("error"),
+    )
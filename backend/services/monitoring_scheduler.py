@@ -0,0 +1,236 @@
+"""Recurring monitoring runs for stored ``monitoring_configs``.
+
+Every config is re-run on its own cadence (``cadence_sec`` on the row, or
+``monitoring_default_cadence_sec``). Each start time gets random jitter so
+configs created together do not hit the providers together, and a run is
+skipped while the config's previous job is still active. The first due time
+after a (re)start counts from the config's latest stored job, so deploys do
+not trigger an extra sweep.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+
+from config import settings
+from db.supabase import fetch_monitoring_configs, load_latest_job_created_at
+from models.schemas import (
+    BusinessProfile,
+    CompetitorCandidate,
+    Platform,
+    SuggestedQuery,
+)
+from services.monitoring_runner import get_monitoring_job_status, start_onboarding_job
+
+logger = logging.getLogger(__name__)
+
+_ACTIVE_STATUSES = {"queued", "running"}
+
+
+class ConfigStore(ABC):
+    """Source of monitoring configs (rows shaped like ``monitoring_configs``)."""
+
+    @abstractmethod
+    async def list_configs(self) -> list[dict]:
+        ...
+
+    @abstractmethod
+    async def last_run_at(self, config_id: str) -> str | None:
+        """Creation time of the config's most recent job, if any."""
+
+
+class SupabaseConfigStore(ConfigStore):
+    async def list_configs(self) -> list[dict]:
+        return await fetch_monitoring_configs()
+
+    async def last_run_at(self, config_id: str) -> str | None:
+        return await load_latest_job_created_at(config_id)
+
+
+class InMemoryConfigStore(ConfigStore):
+    """Local stand-in store for tests and development without Supabase."""
+
+    def __init__(self, configs: list[dict] | None = None, last_runs: dict[str, str] | None = None):
+        self.configs = list(configs or [])
+        self.last_runs = dict(last_runs or {})
+
+    async def list_configs(self) -> list[dict]:
+        return [dict(row) for row in self.configs]
+
+    async def last_run_at(self, config_id: str) -> str | None:
+        return self.last_runs.get(config_id)
+
+
+class MonitoringScheduler:
+    """Starts monitoring jobs for stored configs on a per-config cadence."""
+
+    def __init__(
+        self,
+        store: ConfigStore,
+        *,
+        default_cadence_sec: float,
+        jitter_ratio: float = 0.1,
+        poll_interval_sec: float = 60.0,
+        start_job: Callable[..., Awaitable[str]] = start_onboarding_job,
+        clock: Callable[[], float] = time.time,
+        rng: random.Random | None = None,
+    ):
+        self.store = store
+        self.default_cadence_sec = default_cadence_sec
+        self.jitter_ratio = max(0.0, jitter_ratio)
+        self.poll_interval_sec = poll_interval_sec
+        self._start_job = start_job
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._next_run: dict[str, float] = {}
+        self._active_jobs: dict[str, str] = {}
+        self._task: asyncio.Task | None = None
+        self.started = 0
+        self.skipped = 0
+        self.failures = 0
+        self.last_lag_sec = 0.0
+        self.max_lag_sec = 0.0
+
+    def _cadence(self, row: dict) -> float:
+        return float(row.get("cadence_sec") or self.default_cadence_sec)
+
+    def _jitter(self, cadence_sec: float) -> float:
+        return self._rng.uniform(0.0, self.jitter_ratio * cadence_sec)
+
+    async def _first_run(self, row: dict, now: float) -> float:
+        # The onboarding auto_run covers the first period after creation, and
+        # the latest stored job covers the period after that; only the
+        # schedule itself lives in memory.
+        cadence_sec = self._cadence(row)
+        created_at = _parse_timestamp(row.get("created_at")) or now
+        last_run = _parse_timestamp(await self.store.last_run_at(str(row["id"])))
+        due = max(created_at, last_run or 0.0) + cadence_sec
+        if due < now:
+            due = now
+        return due + self._jitter(cadence_sec)
+
+    async def tick(self) -> list[str]:
+        """Start every due config once; returns the ids of the started jobs."""
+        now = self._clock()
+        configs = await self.store.list_configs()
+        known = {str(row["id"]) for row in configs if row.get("id")}
+        for config_id in list(self._next_run):
+            if config_id not in known:
+                self._next_run.pop(config_id, None)
+                self._active_jobs.pop(config_id, None)
+
+        started: list[str] = []
+        for row in configs:
+            if not row.get("id"):
+                continue
+            config_id = str(row["id"])
+            due = self._next_run.get(config_id)
+            if due is None:
+                self._next_run[config_id] = await self._first_run(row, now)
+                continue
+            if due > now:
+                continue
+
+            cadence_sec = self._cadence(row)
+            self._next_run[config_id] = now + cadence_sec + self._jitter(cadence_sec)
+            if await self._is_active(config_id):
+                self.skipped += 1
+                continue
+
+            self.last_lag_sec = now - due
+            self.max_lag_sec = max(self.max_lag_sec, self.last_lag_sec)
+            try:
+                job_id = await self._start_job(**_job_args(row))
+            except Exception:
+                self.failures += 1
+                logger.exception("Scheduled run for config %s failed to start", config_id)
+                continue
+            self._active_jobs[config_id] = job_id
+            self.started += 1
+            started.append(job_id)
+        return started
+
+    async def _is_active(self, config_id: str) -> bool:
+        job_id = self._active_jobs.get(config_id)
+        if not job_id:
+            return False
+        job = await get_monitoring_job_status(job_id)
+        if job and job.status in _ACTIVE_STATUSES:
+            return True
+        self._active_jobs.pop(config_id, None)
+        return False
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.tick()
+            except Exception:
+                logger.exception("Monitoring scheduler tick failed")
+            await asyncio.sleep(self.poll_interval_sec)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    @property
+    def stats(self) -> dict:
+        now = self._clock()
+        upcoming = sorted(self._next_run.items(), key=lambda item: item[1])
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "configs": len(self._next_run),
+            "active_jobs": len(self._active_jobs),
+            "started": self.started,
+            "skipped_active": self.skipped,
+            "failures": self.failures,
+            "last_lag_sec": round(self.last_lag_sec, 1),
+            "max_lag_sec": round(self.max_lag_sec, 1),
+            "next_runs": [
+                {"config_id": config_id, "in_sec": round(due - now, 1)}
+                for config_id, due in upcoming[:10]
+            ],
+        }
+
+
+def _job_args(row: dict) -> dict:
+    return {
+        "config_id": str(row["id"]),
+        "email": row.get("email") or "",
+        "profile": BusinessProfile(**(row.get("profile_json") or {})),
+        "selected_competitors": [
+            CompetitorCandidate(**item) for item in row.get("competitors_json") or []
+        ],
+        "active_queries": [SuggestedQuery(**item) for item in row.get("queries_json") or []],
+        "platforms": [Platform(value) for value in row.get("platforms_json") or []],
+        "mode": "delta" if settings.monitoring_delta_enabled else "full",
+    }
+
+
+def _parse_timestamp(value) -> float | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+monitoring_scheduler = MonitoringScheduler(
+    SupabaseConfigStore(),
+    default_cadence_sec=settings.monitoring_default_cadence_sec,
+    jitter_ratio=settings.monitoring_schedule_jitter_ratio,
+    poll_interval_sec=settings.monitoring_scheduler_poll_sec,
+)
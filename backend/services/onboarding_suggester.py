@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import re
 from typing import Any
@@ -10,7 +11,19 @@ from urllib.parse import urlparse
 from openai import AsyncOpenAI
 
 from config import settings
-from models.schemas import BusinessProfile, CompetitorCandidate, SuggestedQuery
+from models.schemas import (
+    BusinessProfile,
+    CompetitorCandidate,
+    QueryCaptureResult,
+    SuggestedQuery,
+)
+from services.competitor_catalog import competitor_catalog, coverage_hits
+from services.rate_limiter import estimate_tokens, openai_limiter
+from services.suggestion_cache import (
+    competitor_fingerprint,
+    profile_fingerprint,
+    suggestion_cache,
+)
 
 _CITY_REGION = {
     "bergen": "Vestland",
@@ -21,48 +34,42 @@ _CITY_REGION = {
     "kristiansand": "Agder",
 }
 
-_BANK_COMPETITORS = [
-    ("DNB", "dnb.no"),
-    ("Nordea Norge", "nordea.no"),
-    ("SpareBank 1", "sparebank1.no"),
-    ("Storebrand", "storebrand.no"),
-    ("Handelsbanken Norge", "handelsbanken.no"),
-    ("Sbanken", "sbanken.no"),
-    ("KLP", "klp.no"),
-    ("Danske Bank Norge", "danskebank.no"),
-]
+_INDUSTRY_KEYWORDS = {
+    "banking": ["bank", "dnb", "nordea", "sparebank", "storebrand", "klp"],
+    "bike_shop": ["sykkel", "bike", "cycling", "pedal"],
+    "restaurant": ["restaurant", "cafe", "mat", "food"],
+    "insurance": ["forsikring", "insurance"],
+    "retail": ["butikk", "shop", "store"],
+    "technology": ["saas", "software", "app", "tech", "it"],
+}
+_DEFAULT_INDUSTRY = "services"
+
+_COUNTRY_CODES = {"no": "no", "nor": "no", "norge": "no", "noreg": "no", "norway": "no"}
 
 _client = AsyncOpenAI(api_key=settings.openai_api_key) if settings.openai_api_key else None
 
 
+# Fields whose change invalidates competitor/query suggestions drafted from
+# the fallback profile; confidence, website and size_band alone do not.
+_MATERIAL_PROFILE_FIELDS = ("business_name", "industry", "country", "region", "city", "scope_level")
+
+
 async def infer_business_profile(raw_input: str, locale: str = "nb-NO") -> BusinessProfile:
     """Infer onboarding profile from user-provided business input."""
     del locale
-    normalized = (raw_input or "").strip()
-    if not normalized:
-        raise ValueError("Mangler input for profilering.")
-
+    normalized = _require_input(raw_input)
     profile = _fallback_business_profile(normalized)
     llm_profile = await _llm_business_profile(normalized)
-    if llm_profile:
-        profile = _merge_profile(profile, llm_profile)
-    profile.scope_level = _infer_scope_level(profile.size_band, profile.city, profile.region)
-    return profile
+    return _finalize_profile(profile, llm_profile)
 
 
 async def suggest_competitors(
     profile: BusinessProfile, limit: int = 8
 ) -> list[CompetitorCandidate]:
     """Suggest relevant competitors with geographic matching."""
-    candidates = _fallback_competitors(profile, limit=limit)
-    llm_candidates = await _llm_competitors(profile, limit=limit)
-    if llm_candidates:
-        candidates = _merge_competitors(
-            profile.business_name, llm_candidates + candidates, limit=limit
-        )
-    else:
-        candidates = _merge_competitors(profile.business_name, candidates, limit=limit)
-    return candidates
+    cataloged = _catalog_competitors(profile, limit=limit)
+    llm_candidates = await _llm_competitors_unless_cataloged(profile, cataloged, limit=limit)
+    return _finalize_competitors(profile, cataloged, llm_candidates, limit=limit)
 
 
 async def suggest_queries(
@@ -71,15 +78,209 @@ async def suggest_queries(
     limit: int = 12,
 ) -> list[SuggestedQuery]:
     """Suggest high-signal monitoring queries from profile + competitors."""
-    suggestions = _fallback_queries(profile, competitors, limit=limit)
     llm_suggestions = await _llm_queries(profile, competitors, limit=limit)
-    if llm_suggestions:
-        suggestions = _merge_queries(llm_suggestions + suggestions, limit=limit)
-    else:
-        suggestions = _merge_queries(suggestions, limit=limit)
+    return _finalize_queries(profile, competitors, llm_suggestions, limit=limit)
+
+
+async def bootstrap_onboarding(
+    raw_input: str,
+    locale: str = "nb-NO",
+    competitor_limit: int = 8,
+    query_limit: int = 12,
+    query_competitors: int = 5,
+) -> tuple[BusinessProfile, list[CompetitorCandidate], list[SuggestedQuery]]:
+    """Build profile, competitor and query suggestions in one overlapped pass.
+
+    The competitor and query LLM calls start right away from the fallback
+    profile (queries from the fallback competitor list) while the LLM profile
+    is still in flight. When the profile lands they are kept unless it changed
+    a material field, in which case both are re-issued from the final profile.
+    The deterministic halves of each stage always run against the final
+    profile and competitor list, so a kept draft only differs in the context
+    the LLM saw.
+    """
+    del locale
+    normalized = _require_input(raw_input)
+    draft = _fallback_business_profile(normalized)
+    profile_task = asyncio.create_task(_llm_business_profile(normalized))
+    drafts = _start_suggestion_calls(draft, competitor_limit, query_limit, query_competitors)
+    try:
+        profile = _finalize_profile(draft, await profile_task)
+        if _profile_changed(draft, profile):
+            for task in drafts:
+                task.cancel()
+            drafts = _start_suggestion_calls(
+                profile, competitor_limit, query_limit, query_competitors
+            )
+        llm_candidates, llm_suggestions = await asyncio.gather(*drafts)
+    finally:
+        for task in (profile_task, *drafts):
+            task.cancel()
+
+    competitors = _finalize_competitors(
+        profile,
+        _catalog_competitors(profile, limit=competitor_limit),
+        llm_candidates,
+        limit=competitor_limit,
+    )
+    queries = _finalize_queries(
+        profile, competitors[:query_competitors], llm_suggestions, limit=query_limit
+    )
+    return profile, competitors, queries
+
+
+def _start_suggestion_calls(
+    profile: BusinessProfile,
+    competitor_limit: int,
+    query_limit: int,
+    query_competitors: int,
+) -> tuple[asyncio.Task, asyncio.Task]:
+    cataloged = _catalog_competitors(profile, limit=competitor_limit)
+    seed_competitors = _finalize_competitors(profile, cataloged, [], limit=competitor_limit)
+    return (
+        asyncio.create_task(
+            _llm_competitors_unless_cataloged(profile, cataloged, limit=competitor_limit)
+        ),
+        asyncio.create_task(
+            _llm_queries(profile, seed_competitors[:query_competitors], limit=query_limit)
+        ),
+    )
+
+
+def _require_input(raw_input: str) -> str:
+    normalized = (raw_input or "").strip()
+    if not normalized:
+        raise ValueError("Mangler input for profilering.")
+    return normalized
+
+
+def _finalize_profile(
+    profile: BusinessProfile, llm_profile: BusinessProfile | None
+) -> BusinessProfile:
+    if llm_profile:
+        profile = _merge_profile(profile, llm_profile)
+    profile.scope_level = _infer_scope_level(profile.size_band, profile.city, profile.region)
+    return profile
+
+
+def record_competitor_observations(
+    profile: BusinessProfile, query_runs: list[QueryCaptureResult]
+) -> None:
+    """Feed a monitoring run's entity indexes into the competitor catalog."""
+    industry = _catalog_industry(profile)
+    if industry is None:
+        return
+    competitor_catalog.observe(
+        industry=industry,
+        scope_level=profile.scope_level,
+        city=profile.city,
+        region=profile.region,
+        query_runs=query_runs,
+        exclude=(profile.business_name, _website_host(profile.website)),
+    )
+
+
+def _catalog_industry(profile: BusinessProfile) -> str | None:
+    # Keyword guessing would file a "Konditori" under technology ("it"), so
+    # only an exact catalog industry is trusted.
+    if competitor_catalog.has_industry(profile.industry):
+        return profile.industry
+    return None
+
+
+def _catalog_competitors(
+    profile: BusinessProfile, limit: int
+) -> list[CompetitorCandidate]:
+    industry = _catalog_industry(profile)
+    if industry is None:
+        return []
+    return competitor_catalog.lookup(
+        industry=industry,
+        city=profile.city,
+        region=profile.region,
+        exclude=(profile.business_name, _website_host(profile.website)),
+        limit=limit,
+        min_candidates=_catalog_min_candidates(limit),
+        scope_level=profile.scope_level,
+    )
+
+
+def _catalog_min_candidates(limit: int) -> int:
+    return max(1, min(limit, settings.competitor_catalog_min_candidates))
+
+
+async def _llm_competitors_unless_cataloged(
+    profile: BusinessProfile, cataloged: list[CompetitorCandidate], limit: int
+) -> list[CompetitorCandidate]:
+    if coverage_hits(cataloged, profile.scope_level) >= _catalog_min_candidates(limit):
+        return []
+    return await _llm_competitors(profile, limit=limit)
+
+
+def _finalize_competitors(
+    profile: BusinessProfile,
+    cataloged: list[CompetitorCandidate],
+    llm_candidates: list[CompetitorCandidate],
+    limit: int,
+) -> list[CompetitorCandidate]:
+    candidates = llm_candidates + cataloged
+    # Synthesized names only stand in when the catalog knows nothing about
+    # the market; they never dilute real catalog entries.
+    if not cataloged:
+        candidates += _fallback_competitors(profile, limit=limit)
+    return _merge_competitors(profile.business_name, candidates, limit=limit)
+
+
+def _finalize_queries(
+    profile: BusinessProfile,
+    competitors: list[CompetitorCandidate],
+    llm_suggestions: list[SuggestedQuery],
+    limit: int,
+) -> list[SuggestedQuery]:
+    suggestions = _fallback_queries(profile, competitors, limit=limit)
+    suggestions = _merge_queries(llm_suggestions + suggestions, limit=limit)
     return _enforce_query_scope_rules(profile, suggestions)
 
 
+def _profile_changed(draft: BusinessProfile, profile: BusinessProfile) -> bool:
+    # The LLM phrases the same profile differently ("Sykkelbutikk", "Norge",
+    # a name without the city), so compare fields in canonical form.
+    for field in _MATERIAL_PROFILE_FIELDS:
+        before = getattr(draft, field) or ""
+        after = getattr(profile, field) or ""
+        if field == "business_name":
+            if not _same_name(before, after):
+                return True
+        elif field == "industry":
+            if _canonical_industry(before) != _canonical_industry(after):
+                return True
+        elif field == "country":
+            if _country_code(before) != _country_code(after):
+                return True
+        elif before.strip().lower() != after.strip().lower():
+            return True
+    return False
+
+
+def _same_name(before: str, after: str) -> bool:
+    before_key, after_key = _normalize_name(before), _normalize_name(after)
+    if not before_key or not after_key:
+        return before_key == after_key
+    return before_key in after_key or after_key in before_key
+
+
+def _canonical_industry(value: str) -> str:
+    label = value.strip().lower()
+    if label in _INDUSTRY_KEYWORDS or label == _DEFAULT_INDUSTRY:
+        return label
+    return _guess_industry(label) if label else ""
+
+
+def _country_code(value: str) -> str:
+    label = value.strip().lower()
+    return _COUNTRY_CODES.get(label, label)
+
+
 def _fallback_business_profile(raw_input: str) -> BusinessProfile:
     text = raw_input.strip()
     lower = text.lower()
@@ -118,26 +319,6 @@ def _fallback_competitors(
     city = profile.city or ""
     industry = (profile.industry or "").lower()
 
-    if "bank" in industry or any(
-        token in business_name.lower() for token in ("dnb", "nordea", "sparebank", "bank")
-    ):
-        rows: list[CompetitorCandidate] = []
-        for idx, (name, domain) in enumerate(_BANK_COMPETITORS):
-            if _normalize_name(name) == _normalize_name(business_name):
-                continue
-            rows.append(
-                CompetitorCandidate(
-                    name=name,
-                    domain=domain,
-                    scope_match="country",
-                    relevance_score=max(0.5, 0.95 - idx * 0.05),
-                    reason="Etablert konkurrent i norsk bankmarked",
-                )
-            )
-            if len(rows) >= limit:
-                break
-        return rows
-
     if "bike" in industry or "sykkel" in business_name.lower():
         local_city = city or "Norge"
         generated = [
@@ -150,7 +331,7 @@ def _fallback_competitors(
             (f"Sykkeleksperten {local_city}", None),
             (f"Ciclo {local_city}", None),
         ]
-        rows = []
+        rows: list[CompetitorCandidate] = []
         for idx, (name, domain) in enumerate(generated):
             rows.append(
                 CompetitorCandidate(
@@ -328,11 +509,46 @@ def _enforce_query_scope_rules(
 
 
 async def _llm_business_profile(raw_input: str) -> BusinessProfile | None:
+    key = ("profile", re.sub(r"\s+", " ", raw_input.strip().lower()))
+    return await suggestion_cache.get_or_fetch(key, lambda: _fetch_business_profile(raw_input))
+
+
+async def _llm_competitors(
+    profile: BusinessProfile, limit: int
+) -> list[CompetitorCandidate]:
+    key = ("competitors", profile_fingerprint(profile), limit)
+    return await suggestion_cache.get_or_fetch(key, lambda: _fetch_competitors(profile, limit))
+
+
+async def _llm_queries(
+    profile: BusinessProfile,
+    competitors: list[CompetitorCandidate],
+    limit: int,
+) -> list[SuggestedQuery]:
+    # Rank the competitors ourselves so the prompt (and therefore the cached
+    # answer) does not depend on the order the client sent them in.
+    ranked = sorted(
+        competitors, key=lambda row: (-row.relevance_score, _normalize_name(row.name))
+    )
+    key = (
+        "queries",
+        profile_fingerprint(profile),
+        competitor_fingerprint(ranked[:6]),
+        limit,
+    )
+    return await suggestion_cache.get_or_fetch(
+        key, lambda: _fetch_queries(profile, ranked, limit)
+    )
+
+
+async def _fetch_business_profile(raw_input: str) -> BusinessProfile | None:
     prompt = (
         "Du er en norsk B2B onboarding-assistent. "
         "Returner KUN gyldig JSON med feltene: "
         "business_name, industry, size_band, country, region, city, website, scope_level, confidence. "
         "Bruk scope_level en av: city, region, country. "
+        f"Bruk industry en av: {', '.join([*_INDUSTRY_KEYWORDS, _DEFAULT_INDUSTRY])}. "
+        "Bruk country som ISO-landkode (f.eks. NO). "
         f"Input: {raw_input}"
     )
     payload = await _llm_json(prompt)
@@ -344,7 +560,7 @@ async def _llm_business_profile(raw_input: str) -> BusinessProfile | None:
         return None
 
 
-async def _llm_competitors(
+async def _fetch_competitors(
     profile: BusinessProfile, limit: int
 ) -> list[CompetitorCandidate]:
     prompt = (
@@ -371,7 +587,7 @@ async def _llm_competitors(
     return parsed
 
 
-async def _llm_queries(
+async def _fetch_queries(
     profile: BusinessProfile,
     competitors: list[CompetitorCandidate],
     limit: int,
@@ -406,11 +622,13 @@ async def _llm_json(prompt: str) -> dict[str, Any] | list[Any] | None:
         return None
 
     try:
-        response = await _client.responses.create(
-            model="gpt-4.1-mini",
-            tools=[{"type": "web_search_preview"}],
-            input=prompt,
-        )
+        tokens = estimate_tokens(prompt, settings.openai_completion_tokens_estimate)
+        async with openai_limiter.slot(tokens):
+            response = await _client.responses.create(
+                model="gpt-4.1-mini",
+                tools=[{"type": "web_search_preview"}],
+                input=prompt,
+            )
         text = (response.output_text or "").strip()
         if not text:
             return None
@@ -489,18 +707,10 @@ def _merge_queries(rows: list[SuggestedQuery], limit: int) -> list[SuggestedQuer
 
 def _guess_industry(text: str) -> str:
     lower = text.lower()
-    keywords = {
-        "banking": ["bank", "dnb", "nordea", "sparebank", "storebrand", "klp"],
-        "bike_shop": ["sykkel", "bike", "cycling", "pedal"],
-        "restaurant": ["restaurant", "cafe", "mat", "food"],
-        "insurance": ["forsikring", "insurance"],
-        "retail": ["butikk", "shop", "store"],
-        "technology": ["saas", "software", "app", "tech", "it"],
-    }
-    for industry, tokens in keywords.items():
+    for industry, tokens in _INDUSTRY_KEYWORDS.items():
         if any(token in lower for token in tokens):
             return industry
-    return "services"
+    return _DEFAULT_INDUSTRY
 
 
 def _guess_size_band(text: str, industry: str, city: str | None) -> str:
@@ -541,6 +751,13 @@ def _looks_like_url(value: str) -> bool:
     return bool(re.match(r"^(https?://)?[a-z0-9-]+\.[a-z]{2,}", value.lower()))
 
 
+def _website_host(website: str | None) -> str | None:
+    if not website:
+        return None
+    url = website if "://" in website else f"https://{website}"
+    return urlparse(url).netloc.lower().removeprefix("www.") or None
+
+
 def _coerce_url(value: str) -> str | None:
     if not _looks_like_url(value):
         return None
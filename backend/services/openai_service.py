@@ -2,10 +2,27 @@
 
 from openai import AsyncOpenAI
 from config import settings
+from models.schemas import Platform
+from services.response_cache import (
+    get_cached_response,
+    response_cache_key,
+    store_cached_response,
+)
+from services.rate_limiter import estimate_tokens, openai_limiter
+from services.retry import retry_controller_from_settings
+from services.single_flight import SingleFlight
 
-client = AsyncOpenAI(api_key=settings.openai_api_key) if settings.openai_api_key else None
+# Retries are handled by ``retry_policy`` so they share one budget.
+client = (
+    AsyncOpenAI(api_key=settings.openai_api_key, max_retries=0)
+    if settings.openai_api_key
+    else None
+)
 OPENAI_MODEL = "gpt-4.1-mini"
 
+batch_flight = SingleFlight("openai.batch_query")
+retry_policy = retry_controller_from_settings("openai")
+
 
 async def query_chatgpt(query: str) -> dict:
     """Send a query to ChatGPT with web search enabled and return the response."""
@@ -18,23 +35,25 @@ async def query_chatgpt(query: str) -> dict:
             "error": "OpenAI API key not configured",
         }
 
+    cached = await get_cached_response(Platform.CHATGPT.value, OPENAI_MODEL, query)
+    if cached:
+        return cached
+
     try:
-        response = await client.responses.create(
-            model=OPENAI_MODEL,
-            tools=[{"type": "web_search_preview"}],
-            input=query,
-        )
+        response = await retry_policy.run(lambda: _create_response(query))
 
         text = response.output_text
         citations = _extract_citations(response)
 
-        return {
+        result = {
             "query": query,
             "model": OPENAI_MODEL,
             "response": text,
             "citations": citations,
             "error": None,
         }
+        await store_cached_response(Platform.CHATGPT.value, OPENAI_MODEL, query, result)
+        return result
     except Exception as e:
         return {
             "query": query,
@@ -45,14 +64,32 @@ async def query_chatgpt(query: str) -> dict:
         }
 
 
+async def _create_response(query: str):
+    tokens = estimate_tokens(query, settings.openai_completion_tokens_estimate)
+    async with openai_limiter.slot(tokens), retry_policy.timed():
+        return await client.responses.create(
+            model=OPENAI_MODEL,
+            tools=[{"type": "web_search_preview"}],
+            input=query,
+        )
+
+
 async def batch_query(queries: list[str]) -> list[dict]:
-    """Run multiple queries concurrently."""
+    """Run multiple queries concurrently, coalescing identical in-flight queries."""
     import asyncio
 
-    tasks = [query_chatgpt(q) for q in queries]
+    tasks = [coalesced_query(q) for q in queries]
     return await asyncio.gather(*tasks)
 
 
+async def coalesced_query(query: str) -> dict:
+    """Run one query, sharing the call with concurrent identical queries."""
+    key = response_cache_key(Platform.CHATGPT.value, OPENAI_MODEL, query)
+    result = dict(await batch_flight.do(key, lambda: query_chatgpt(query)))
+    result["query"] = query
+    return result
+
+
 def _extract_citations(response) -> list[str]:
     """Best-effort citation extraction from OpenAI response annotations."""
     urls: list[str] = []
@@ -2,9 +2,60 @@
 
 import httpx
 from config import settings
+from models.schemas import Platform
+from services.response_cache import (
+    get_cached_response,
+    response_cache_key,
+    store_cached_response,
+)
+from services.rate_limiter import estimate_tokens, perplexity_limiter
+from services.retry import retry_controller_from_settings
+from services.single_flight import SingleFlight
 
 PERPLEXITY_API_URL = "https://api.perplexity.ai/chat/completions"
 PERPLEXITY_MODEL = "sonar"
+PERPLEXITY_SYSTEM_PROMPT = (
+    "Du er en hjelpsom assistent som svarer på norsk. Gi detaljerte, faktabaserte svar."
+)
+
+_http_client: httpx.AsyncClient | None = None
+batch_flight = SingleFlight("perplexity.batch_query")
+retry_policy = retry_controller_from_settings("perplexity")
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=settings.perplexity_timeout_sec,
+        http2=settings.perplexity_http2,
+        limits=httpx.Limits(
+            max_connections=settings.perplexity_max_connections,
+            max_keepalive_connections=settings.perplexity_max_keepalive_connections,
+            keepalive_expiry=settings.perplexity_keepalive_expiry_sec,
+        ),
+    )
+
+
+async def open_http_client() -> None:
+    """Create the shared pooled client (called from the app lifespan)."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = _build_http_client()
+
+
+async def close_http_client() -> None:
+    """Close the shared pooled client and drop its keep-alive connections."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+    _http_client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it lazily outside the app lifespan."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = _build_http_client()
+    return _http_client
 
 
 async def query_perplexity(query: str) -> dict:
@@ -18,38 +69,33 @@ async def query_perplexity(query: str) -> dict:
             "error": "Perplexity API key not configured",
         }
 
+    cached = await get_cached_response(
+        Platform.PERPLEXITY.value, PERPLEXITY_MODEL, query, PERPLEXITY_SYSTEM_PROMPT
+    )
+    if cached:
+        return cached
+
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
-            resp = await client.post(
-                PERPLEXITY_API_URL,
-                headers={
-                    "Authorization": f"Bearer {settings.perplexity_api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": PERPLEXITY_MODEL,
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "Du er en hjelpsom assistent som svarer på norsk. Gi detaljerte, faktabaserte svar.",
-                        },
-                        {"role": "user", "content": query},
-                    ],
-                },
-            )
-            resp.raise_for_status()
-            data = resp.json()
+        data = await retry_policy.run(lambda: _post_completion(query))
 
         text = data["choices"][0]["message"]["content"]
         citations = data.get("citations", [])
 
-        return {
+        result = {
             "query": query,
             "model": PERPLEXITY_MODEL,
             "response": text,
             "citations": citations,
             "error": None,
         }
+        await store_cached_response(
+            Platform.PERPLEXITY.value,
+            PERPLEXITY_MODEL,
+            query,
+            result,
+            PERPLEXITY_SYSTEM_PROMPT,
+        )
+        return result
     except Exception as e:
         return {
             "query": query,
@@ -60,9 +106,41 @@ async def query_perplexity(query: str) -> dict:
         }
 
 
+async def _post_completion(query: str) -> dict:
+    client = get_http_client()
+    tokens = estimate_tokens(query, settings.perplexity_completion_tokens_estimate)
+    async with perplexity_limiter.slot(tokens), retry_policy.timed():
+        resp = await client.post(
+            PERPLEXITY_API_URL,
+            headers={
+                "Authorization": f"Bearer {settings.perplexity_api_key}",
+                "Content-Type": "application/json",
+            },
+            json={
+                "model": PERPLEXITY_MODEL,
+                "messages": [
+                    {"role": "system", "content": PERPLEXITY_SYSTEM_PROMPT},
+                    {"role": "user", "content": query},
+                ],
+            },
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+
 async def batch_query(queries: list[str]) -> list[dict]:
-    """Run multiple queries concurrently."""
+    """Run multiple queries concurrently, coalescing identical in-flight queries."""
     import asyncio
 
-    tasks = [query_perplexity(q) for q in queries]
+    tasks = [coalesced_query(q) for q in queries]
     return await asyncio.gather(*tasks)
+
+
+async def coalesced_query(query: str) -> dict:
+    """Run one query, sharing the call with concurrent identical queries."""
+    key = response_cache_key(
+        Platform.PERPLEXITY.value, PERPLEXITY_MODEL, query, PERPLEXITY_SYSTEM_PROMPT
+    )
+    result = dict(await batch_flight.do(key, lambda: query_perplexity(query)))
+    result["query"] = query
+    return result
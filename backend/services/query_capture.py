@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Awaitable, Callable
 from datetime import datetime, timezone
 from uuid import uuid4
 
@@ -16,10 +17,23 @@ from models.schemas import (
 from services.openai_service import OPENAI_MODEL, query_chatgpt
 from services.output_indexer import index_output_entities
 from services.perplexity_service import PERPLEXITY_MODEL, query_perplexity
+from services.single_flight import SingleFlight
 
+platform_flight = SingleFlight("query_capture.platform")
 
-async def run_query_capture(request: QueryCaptureRequest) -> QueryCaptureResult:
-    """Capture exact user query outputs and rank-index extracted entities."""
+
+async def run_query_capture(
+    request: QueryCaptureRequest,
+    checkpointed: list[ModelOutput] | None = None,
+    capture: Callable[[Platform, str], Awaitable[dict]] | None = None,
+) -> QueryCaptureResult:
+    """Capture exact user query outputs and rank-index extracted entities.
+
+    Platforms with an output in ``checkpointed`` (e.g. restored from
+    ``query_runs``) are reused instead of being queried again. ``capture``
+    replaces the direct per-platform call, e.g. to route it through the
+    monitoring capture scheduler.
+    """
     query = request.query.strip()
     if not query:
         raise ValueError("Oppgi en spørring for query capture.")
@@ -28,11 +42,18 @@ async def run_query_capture(request: QueryCaptureRequest) -> QueryCaptureResult:
     if not selected_platforms:
         selected_platforms = [Platform.CHATGPT, Platform.PERPLEXITY]
 
+    reused = {output.platform: output for output in checkpointed or []}
+    missing = [platform for platform in selected_platforms if platform not in reused]
     output_payloads = await asyncio.gather(
-        *[_query_platform(platform, query) for platform in selected_platforms]
+        *[(capture or capture_platform)(platform, query) for platform in missing]
     )
-    outputs = [ModelOutput(**payload) for payload in output_payloads]
+    fetched = {payload["platform"]: ModelOutput(**payload) for payload in output_payloads}
+    outputs = [reused.get(platform) or fetched[platform] for platform in selected_platforms]
+    return build_capture_result(query, outputs)
 
+
+def build_capture_result(query: str, outputs: list[ModelOutput]) -> QueryCaptureResult:
+    """Index entities in platform outputs and assemble the capture result."""
     indexed_rows: list[EntityIndexItem] = []
     for output in outputs:
         if not output.raw_output:
@@ -56,7 +77,15 @@ async def run_query_capture(request: QueryCaptureRequest) -> QueryCaptureResult:
     )
 
 
-async def _query_platform(platform: Platform, query: str) -> dict:
+async def capture_platform(platform: Platform, query: str) -> dict:
+    """Query one platform, sharing the call with concurrent identical requests."""
+    key = (platform.value, _normalize_query(query))
+    payload = dict(await platform_flight.do(key, lambda: _fetch_platform(platform, query)))
+    payload["query"] = query
+    return payload
+
+
+async def _fetch_platform(platform: Platform, query: str) -> dict:
     if platform == Platform.CHATGPT:
         result = await query_chatgpt(query)
         model = result.get("model") or OPENAI_MODEL
@@ -72,12 +101,33 @@ async def _query_platform(platform: Platform, query: str) -> dict:
         "model": model,
         "query": query,
         "raw_output": raw_output,
-        "snippet": _build_snippet(raw_output),
+        "snippet": build_snippet(raw_output),
         "citations": result.get("citations") or [],
         "error": result.get("error"),
+        "cached": bool(result.get("cached")),
     }
 
 
+def output_from_query_run(row: dict) -> ModelOutput | None:
+    """Rebuild a successful platform output from a stored ``query_runs`` row."""
+    raw_output = row.get("raw_output") or ""
+    try:
+        platform = Platform(row.get("platform"))
+    except ValueError:
+        return None
+    if not raw_output:
+        return None
+    return ModelOutput(
+        platform=platform,
+        model=row.get("model") or "",
+        query=row.get("query") or "",
+        raw_output=raw_output,
+        snippet=build_snippet(raw_output),
+        citations=row.get("citations_json") or [],
+        error=None,
+    )
+
+
 def _dedupe_platforms(platforms: list[Platform]) -> list[Platform]:
     deduped: list[Platform] = []
     seen: set[Platform] = set()
@@ -89,7 +139,7 @@ def _dedupe_platforms(platforms: list[Platform]) -> list[Platform]:
     return deduped
 
 
-def _build_snippet(text: str, max_len: int = 320) -> str:
+def build_snippet(text: str, max_len: int = 320) -> str:
     compact = " ".join((text or "").split())
     if len(compact) <= max_len:
         return compact
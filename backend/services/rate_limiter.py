@@ -0,0 +1,188 @@
+"""Process-wide per-provider rate limiting with an adaptive concurrency window."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import httpx
+import openai
+
+from config import settings
+
+# Rough characters-per-token ratio used to estimate prompt size for TPM budgets.
+_CHARS_PER_TOKEN = 4
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate_per_min`` tokens per minute."""
+
+    def __init__(self, rate_per_min: float, burst_sec: float = 10.0):
+        self.rate_per_sec = max(rate_per_min, 0) / 60.0
+        self.capacity = max(1.0, self.rate_per_sec * burst_sec)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate_per_sec > 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_sec
+        )
+        self._updated_at = now
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` tokens now, or return seconds to wait before retrying."""
+        if not self.enabled:
+            return 0.0
+        amount = min(amount, self.capacity)
+        self._refill()
+        if self._tokens >= amount:
+            self._tokens -= amount
+            return 0.0
+        return (amount - self._tokens) / self.rate_per_sec
+
+    async def take(self, amount: float = 1.0) -> None:
+        while True:
+            wait_sec = self.reserve(amount)
+            if wait_sec <= 0:
+                return
+            await asyncio.sleep(wait_sec)
+
+
+class ProviderLimiter:
+    """RPM/TPM budgets plus an AIMD concurrency window for one provider.
+
+    The window grows by roughly one slot per window's worth of successful
+    calls and halves whenever the provider answers with 429/503 or a call
+    times out, so throughput converges on the provider's real quota.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        rpm: int,
+        tpm: int,
+        max_concurrency: int,
+        min_concurrency: int = 1,
+    ):
+        self.name = name
+        self.min_concurrency = max(1, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.window = float(max(self.min_concurrency, self.max_concurrency // 4))
+        self._requests = TokenBucket(rpm)
+        self._tokens = TokenBucket(tpm)
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self.successes = 0
+        self.throttles = 0
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int = 0) -> AsyncIterator[None]:
+        """Hold one concurrency slot and budget tokens for a single provider call."""
+        await self._acquire()
+        try:
+            await self._requests.take(1)
+            if estimated_tokens:
+                await self._tokens.take(estimated_tokens)
+            try:
+                yield
+            except Exception as exc:
+                if is_backpressure(exc):
+                    self.record_throttle()
+                raise
+            else:
+                self.record_success()
+        finally:
+            self._release()
+
+    def record_success(self) -> None:
+        self.successes += 1
+        self.window = min(float(self.max_concurrency), self.window + 1.0 / self.window)
+        self._wake()
+
+    def record_throttle(self) -> None:
+        self.throttles += 1
+        self.window = max(float(self.min_concurrency), self.window / 2.0)
+
+    async def _acquire(self) -> None:
+        while self._in_flight >= int(self.window):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Woken but cancelled before resuming: pass the wakeup on so
+                # the freed slot is not lost.
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self._in_flight += 1
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        free = int(self.window) - self._in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    @property
+    def request_rate_per_sec(self) -> float:
+        """Sustained request budget (0 when RPM is unlimited)."""
+        return self._requests.rate_per_sec
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "window": round(self.window, 2),
+            "in_flight": self._in_flight,
+            "waiting": len(self._waiters),
+            "successes": self.successes,
+            "throttles": self.throttles,
+        }
+
+
+def is_backpressure(exc: BaseException) -> bool:
+    """True for rate-limit, overload and timeout errors from either provider."""
+    if isinstance(exc, (asyncio.TimeoutError, httpx.TimeoutException, openai.APITimeoutError)):
+        return True
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status in (429, 503)
+
+
+def estimate_tokens(prompt: str, completion_tokens: int) -> int:
+    return len(prompt or "") // _CHARS_PER_TOKEN + completion_tokens
+
+
+openai_limiter = ProviderLimiter(
+    "openai",
+    rpm=settings.openai_rpm,
+    tpm=settings.openai_tpm,
+    max_concurrency=settings.openai_max_concurrency,
+    min_concurrency=settings.provider_min_concurrency,
+)
+perplexity_limiter = ProviderLimiter(
+    "perplexity",
+    rpm=settings.perplexity_rpm,
+    tpm=settings.perplexity_tpm,
+    max_concurrency=settings.perplexity_max_concurrency,
+    min_concurrency=settings.provider_min_concurrency,
+)
@@ -0,0 +1,157 @@
+"""Content-addressed cache for provider (LLM) responses."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from config import settings
+from services.ttl_cache import TTLCache
+
+
+def response_cache_key(platform: str, model: str, query: str, system_prompt: str = "") -> str:
+    """Stable key for a provider response: platform, model, query and system prompt."""
+    normalized = " ".join((query or "").lower().split())
+    material = json.dumps(
+        [str(platform), model, normalized, system_prompt or ""],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class _SQLiteTier:
+    """Optional on-disk tier so cached responses survive restarts.
+
+    Methods are blocking; ``ResponseCache`` calls them via ``asyncio.to_thread``.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "create table if not exists llm_responses ("
+            " key text primary key,"
+            " payload text not null,"
+            " expires_at real not null)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> tuple[dict, float] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "select payload, expires_at from llm_responses where key = ?",
+                (key,),
+            ).fetchone()
+            if not row:
+                return None
+            payload, expires_at = row
+            if expires_at <= time.time():
+                self._conn.execute("delete from llm_responses where key = ?", (key,))
+                self._conn.commit()
+                return None
+        return json.loads(payload), expires_at - time.time()
+
+    def set(self, key: str, payload: dict, ttl_sec: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "insert or replace into llm_responses (key, payload, expires_at)"
+                " values (?, ?, ?)",
+                (key, json.dumps(payload, ensure_ascii=False), time.time() + ttl_sec),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("delete from llm_responses")
+            self._conn.commit()
+
+
+class ResponseCache:
+    """Two-tier response cache: LRU memory tier plus optional SQLite tier."""
+
+    def __init__(
+        self,
+        *,
+        ttl_sec: float,
+        max_entries: int,
+        path: str = "",
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self.ttl_sec = ttl_sec
+        self._memory = TTLCache(max_entries=max_entries, ttl_sec=ttl_sec)
+        self._disk = _SQLiteTier(path) if enabled and path else None
+
+    async def get(self, key: str) -> dict | None:
+        if not self.enabled:
+            return None
+        payload = self._memory.get(key)
+        if payload is not None:
+            return dict(payload)
+        if self._disk is None:
+            return None
+        stored = await asyncio.to_thread(self._disk.get, key)
+        if stored is None:
+            return None
+        payload, remaining_sec = stored
+        self._memory.set(key, payload, ttl_sec=remaining_sec)
+        return dict(payload)
+
+    async def set(self, key: str, payload: dict) -> None:
+        if not self.enabled:
+            return
+        self._memory.set(key, dict(payload))
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk.set, key, dict(payload), self.ttl_sec)
+
+    def clear(self) -> None:
+        self._memory.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._memory),
+            "hits": self._memory.hits,
+            "misses": self._memory.misses,
+        }
+
+
+response_cache = ResponseCache(
+    ttl_sec=settings.llm_cache_ttl_sec,
+    max_entries=settings.llm_cache_max_entries,
+    path=settings.llm_cache_path,
+    enabled=settings.llm_cache_enabled,
+)
+
+
+async def get_cached_response(
+    platform: str, model: str, query: str, system_prompt: str = ""
+) -> dict | None:
+    """Return a cached provider result for ``query`` marked as cached, if any."""
+    payload = await response_cache.get(response_cache_key(platform, model, query, system_prompt))
+    if payload is None:
+        return None
+    payload["query"] = query
+    payload["cached"] = True
+    return payload
+
+
+async def store_cached_response(
+    platform: str, model: str, query: str, result: dict, system_prompt: str = ""
+) -> None:
+    """Cache a successful provider result; errors and empty answers are skipped."""
+    if result.get("error") or not result.get("response"):
+        return
+    payload = {
+        "model": result.get("model") or model,
+        "response": result["response"],
+        "citations": list(result.get("citations") or []),
+        "error": None,
+    }
+    await response_cache.set(response_cache_key(platform, model, query, system_prompt), payload)
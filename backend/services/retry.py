@@ -0,0 +1,223 @@
+"""Retries with backoff, a retry budget and optional hedging for provider calls."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+import httpx
+import openai
+
+from config import settings
+from services.rate_limiter import is_backpressure
+
+_RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+_MAX_RETRY_AFTER_SEC = 30.0
+
+
+class _CallTimer:
+    """Set once an attempt holds its limiter slot and the provider call starts."""
+
+    def __init__(self):
+        self.started = asyncio.Event()
+
+
+_current_call: ContextVar[_CallTimer | None] = ContextVar("retry_current_call", default=None)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """True for throttling, 5xx, timeouts and connection errors."""
+    if is_backpressure(exc):
+        return True
+    if isinstance(exc, (httpx.TransportError, openai.APIConnectionError)):
+        return True
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status in _RETRYABLE_STATUS
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Parse a Retry-After header (seconds or HTTP date) from a provider error."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryController:
+    """Retry policy shared by all calls to one provider.
+
+    Retries use exponential backoff with full jitter and never wait less than
+    the provider's Retry-After. Retries and hedges draw from a budget that
+    refills by ``budget_ratio`` per call, so an outage cannot multiply load.
+    When hedging is on and enough latencies were observed, a duplicate request
+    is sent once the p95 latency passes and the first answer wins.
+
+    Latency is measured by ``timed()``, which callers enter after acquiring
+    their rate-limiter slot, so time spent queued in the limiter neither
+    inflates the samples nor counts toward the hedge delay.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_attempts: int,
+        base_delay_sec: float,
+        max_delay_sec: float,
+        budget_ratio: float,
+        budget_cap: float = 10.0,
+        hedge: bool = False,
+        hedge_min_samples: int = 20,
+    ):
+        self.name = name
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay_sec = base_delay_sec
+        self.max_delay_sec = max_delay_sec
+        self.budget_ratio = budget_ratio
+        self.budget_cap = budget_cap
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self._budget = budget_cap
+        self._latencies: deque[float] = deque(maxlen=200)
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.budget_exhausted = 0
+
+    async def run(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self._budget = min(self.budget_cap, self._budget + self.budget_ratio)
+        attempt = 1
+        while True:
+            try:
+                return await self._attempt(fn)
+            except Exception as exc:
+                if attempt >= self.max_attempts or not is_retryable(exc):
+                    raise
+                if not self._take_budget():
+                    self.budget_exhausted += 1
+                    raise
+                self.retries += 1
+                await asyncio.sleep(self._backoff(attempt, exc))
+                attempt += 1
+
+    def p95_latency(self) -> float | None:
+        if len(self._latencies) < self.hedge_min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[int(len(ordered) * 0.95) - 1]
+
+    async def _attempt(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        hedge_after = self.p95_latency() if self.hedge else None
+        if hedge_after is None:
+            return await self._timed(fn, _CallTimer())
+
+        primary_timer = _CallTimer()
+        primary = asyncio.ensure_future(self._timed(fn, primary_timer))
+        pending: set[asyncio.Future] = {primary}
+        try:
+            # The hedge delay runs from when the primary got its slot.
+            started = asyncio.ensure_future(primary_timer.started.wait())
+            try:
+                await asyncio.wait({primary, started}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                started.cancel()
+            done, _ = await asyncio.wait(pending, timeout=hedge_after)
+            if done or not self._take_budget():
+                return await primary
+
+            self.hedges += 1
+            hedged = asyncio.ensure_future(self._timed(fn, _CallTimer()))
+            pending.add(hedged)
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedged:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _timed(self, fn: Callable[[], Awaitable[Any]], timer: _CallTimer) -> Any:
+        token = _current_call.set(timer)
+        try:
+            return await fn()
+        finally:
+            _current_call.reset(token)
+
+    @asynccontextmanager
+    async def timed(self) -> AsyncIterator[None]:
+        """Wrap the provider request itself, inside the limiter slot."""
+        timer = _current_call.get()
+        if timer is not None:
+            timer.started.set()
+        started = time.monotonic()
+        yield
+        self._latencies.append(time.monotonic() - started)
+
+    def _take_budget(self) -> bool:
+        if self._budget < 1.0:
+            return False
+        self._budget -= 1.0
+        return True
+
+    def _backoff(self, attempt: int, exc: BaseException) -> float:
+        ceiling = min(self.max_delay_sec, self.base_delay_sec * (2 ** (attempt - 1)))
+        delay = random.uniform(0, ceiling)
+        retry_after = retry_after_seconds(exc)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, _MAX_RETRY_AFTER_SEC))
+        return delay
+
+    @property
+    def stats(self) -> dict:
+        p95 = self.p95_latency()
+        return {
+            "name": self.name,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "budget_exhausted": self.budget_exhausted,
+            "p95_latency_sec": round(p95, 3) if p95 is not None else None,
+        }
+
+
+def retry_controller_from_settings(name: str) -> RetryController:
+    return RetryController(
+        name,
+        max_attempts=settings.provider_max_attempts,
+        base_delay_sec=settings.provider_retry_base_delay_sec,
+        max_delay_sec=settings.provider_retry_max_delay_sec,
+        budget_ratio=settings.provider_retry_budget_ratio,
+        hedge=settings.provider_hedge_enabled,
+        hedge_min_samples=settings.provider_hedge_min_samples,
+    )
@@ -1,6 +1,38 @@
 """Analyze AI responses for brand mentions and calculate visibility scores."""
 
 import re
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+import numpy as np
+
+BASE_MENTION_POINTS = 40
+MENTION_TYPE_POINTS = {
+    "recommendation": 30,
+    "comparison": 20,
+    "mention": 10,
+    "absent": 0,
+}
+SENTIMENT_POINTS = {
+    "positive": 20,
+    "neutral": 10,
+    "mixed": 5,
+    "negative": 0,
+}
+
+_RECOMMEND_WORDS = ("anbefaler", "anbefalt", "recommend", "beste", "topp", "best")
+_COMPARE_WORDS = ("sammenlignet", "versus", "vs", "konkurrent", "alternativ")
+_POSITIVE_WORDS = (
+    "god", "godt", "bra", "utmerket", "populær", "ledende", "sterk",
+    "pålitelig", "innovativ", "trygg", "fornøyd", "anbefalt", "beste",
+    "konkurransedyktig", "great", "excellent", "trusted",
+)
+_NEGATIVE_WORDS = (
+    "dårlig", "svak", "problem", "klage", "negativ", "dyrt", "dyr",
+    "treg", "mangel", "kritikk", "poor", "worst", "avoid",
+)
+_NUMBERED_LINE = re.compile(r"^(?:\*\*)?(\d+)[.)]\s*\*?\*?")
+_URL_PATTERN = re.compile(r'https?://[^\s\)\"\'<>]+')
 
 
 def analyze_response(response_text: str, brand_name: str, brand_variations: list[str] = None) -> dict:
@@ -23,24 +55,25 @@ def analyze_response(response_text: str, brand_name: str, brand_variations: list
     if brand_variations:
         names.extend([v.lower() for v in brand_variations])
 
-    # Check for mentions
-    mentioned = any(name in text_lower for name in names)
+    # Locate the first occurrence of every name once; all checks below reuse it
+    first_indexes = [text_lower.find(name) for name in names]
+    hits = [(name, idx) for name, idx in zip(names, first_indexes) if idx != -1]
 
-    if not mentioned:
+    if not hits:
         return {
             "mentioned": False,
             "mention_type": "absent",
             "sentiment": "neutral",
             "citation_url": None,
             "position": None,
-            "snippet": _extract_snippet(response_text, brand_name, 200),
+            "snippet": _extract_snippet(response_text, brand_name, 200, brand_idx=-1),
         }
 
     # Determine mention type
-    mention_type = _classify_mention(text_lower, names)
+    mention_type = _classify_mention(text_lower, hits)
 
     # Determine sentiment
-    sentiment = _analyze_sentiment(text_lower, names)
+    sentiment = _analyze_sentiment(text_lower, hits)
 
     # Find position in list (if response contains a numbered list)
     position = _find_list_position(text_lower, names)
@@ -48,8 +81,8 @@ def analyze_response(response_text: str, brand_name: str, brand_variations: list
     # Extract citation URLs
     citation_url = _extract_citation(response_text, brand_name)
 
-    # Extract relevant snippet
-    snippet = _extract_snippet(response_text, brand_name, 300)
+    # Extract relevant snippet (names[0] is the brand itself)
+    snippet = _extract_snippet(response_text, brand_name, 300, brand_idx=first_indexes[0])
 
     return {
         "mentioned": True,
@@ -66,106 +99,156 @@ def calculate_visibility_score(analyses: list[dict]) -> float:
     if not analyses:
         return 0.0
 
-    total_weight = 0
-    total_score = 0
+    # Every response weighs 1; unmentioned responses score 0 but still count
+    total_score = sum(response_points(a) for a in analyses)
+    return round(total_score / len(analyses), 1)
 
-    for a in analyses:
-        if not a.get("mentioned"):
-            # Not mentioned = 0 points but still counts
-            total_weight += 1
-            continue
 
-        points = 0
-        weight = 1
+def response_points(a: dict) -> int:
+    """Points (0-100) a single analyzed response contributes to the score."""
+    if not a.get("mentioned"):
+        return 0
 
-        # Base points for being mentioned
-        points += 40
+    # Base points for being mentioned
+    points = BASE_MENTION_POINTS
 
-        # Mention type bonus
-        type_bonus = {
-            "recommendation": 30,
-            "comparison": 20,
-            "mention": 10,
-            "absent": 0,
-        }
-        points += type_bonus.get(a.get("mention_type", "mention"), 10)
-
-        # Sentiment bonus
-        sentiment_bonus = {
-            "positive": 20,
-            "neutral": 10,
-            "mixed": 5,
-            "negative": 0,
-        }
-        points += sentiment_bonus.get(a.get("sentiment", "neutral"), 10)
-
-        # Position bonus (higher rank = more points)
-        pos = a.get("position")
-        if pos is not None:
-            if pos <= 1:
-                points += 10
-            elif pos <= 3:
-                points += 5
-
-        # Citation bonus
-        if a.get("citation_url"):
+    # Mention type bonus
+    points += MENTION_TYPE_POINTS.get(a.get("mention_type", "mention"), 10)
+
+    # Sentiment bonus
+    points += SENTIMENT_POINTS.get(a.get("sentiment", "neutral"), 10)
+
+    # Position bonus (higher rank = more points)
+    pos = a.get("position")
+    if pos is not None:
+        if pos <= 1:
             points += 10
+        elif pos <= 3:
+            points += 5
+
+    # Citation bonus
+    if a.get("citation_url"):
+        points += 10
+
+    # Cap at 100
+    return min(points, 100)
+
+
+@dataclass
+class BatchScores:
+    """Result of ``score_batch``: per-row points plus aggregate scores."""
+
+    points: np.ndarray
+    visibility_score: float
+    group_scores: dict[Any, float]
+
+
+def score_batch(columns: Mapping[str, Any], groups: Any = None) -> BatchScores:
+    """Score many analyzed responses at once with vectorized arithmetic.
+
+    ``columns`` is a columnar batch (NumPy arrays, Arrow columns or plain
+    sequences) with ``mentioned`` (bool), ``mention_type`` and ``sentiment``
+    (str), ``position`` (float, NaN when unranked) and ``has_citation`` (bool).
+    ``groups`` optionally labels each row (e.g. platform or config id) to get
+    one score per label. Results equal ``response_points`` and
+    ``calculate_visibility_score`` on the same rows.
+    """
+    mentioned = np.asarray(columns["mentioned"], dtype=bool)
+    count = len(mentioned)
+    if count == 0:
+        return BatchScores(np.zeros(0, dtype=np.int64), 0.0, {})
+
+    position = np.asarray(columns["position"], dtype=float)
+    has_citation = np.asarray(columns["has_citation"], dtype=bool)
+
+    points = np.full(count, BASE_MENTION_POINTS, dtype=np.int64)
+    points += _lookup_points(columns["mention_type"], MENTION_TYPE_POINTS, default=10)
+    points += _lookup_points(columns["sentiment"], SENTIMENT_POINTS, default=10)
+    # NaN compares False, so unranked rows get no position bonus
+    points += np.where(position <= 1, 10, np.where(position <= 3, 5, 0))
+    points += np.where(has_citation, 10, 0)
+    points = np.where(mentioned, np.minimum(points, 100), 0)
+
+    group_scores: dict[Any, float] = {}
+    if groups is not None:
+        labels, codes = _factorize(groups, count)
+        sums = np.bincount(codes, weights=points, minlength=len(labels))
+        sizes = np.bincount(codes, minlength=len(labels))
+        for label, total, size in zip(labels, sums.tolist(), sizes.tolist()):
+            group_scores[label] = round(int(total) / size, 1)
+
+    return BatchScores(
+        points=points,
+        visibility_score=round(int(points.sum()) / count, 1),
+        group_scores=group_scores,
+    )
+
+
+def columns_from_analyses(analyses: list[dict]) -> dict[str, np.ndarray]:
+    """Convert ``analyze_response`` dicts into the columnar batch ``score_batch`` takes."""
+    return {
+        "mentioned": np.array([bool(a.get("mentioned")) for a in analyses], dtype=bool),
+        "mention_type": np.array(
+            [a.get("mention_type", "mention") for a in analyses], dtype=object
+        ),
+        "sentiment": np.array([a.get("sentiment", "neutral") for a in analyses], dtype=object),
+        "position": np.array(
+            [np.nan if a.get("position") is None else a["position"] for a in analyses],
+            dtype=float,
+        ),
+        "has_citation": np.array([bool(a.get("citation_url")) for a in analyses], dtype=bool),
+    }
 
-        # Cap at 100
-        points = min(points, 100)
 
-        total_score += points * weight
-        total_weight += weight
+def _lookup_points(values: Any, table: dict[str, int], default: int) -> np.ndarray:
+    # One vectorized comparison per known label; anything else gets the default
+    values = np.asarray(values)
+    points = np.full(len(values), default, dtype=np.int64)
+    for label, label_points in table.items():
+        points[values == label] = label_points
+    return points
 
-    if total_weight == 0:
-        return 0.0
 
-    return round(total_score / total_weight, 1)
+def _factorize(groups: Any, count: int) -> tuple[list[Any], np.ndarray]:
+    values = np.asarray(groups)
+    if values.dtype != object:
+        labels, codes = np.unique(values, return_inverse=True)
+        return labels.tolist(), codes.reshape(count)
+    # np.unique would sort object labels with Python comparisons (slower than
+    # one hash pass, and it fails on mixed types such as None among strings)
+    items = values.tolist()
+    index = {label: code for code, label in enumerate(dict.fromkeys(items))}
+    codes = np.fromiter(map(index.__getitem__, items), dtype=np.int64, count=count)
+    return list(index), codes
 
 
-def _classify_mention(text: str, names: list[str]) -> str:
-    """Classify how the brand is mentioned."""
-    recommend_words = ["anbefaler", "anbefalt", "recommend", "beste", "topp", "best"]
-    compare_words = ["sammenlignet", "versus", "vs", "konkurrent", "alternativ"]
+def _classify_mention(text: str, hits: list[tuple[str, int]]) -> str:
+    """Classify how the brand is mentioned.
 
+    ``hits`` holds ``(name, first_index)`` for every name found in ``text``.
+    """
     # Check context around brand mention
-    for name in names:
-        idx = text.find(name)
-        if idx == -1:
-            continue
+    for name, idx in hits:
         context = text[max(0, idx - 100):idx + len(name) + 100]
 
-        if any(w in context for w in recommend_words):
+        if any(w in context for w in _RECOMMEND_WORDS):
             return "recommendation"
-        if any(w in context for w in compare_words):
+        if any(w in context for w in _COMPARE_WORDS):
             return "comparison"
 
     return "mention"
 
 
-def _analyze_sentiment(text: str, names: list[str]) -> str:
+def _analyze_sentiment(text: str, hits: list[tuple[str, int]]) -> str:
     """Simple sentiment analysis around brand mentions."""
-    positive_words = [
-        "god", "godt", "bra", "utmerket", "populær", "ledende", "sterk",
-        "pålitelig", "innovativ", "trygg", "fornøyd", "anbefalt", "beste",
-        "konkurransedyktig", "great", "excellent", "trusted",
-    ]
-    negative_words = [
-        "dårlig", "svak", "problem", "klage", "negativ", "dyrt", "dyr",
-        "treg", "mangel", "kritikk", "poor", "worst", "avoid",
-    ]
-
     pos_count = 0
     neg_count = 0
 
-    for name in names:
-        idx = text.find(name)
-        if idx == -1:
-            continue
+    for name, idx in hits:
         context = text[max(0, idx - 150):idx + len(name) + 150]
 
-        pos_count += sum(1 for w in positive_words if w in context)
-        neg_count += sum(1 for w in negative_words if w in context)
+        pos_count += sum(1 for w in _POSITIVE_WORDS if w in context)
+        neg_count += sum(1 for w in _NEGATIVE_WORDS if w in context)
 
     if pos_count > neg_count:
         return "positive"
@@ -177,22 +260,36 @@ def _analyze_sentiment(text: str, names: list[str]) -> str:
 
 
 def _find_list_position(text: str, names: list[str]) -> int | None:
-    """Find position in numbered lists (1. Brand, 2. Other, etc.)."""
-    lines = text.split("\n")
-    for i, line in enumerate(lines):
-        line_stripped = line.strip()
-        # Match patterns like "1.", "1)", "#1"
-        match = re.match(r"^(?:\*\*)?(\d+)[.)]\s*\*?\*?", line_stripped)
-        if match:
-            num = int(match.group(1))
-            if any(name in line_stripped.lower() for name in names):
-                return num
-    return None
+    """Find position in numbered lists (1. Brand, 2. Other, etc.).
+
+    Only lines that contain a name occurrence are inspected, instead of
+    running the list-item pattern over every line of the response.
+    """
+    best_line = None
+    best_position = None
+    for name in names:
+        start = text.find(name)
+        while start != -1:
+            line_start = text.rfind("\n", 0, start) + 1
+            if best_line is not None and line_start >= best_line:
+                break
+            line_end = text.find("\n", start)
+            if line_end == -1:
+                line_end = len(text)
+            line_stripped = text[line_start:line_end].strip()
+            # Match patterns like "1.", "1)", "#1"
+            match = _NUMBERED_LINE.match(line_stripped)
+            if match and any(n in line_stripped.lower() for n in names):
+                best_line = line_start
+                best_position = int(match.group(1))
+                break
+            start = text.find(name, line_end + 1) if line_end < len(text) else -1
+    return best_position
 
 
 def _extract_citation(text: str, brand_name: str) -> str | None:
     """Extract URLs from text that might be citations."""
-    urls = re.findall(r'https?://[^\s\)\"\'<>]+', text)
+    urls = _URL_PATTERN.findall(text)
     brand_lower = brand_name.lower().replace(" ", "")
 
     for url in urls:
@@ -203,9 +300,11 @@ def _extract_citation(text: str, brand_name: str) -> str | None:
     return urls[0].rstrip(".,;:") if urls else None
 
 
-def _extract_snippet(text: str, brand_name: str, max_len: int = 200) -> str:
+def _extract_snippet(
+    text: str, brand_name: str, max_len: int = 200, brand_idx: int | None = None
+) -> str:
     """Extract the most relevant snippet containing the brand name."""
-    idx = text.lower().find(brand_name.lower())
+    idx = text.lower().find(brand_name.lower()) if brand_idx is None else brand_idx
     if idx == -1:
         return text[:max_len] + "..." if len(text) > max_len else text
 
@@ -1,15 +1,104 @@
-import httpx
-from bs4 import BeautifulSoup
+import codecs
+from html.parser import HTMLParser
 from urllib.parse import urlparse
 
+import httpx
+
+from config import settings
+from services.domain_cache import domain_cache
+from services.single_flight import SingleFlight
+
+# Concurrent misses for the same host share one fetch.
+scrape_flight = SingleFlight("scraper")
+
+
+class _HeadParser(HTMLParser):
+    """Incremental parser that collects brand metadata from a page's <head>.
+
+    Like the previous BeautifulSoup lookups it keeps the first ``og:site_name``,
+    ``og:description``, ``meta description`` and ``<title>`` it sees. ``done``
+    is set once ``</head>`` (or ``<body>``) is reached.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta: dict[str, str] = {}
+        self.title: str | None = None
+        self.done = False
+        self._title_parts: list[str] | None = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "body":
+            self.done = True
+        elif tag == "meta":
+            attrs = dict(attrs)
+            key = attrs.get("property")
+            if key not in ("og:site_name", "og:description"):
+                key = "description" if attrs.get("name") == "description" else None
+            if key and key not in self.meta:
+                self.meta[key] = attrs.get("content") or ""
+        elif tag == "title" and self.title is None and self._title_parts is None:
+            self._title_parts = []
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            self.done = True
+        elif tag == "title" and self._title_parts is not None:
+            self.title = "".join(self._title_parts)
+            self._title_parts = None
+
+    def handle_data(self, data):
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+
+
+async def _fetch_head(
+    url: str, validators: dict[str, str] | None = None
+) -> tuple[_HeadParser | None, httpx.Headers]:
+    """Stream ``url`` into the head parser, stopping at </head> or the byte cap.
+
+    Returns ``None`` instead of a parser when a conditional GET answers 304.
+    """
+    parser = _HeadParser()
+    headers = {"User-Agent": "Mozilla/5.0", **(validators or {})}
+    async with httpx.AsyncClient(
+        timeout=settings.scraper_timeout_sec, follow_redirects=True
+    ) as client:
+        async with client.stream("GET", url, headers=headers) as resp:
+            if resp.status_code == 304 and validators:
+                return None, resp.headers
+            resp.raise_for_status()
+            try:
+                decoder = codecs.getincrementaldecoder(resp.encoding or "utf-8")(
+                    errors="replace"
+                )
+            except LookupError:
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+            received = 0
+            async for chunk in resp.aiter_bytes():
+                received += len(chunk)
+                parser.feed(decoder.decode(chunk))
+                if parser.done or received >= settings.scraper_max_head_bytes:
+                    break
+            response_headers = resp.headers
+    parser.close()
+    return parser, response_headers
+
 
 async def extract_brand_from_url(url: str) -> dict:
-    """Scrape a URL and extract brand name, description, and domain."""
+    """Scrape a URL and extract brand name, description, and domain.
+
+    Results are cached per host (see ``services.domain_cache``): fresh
+    entries are served directly, stale ones are revalidated with a
+    conditional GET, and unreachable hosts fall back to the domain-based
+    name without being fetched again for a while.
+    """
     if not url.startswith(("http://", "https://")):
         url = f"https://{url}"
 
     parsed = urlparse(url)
-    domain = parsed.hostname or ""
+    domain = (parsed.hostname or "").lower()
     # Remove www. prefix
     if domain.startswith("www."):
         domain = domain[4:]
@@ -19,39 +108,68 @@ async def extract_brand_from_url(url: str) -> dict:
         "domain": domain,
         "description": "",
     }
+    if not domain:
+        return result
+
+    entry = domain_cache.get(domain)
+    if entry is not None and entry.fresh:
+        domain_cache.hits += 1
+        return dict(entry.result)
+    if domain_cache.is_unreachable(domain):
+        domain_cache.negative_hits += 1
+        return dict(entry.result) if entry is not None else result
+    domain_cache.misses += 1
+
+    scraped = await scrape_flight.do(domain, lambda: _scrape(url, domain, entry, result))
+    return dict(scraped)
 
+
+async def _scrape(url: str, domain: str, entry, fallback: dict) -> dict:
+    validators = entry.validators() if entry is not None else {}
+    if validators:
+        domain_cache.revalidations += 1
     try:
-        async with httpx.AsyncClient(timeout=10, follow_redirects=True) as client:
-            resp = await client.get(url, headers={"User-Agent": "Mozilla/5.0"})
-            resp.raise_for_status()
+        head, headers = await _fetch_head(url, validators)
+    except httpx.TransportError:
+        # Connection failures and timeouts: don't retry the host for a while.
+        domain_cache.mark_unreachable(domain)
+        return entry.result if entry is not None else fallback
+    except Exception:
+        # HTTP errors (e.g. 403 from bot blocking) or unparsable pages: the
+        # host is up, so fall back to the domain-based (or last known) result
+        # without caching the failure.
+        return entry.result if entry is not None else fallback
 
-        soup = BeautifulSoup(resp.text, "html.parser")
+    if head is None:
+        domain_cache.not_modified += 1
+        domain_cache.refresh(domain, entry)
+        return entry.result
 
-        # Try og:site_name first
-        og_site = soup.find("meta", property="og:site_name")
-        if og_site and og_site.get("content"):
-            result["brand_name"] = og_site["content"]
+    result = dict(fallback)
+    _apply_head(head, result)
+    domain_cache.store(
+        domain, result, etag=headers.get("etag"), last_modified=headers.get("last-modified")
+    )
+    return result
 
-        # Fallback to title
-        elif soup.title and soup.title.string:
-            title = soup.title.string.strip()
-            # Take the part before common separators
-            for sep in [" | ", " - ", " — ", " – ", " :: "]:
-                if sep in title:
-                    title = title.split(sep)[0].strip()
-                    break
-            result["brand_name"] = title
 
-        # Get description
-        og_desc = soup.find("meta", property="og:description")
-        meta_desc = soup.find("meta", attrs={"name": "description"})
-        if og_desc and og_desc.get("content"):
-            result["description"] = og_desc["content"][:300]
-        elif meta_desc and meta_desc.get("content"):
-            result["description"] = meta_desc["content"][:300]
+def _apply_head(head: _HeadParser, result: dict) -> None:
+    # Try og:site_name first
+    if head.meta.get("og:site_name"):
+        result["brand_name"] = head.meta["og:site_name"]
 
-    except Exception:
-        # If scraping fails, just use the domain-based name
-        pass
+    # Fallback to title
+    elif head.title:
+        title = head.title.strip()
+        # Take the part before common separators
+        for sep in [" | ", " - ", " — ", " – ", " :: "]:
+            if sep in title:
+                title = title.split(sep)[0].strip()
+                break
+        result["brand_name"] = title
 
-    return result
+    # Get description
+    if head.meta.get("og:description"):
+        result["description"] = head.meta["og:description"][:300]
+    elif head.meta.get("description"):
+        result["description"] = head.meta["description"][:300]
@@ -0,0 +1,154 @@
+"""Compact storage format for ``MonitoringSnapshot``.
+
+The plain ``model_dump`` repeats every entity twice (per query run and in
+``aggregated_entities``) and every repeated answer in full. The compact form
+stores each raw output once under its content hash, keeps all entities in
+one columnar table that query runs reference by slice, and drops the
+repeated per-row keys. ``decode_snapshot`` accepts both formats, so older
+``snapshot_json`` rows keep loading.
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+from models.schemas import EntityIndexItem, MonitoringSnapshot
+
+FORMAT = "compact/v1"
+_ENTITY_COLUMNS = ("platform", "entity", "position", "mention_type", "sentiment", "confidence")
+
+
+def is_compact(data: dict | None) -> bool:
+    return isinstance(data, dict) and data.get("format") == FORMAT
+
+
+def encode_snapshot(snapshot: MonitoringSnapshot) -> dict:
+    texts: dict[str, str] = {}
+    columns: dict[str, list] = {name: [] for name in _ENTITY_COLUMNS}
+
+    def add_entities(rows: list[EntityIndexItem]) -> list[int]:
+        start = len(columns["entity"])
+        for row in rows:
+            columns["platform"].append(row.platform.value)
+            columns["entity"].append(row.entity)
+            columns["position"].append(row.position)
+            columns["mention_type"].append(row.mention_type)
+            columns["sentiment"].append(row.sentiment)
+            columns["confidence"].append(row.confidence)
+        return [start, len(columns["entity"])]
+
+    runs = []
+    for run in snapshot.query_runs:
+        outputs = []
+        for output in run.outputs:
+            digest = hashlib.sha256(output.raw_output.encode("utf-8")).hexdigest()[:32]
+            texts.setdefault(digest, output.raw_output)
+            encoded = {
+                "platform": output.platform.value,
+                "model": output.model,
+                "text": digest,
+                "snippet": output.snippet,
+                "citations": output.citations,
+            }
+            if output.query != run.query:
+                encoded["query"] = output.query
+            if output.error:
+                encoded["error"] = output.error
+            if output.cached:
+                encoded["cached"] = True
+            outputs.append(encoded)
+        runs.append(
+            {
+                "query": run.query,
+                "query_normalized": run.query_normalized,
+                "run_id": run.run_id,
+                "created_at": run.created_at,
+                "summary": run.summary,
+                "outputs": outputs,
+                "entities": add_entities(run.entity_index),
+            }
+        )
+
+    # Aggregated entities are normally the concatenation of every run's index;
+    # only store them separately when they are not.
+    aggregated = None
+    run_entities = [row for run in snapshot.query_runs for row in run.entity_index]
+    if snapshot.aggregated_entities != run_entities:
+        aggregated = add_entities(snapshot.aggregated_entities)
+
+    return {
+        "format": FORMAT,
+        "snapshot_type": snapshot.snapshot_type,
+        "config_id": snapshot.config_id,
+        "run_id": snapshot.run_id,
+        "created_at": snapshot.created_at,
+        "profile": snapshot.profile.model_dump(mode="json"),
+        "selected_competitors": [
+            row.model_dump(mode="json") for row in snapshot.selected_competitors
+        ],
+        "active_queries": [row.model_dump(mode="json") for row in snapshot.active_queries],
+        "platforms": [platform.value for platform in snapshot.platforms],
+        "summary": snapshot.summary,
+        "run_mode": snapshot.run_mode,
+        "carried_queries": snapshot.carried_queries,
+        "carried_runs": snapshot.carried_runs,
+        "drift": snapshot.drift,
+        "texts": texts,
+        "entities": columns,
+        "query_runs": runs,
+        "aggregated_entities": aggregated,
+    }
+
+
+def decode_snapshot(data: dict) -> MonitoringSnapshot:
+    if not is_compact(data):
+        return MonitoringSnapshot(**data)
+
+    texts = data["texts"]
+    rows = [
+        dict(zip(_ENTITY_COLUMNS, values))
+        for values in zip(*(data["entities"][name] for name in _ENTITY_COLUMNS))
+    ]
+
+    runs = []
+    for run in data["query_runs"]:
+        start, end = run["entities"]
+        runs.append(
+            {
+                "query": run["query"],
+                "query_normalized": run["query_normalized"],
+                "run_id": run["run_id"],
+                "created_at": run["created_at"],
+                "summary": run["summary"],
+                "outputs": [
+                    {
+                        "platform": output["platform"],
+                        "model": output["model"],
+                        "query": output.get("query", run["query"]),
+                        "raw_output": texts[output["text"]],
+                        "snippet": output["snippet"],
+                        "citations": output["citations"],
+                        "error": output.get("error"),
+                        "cached": output.get("cached", False),
+                    }
+                    for output in run["outputs"]
+                ],
+                "entity_index": rows[start:end],
+            }
+        )
+
+    if data.get("aggregated_entities") is not None:
+        start, end = data["aggregated_entities"]
+        aggregated = rows[start:end]
+    else:
+        aggregated = [row for run in runs for row in run["entity_index"]]
+
+    # One validation pass (in pydantic-core) rebuilds the nested models.
+    return MonitoringSnapshot.model_validate(
+        {
+            key: value
+            for key, value in data.items()
+            if key not in ("format", "texts", "entities")
+        }
+        | {"query_runs": runs, "aggregated_entities": aggregated}
+    )
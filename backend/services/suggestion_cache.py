@@ -0,0 +1,97 @@
+"""Memoized onboarding LLM suggestions keyed by profile and competitor fingerprints."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from typing import Any, Awaitable, Callable, Hashable
+
+from pydantic import BaseModel
+
+from config import settings
+from models.schemas import BusinessProfile, CompetitorCandidate
+from services.ttl_cache import TTLCache
+
+# confidence is the model's own estimate and never changes what we ask for
+_PROFILE_FIELDS = (
+    "business_name",
+    "industry",
+    "size_band",
+    "country",
+    "region",
+    "city",
+    "website",
+    "scope_level",
+)
+
+
+def _normalize(value: str | None) -> str:
+    return re.sub(r"\s+", " ", (value or "").strip().lower())
+
+
+def _digest(material: Any) -> str:
+    encoded = json.dumps(material, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:32]
+
+
+def profile_fingerprint(profile: BusinessProfile) -> str:
+    """Stable key for a profile: normalized descriptive fields, without confidence."""
+    return _digest([_normalize(getattr(profile, field)) for field in _PROFILE_FIELDS])
+
+
+def competitor_fingerprint(competitors: list[CompetitorCandidate]) -> str:
+    """Order-insensitive key for a competitor set (name and domain only)."""
+    rows = {(_normalize(row.name), _normalize(row.domain)) for row in competitors}
+    return _digest(sorted(rows))
+
+
+def _copy(value: Any) -> Any:
+    # Callers re-rank and renumber suggestions in place, so never hand out
+    # the cached instances themselves.
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    if isinstance(value, BaseModel):
+        return value.model_copy(deep=True)
+    return value
+
+
+class SuggestionCache:
+    """TTL + LRU memo for onboarding LLM calls.
+
+    Only non-empty results are stored, so a failed or disabled LLM call is
+    retried on the next request instead of pinning the fallback for the TTL.
+    """
+
+    def __init__(self, *, ttl_sec: float, max_entries: int, enabled: bool = True):
+        self.enabled = enabled
+        self._entries = TTLCache(max_entries=max_entries, ttl_sec=ttl_sec)
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        if not self.enabled:
+            return await fetch()
+        cached = self._entries.get(key)
+        if cached is not None:
+            return _copy(cached)
+        value = await fetch()
+        if value:
+            self._entries.set(key, _copy(value))
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self._entries.hits,
+            "misses": self._entries.misses,
+        }
+
+
+suggestion_cache = SuggestionCache(
+    ttl_sec=settings.onboarding_cache_ttl_sec,
+    max_entries=settings.onboarding_cache_max_entries,
+    enabled=settings.onboarding_cache_enabled,
+)
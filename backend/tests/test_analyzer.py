@@ -0,0 +1,98 @@
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from models.schemas import AnalysisRequest, Platform
+from services.analyzer import run_analysis, stream_analysis
+from services.query_generator import generate_queries
+from services.scoring import analyze_response, calculate_visibility_score
+
+
+def _fake_provider(platform: str, slow_query_index: int | None = None):
+    async def query(text: str) -> dict:
+        if slow_query_index is not None and text.startswith("Beste"):
+            await asyncio.sleep(0.05)
+        return {
+            "query": text,
+            "model": platform,
+            "response": f"1. Grov Sykkel er anbefalt og pålitelig ({platform})",
+            "citations": ["https://grovsykkel.no"],
+            "error": None,
+        }
+
+    return query
+
+
+class AnalyzerTests(unittest.IsolatedAsyncioTestCase):
+    async def test_stream_yields_mentions_first_and_matches_run_analysis(self):
+        chatgpt = _fake_provider("gpt", slow_query_index=6)
+        perplexity = _fake_provider("sonar")
+        request = AnalysisRequest(email="user@example.com", brand_name="Grov Sykkel")
+
+        with patch("services.analyzer.openai_query", new=chatgpt), patch(
+            "services.analyzer.perplexity_query", new=perplexity
+        ):
+            events = [event async for event in stream_analysis(request)]
+            expected = await run_analysis(request)
+
+        kinds = [event["event"] for event in events]
+        self.assertEqual(kinds[0], "started")
+        self.assertEqual(kinds[1], "mention")
+        self.assertEqual(kinds[-1], "result")
+        self.assertEqual(kinds.count("mention"), 16)
+        mentions = [event["data"] for event in events if event["event"] == "mention"]
+        self.assertTrue(mentions[-1]["query"].startswith("Beste"))
+        self.assertEqual(events[-1]["data"], expected.model_dump(mode="json"))
+
+    async def test_incremental_scores_match_batch_scoring(self):
+        chatgpt = _fake_provider("gpt", slow_query_index=6)
+
+        async def perplexity(text: str) -> dict:
+            if "alternativer" in text:
+                return {"query": text, "response": "", "citations": [], "error": "timeout"}
+            return {
+                "query": text,
+                "response": "Andre aktører er bedre, Grov Sykkel er dyr og treg.",
+                "citations": [],
+                "error": None,
+            }
+
+        request = AnalysisRequest(email="user@example.com", brand_name="Grov Sykkel")
+        queries = generate_queries("Grov Sykkel")
+        expected_chatgpt = [
+            analyze_response((await chatgpt(q))["response"], "Grov Sykkel") for q in queries
+        ]
+        expected_perplexity = [
+            analyze_response((await perplexity(q))["response"], "Grov Sykkel")
+            for q in queries
+            if "alternativer" not in q
+        ]
+
+        with patch("services.analyzer.openai_query", new=chatgpt), patch(
+            "services.analyzer.perplexity_query", new=perplexity
+        ):
+            result = await run_analysis(request)
+
+        scores = {row.platform: row for row in result.platform_scores}
+        self.assertEqual(
+            scores[Platform.CHATGPT].score, calculate_visibility_score(expected_chatgpt)
+        )
+        self.assertEqual(
+            scores[Platform.PERPLEXITY].score,
+            calculate_visibility_score(expected_perplexity),
+        )
+        self.assertEqual(scores[Platform.PERPLEXITY].total_queries, 7)
+        self.assertEqual(scores[Platform.PERPLEXITY].avg_sentiment, "negative")
+        self.assertEqual(
+            result.visibility_score,
+            calculate_visibility_score(expected_chatgpt + expected_perplexity),
+        )
+        self.assertEqual([m.query for m in result.mentions[:8]], queries)
+
+
+if __name__ == "__main__":
+    unittest.main()
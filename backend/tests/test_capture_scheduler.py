@@ -0,0 +1,85 @@
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from models.schemas import Platform
+from services.capture_scheduler import CaptureScheduler
+from services.rate_limiter import ProviderLimiter
+
+
+def _scheduler(concurrency: int = 1) -> CaptureScheduler:
+    return CaptureScheduler(
+        {
+            platform: ProviderLimiter(
+                platform.value,
+                rpm=0,
+                tpm=0,
+                max_concurrency=concurrency,
+                min_concurrency=concurrency,
+            )
+            for platform in (Platform.CHATGPT, Platform.PERPLEXITY)
+        }
+    )
+
+
+class CaptureSchedulerTests(unittest.IsolatedAsyncioTestCase):
+    async def test_jobs_share_a_platform_round_robin(self):
+        scheduler = _scheduler()
+        order: list[str] = []
+
+        async def fake_capture(platform, query):
+            order.append(query)
+            await asyncio.sleep(0)
+            return {"platform": platform, "query": query}
+
+        with patch("services.capture_scheduler.capture_platform", new=fake_capture):
+            big = [scheduler.submit("big", Platform.CHATGPT, f"big-{i}") for i in range(4)]
+            small = [scheduler.submit("small", Platform.CHATGPT, f"small-{i}") for i in range(2)]
+            await asyncio.gather(*big, *small)
+        await scheduler.close()
+
+        self.assertEqual(order[:4], ["big-0", "small-0", "big-1", "small-1"])
+
+    async def test_fast_platform_does_not_wait_for_slow_platform(self):
+        scheduler = _scheduler()
+        slow_release = asyncio.Event()
+
+        async def fake_capture(platform, query):
+            if platform == Platform.PERPLEXITY:
+                await slow_release.wait()
+            return {"platform": platform, "query": query}
+
+        with patch("services.capture_scheduler.capture_platform", new=fake_capture):
+            slow = asyncio.ensure_future(scheduler.submit("job", Platform.PERPLEXITY, "q0"))
+            fast = await asyncio.wait_for(
+                asyncio.gather(
+                    *[scheduler.submit("job", Platform.CHATGPT, f"q{i}") for i in range(5)]
+                ),
+                timeout=1,
+            )
+            self.assertEqual(len(fast), 5)
+            self.assertFalse(slow.done())
+            slow_release.set()
+            await slow
+        await scheduler.close()
+
+    def test_estimate_uses_queue_depth_and_throughput(self):
+        scheduler = _scheduler(concurrency=4)
+        self.assertEqual(scheduler.estimate_duration_sec({Platform.CHATGPT: 0}), 0)
+        # 8 captures at 4 in parallel, 8s each by default.
+        self.assertEqual(scheduler.estimate_duration_sec({Platform.CHATGPT: 8}), 16)
+        # Captures waiting elsewhere (queue workers) count toward the depth.
+        self.assertEqual(
+            scheduler.estimate_duration_sec(
+                {Platform.CHATGPT: 8}, backlog={Platform.CHATGPT: 8, Platform.PERPLEXITY: 50}
+            ),
+            32,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
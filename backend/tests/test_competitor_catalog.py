@@ -0,0 +1,217 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from models.schemas import BusinessProfile, EntityIndexItem, Platform, QueryCaptureResult
+from services.competitor_catalog import BUNDLED_CATALOG_PATH, CatalogEntry, CompetitorCatalog
+from services.onboarding_suggester import suggest_competitors
+
+
+def _run(query: str, entities: list[str], confidence: float = 0.95) -> QueryCaptureResult:
+    return QueryCaptureResult(
+        query=query,
+        query_normalized=query.lower(),
+        run_id=f"run_{query}",
+        created_at="2026-10-18T00:00:00+00:00",
+        outputs=[],
+        entity_index=[
+            EntityIndexItem(
+                platform=Platform.CHATGPT,
+                entity=name,
+                position=index + 1,
+                mention_type="recommendation",
+                sentiment="neutral",
+                confidence=confidence,
+            )
+            for index, name in enumerate(entities)
+        ],
+        summary="ok",
+    )
+
+
+class CompetitorCatalogTests(unittest.IsolatedAsyncioTestCase):
+    def _catalog(self, **kwargs) -> CompetitorCatalog:
+        catalog = CompetitorCatalog(promote_mentions=kwargs.pop("promote_mentions", 3), **kwargs)
+        catalog.load_csv(BUNDLED_CATALOG_PATH)
+        return catalog
+
+    def test_lookup_ranks_city_then_region_then_national(self):
+        catalog = self._catalog()
+        catalog.add(CatalogEntry(name="Hamar Sykkel", industry="bike_shop", city="Hamar", region="Innlandet", weight=0.6))
+        catalog.add(CatalogEntry(name="Gjøvik Sykkel", industry="bike_shop", city="Gjøvik", region="Innlandet", weight=0.7))
+
+        rows = catalog.lookup(
+            industry="bike_shop", city="Hamar", region="Innlandet", exclude=["XXL"], limit=4
+        )
+
+        self.assertEqual(
+            [(row.name, row.scope_match) for row in rows],
+            [
+                ("Hamar Sykkel", "city"),
+                ("Gjøvik Sykkel", "region"),
+                ("Intersport", "country"),
+                ("Sport 1", "country"),
+            ],
+        )
+        self.assertFalse(any(row.name == "Oslo Sportslager" for row in rows))
+
+    def test_lookup_excludes_business_by_name_or_domain(self):
+        catalog = self._catalog()
+        rows = catalog.lookup(industry="banking", exclude=["dnb", "nordea.no"], limit=8)
+        names = [row.name for row in rows]
+        self.assertNotIn("DNB", names)
+        self.assertNotIn("Nordea Norge", names)
+        self.assertEqual(names[0], "SpareBank 1")
+
+    def test_recurring_entities_are_promoted_and_persisted(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            learned_path = os.path.join(tmp, "learned.csv")
+            catalog = self._catalog(learned_path=learned_path)
+            observe = dict(
+                industry="bike_shop",
+                scope_level="city",
+                city="Hamar",
+                region="Innlandet",
+                exclude=["Grov Sykkel"],
+            )
+
+            catalog.observe(
+                query_runs=[
+                    _run("q1", ["Grov Sykkel", "Hamar Bike Shop", "XXL"]),
+                    _run("q2", ["Hamar Bike Shop"], confidence=0.55),
+                    _run("q3", ["Hamar Bike Shop"]),
+                ],
+                **observe,
+            )
+            self.assertEqual(catalog.lookup(industry="bike_shop", city="Hamar")[0].name, "XXL")
+
+            promoted = catalog.observe(query_runs=[_run("q4", ["Hamar Bike Shop"])], **observe)
+
+            self.assertEqual([entry.name for entry in promoted], ["Hamar Bike Shop"])
+            top = catalog.lookup(industry="bike_shop", city="Hamar", region="Innlandet")[0]
+            self.assertEqual((top.name, top.scope_match), ("Hamar Bike Shop", "city"))
+            self.assertEqual(catalog.stats["promoted"], 1)
+
+            reloaded = CompetitorCatalog(promote_mentions=3)
+            self.assertEqual(reloaded.load_csv(learned_path, learned=True), 1)
+            self.assertEqual(
+                reloaded.lookup(industry="bike_shop", city="Hamar")[0].name, "Hamar Bike Shop"
+            )
+
+    def test_appends_from_another_process_are_picked_up_on_lookup(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            learned_path = os.path.join(tmp, "learned.csv")
+            api = CompetitorCatalog(promote_mentions=3, learned_path=learned_path)
+            worker = CompetitorCatalog(promote_mentions=1, learned_path=learned_path)
+            self.assertEqual(api.lookup(industry="bike_shop", city="Bergen"), [])
+
+            worker.observe(
+                industry="bike_shop",
+                scope_level="city",
+                city="Bergen",
+                region="Vestland",
+                query_runs=[_run("q1", ["Bergen Bike Shop"])],
+            )
+
+            rows = api.lookup(industry="bike_shop", city="Bergen")
+            self.assertEqual([row.name for row in rows], ["Bergen Bike Shop"])
+            self.assertEqual(len(api), 1)
+
+    def _local_catalog(self, industry: str) -> CompetitorCatalog:
+        catalog = self._catalog()
+        for index in range(5):
+            catalog.add(
+                CatalogEntry(
+                    name=f"Bergen {industry} {index}",
+                    industry=industry,
+                    city="Bergen",
+                    region="Vestland",
+                    weight=0.9,
+                )
+            )
+        return catalog
+
+    async def _suggest(self, catalog: CompetitorCatalog, profile: BusinessProfile, llm: AsyncMock):
+        with patch("services.onboarding_suggester.competitor_catalog", catalog), patch(
+            "services.onboarding_suggester._llm_competitors", new=llm
+        ):
+            return await suggest_competitors(profile, limit=8)
+
+    async def test_covered_market_skips_llm_competitors(self):
+        profile = BusinessProfile(
+            business_name="Grov Sykkel",
+            industry="bike_shop",
+            size_band="local",
+            city="Bergen",
+            region="Vestland",
+        )
+        catalog = self._local_catalog("bike_shop")
+        llm = AsyncMock(return_value=[])
+
+        rows = await self._suggest(catalog, profile, llm)
+
+        llm.assert_not_awaited()
+        self.assertEqual(len(rows), 8)
+        self.assertEqual(rows[0].scope_match, "city")
+        self.assertEqual(catalog.stats["covered"], 1)
+
+    async def test_national_hits_do_not_cover_a_local_market(self):
+        profile = BusinessProfile(
+            business_name="Hamar Sykkel",
+            industry="bike_shop",
+            size_band="local",
+            city="Hamar",
+            region="Innlandet",
+            scope_level="city",
+        )
+        catalog = self._catalog()
+        llm = AsyncMock(return_value=[])
+
+        rows = await self._suggest(catalog, profile, llm)
+
+        llm.assert_awaited_once()
+        self.assertEqual({row.scope_match for row in rows}, {"country"})
+        self.assertEqual(catalog.stats["covered"], 0)
+
+    async def test_national_hits_cover_a_country_scope_business(self):
+        profile = BusinessProfile(
+            business_name="Nordea Norge",
+            industry="banking",
+            size_band="enterprise",
+            website="https://www.nordea.no",
+            scope_level="country",
+        )
+        catalog = self._catalog()
+        llm = AsyncMock(return_value=[])
+
+        rows = await self._suggest(catalog, profile, llm)
+
+        llm.assert_not_awaited()
+        self.assertEqual(len(rows), 7)
+        self.assertNotIn("Nordea Norge", [row.name for row in rows])
+        self.assertEqual(catalog.stats["covered"], 1)
+
+    async def test_guessed_industry_is_not_looked_up(self):
+        # "Konditori" contains "it"; a keyword guess would match technology.
+        profile = BusinessProfile(
+            business_name="Baker Brun",
+            industry="Konditori",
+            size_band="local",
+            city="Bergen",
+            region="Vestland",
+        )
+        catalog = self._local_catalog("technology")
+        llm = AsyncMock(return_value=[])
+
+        rows = await self._suggest(catalog, profile, llm)
+
+        llm.assert_awaited_once()
+        self.assertFalse(any(row.name.startswith("Bergen technology") for row in rows))
+        self.assertEqual(catalog.stats["lookups"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
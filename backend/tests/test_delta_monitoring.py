@@ -0,0 +1,194 @@
+import os
+import sys
+import unittest
+from unittest.mock import AsyncMock, patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from models.schemas import (
+    BusinessProfile,
+    EntityIndexItem,
+    ModelOutput,
+    MonitoringSnapshot,
+    Platform,
+    QueryCaptureResult,
+    SuggestedQuery,
+)
+from services import monitoring_runner
+from services.delta_monitoring import plan_delta, query_drift
+
+PROFILE = BusinessProfile(
+    business_name="Grov Sykkel",
+    industry="bike_shop",
+    size_band="local",
+    city="Bergen",
+    scope_level="city",
+)
+
+
+def _query(text: str) -> SuggestedQuery:
+    return SuggestedQuery(text=text, category="local_discovery", priority=1)
+
+
+def _result(text: str, answer: str, entities: list[str]) -> QueryCaptureResult:
+    return QueryCaptureResult(
+        query=text,
+        query_normalized=text.lower(),
+        run_id="run_prev",
+        created_at="2026-10-01T00:00:00+00:00",
+        outputs=[
+            ModelOutput(
+                platform=Platform.CHATGPT,
+                model="gpt-4.1-mini",
+                query=text,
+                raw_output=answer,
+                snippet=answer,
+            )
+        ],
+        entity_index=[
+            EntityIndexItem(
+                platform=Platform.CHATGPT,
+                entity=name,
+                position=index + 1,
+                mention_type="list",
+                sentiment="neutral",
+                confidence=0.9,
+            )
+            for index, name in enumerate(entities)
+        ],
+        summary="ok",
+    )
+
+
+def _snapshot(results: list[QueryCaptureResult]) -> MonitoringSnapshot:
+    return MonitoringSnapshot(
+        config_id="config_1",
+        run_id="run_prev",
+        created_at="2026-10-01T00:00:00+00:00",
+        profile=PROFILE,
+        selected_competitors=[],
+        active_queries=[_query(result.query) for result in results],
+        platforms=[Platform.CHATGPT],
+        query_runs=results,
+        aggregated_entities=[row for result in results for row in result.entity_index],
+        summary="ok",
+    )
+
+
+class DeltaPlanTests(unittest.TestCase):
+    def test_samples_known_queries_and_always_captures_new_ones(self):
+        previous = _snapshot([_result(f"spørring {i}", "svar", ["A"]) for i in range(8)])
+        queries = [_query(f"spørring {i}") for i in range(8)] + [_query("ny spørring")]
+
+        plan = plan_delta(previous, queries, [Platform.CHATGPT], sample_ratio=0.25, seed="job")
+        again = plan_delta(previous, queries, [Platform.CHATGPT], sample_ratio=0.25, seed="job")
+
+        self.assertEqual(len(plan.sample), 3)
+        self.assertEqual(plan.sample[0].text, "ny spørring")
+        self.assertEqual(len(plan.rest), 6)
+        self.assertEqual([q.text for q in plan.sample], [q.text for q in again.sample])
+
+    def test_previous_without_all_platforms_is_recaptured(self):
+        previous = _snapshot([_result("spørring", "svar", ["A"])])
+        plan = plan_delta(
+            previous,
+            [_query("spørring")],
+            [Platform.CHATGPT, Platform.PERPLEXITY],
+            sample_ratio=0.25,
+            seed="job",
+        )
+        self.assertEqual(plan.previous, {})
+        self.assertEqual(len(plan.sample), 1)
+
+    def test_queries_carried_too_long_are_recaptured(self):
+        previous = _snapshot([_result(f"spørring {i}", "svar", ["A"]) for i in range(4)])
+        previous.carried_runs = {"spørring 0": 3, "spørring 1": 2}
+
+        plan = plan_delta(
+            previous,
+            [_query(f"spørring {i}") for i in range(4)],
+            [Platform.CHATGPT],
+            sample_ratio=0.25,
+            seed="job",
+            max_carries=3,
+        )
+
+        self.assertEqual(plan.sample[0].text, "spørring 0")
+        self.assertEqual(len(plan.sample), 2)
+        self.assertNotIn("spørring 0", [item.text for item in plan.rest])
+
+    def test_query_drift(self):
+        before = _result("q", "1. A\n2. B", ["A", "B"])
+        self.assertEqual(query_drift(before, _result("q", "1. A\n2. B", ["A", "B"])), 0.0)
+        self.assertAlmostEqual(query_drift(before, _result("q", "1. A\n2. C", ["A", "C"])), 2 / 3)
+
+
+class DeltaRunTests(unittest.IsolatedAsyncioTestCase):
+    async def _run(self, job_id: str, answers: dict[str, str]):
+        texts = [f"spørring {i}" for i in range(4)]
+        previous = _snapshot([_result(text, "1. A", ["A"]) for text in texts])
+
+        async def fake_capture(request, checkpointed=None, capture=None):
+            answer = answers.get(request.query, "1. A")
+            return _result(request.query, answer, [answer.removeprefix("1. ")])
+
+        capture = AsyncMock(side_effect=fake_capture)
+        self.stored_rows = []
+
+        async def store_rows(rows):
+            self.stored_rows.extend(rows)
+            return len(rows)
+
+        with patch(
+            "services.monitoring_runner.load_latest_snapshot",
+            new=AsyncMock(return_value=previous.model_dump(mode="json")),
+        ), patch("services.monitoring_runner.run_query_capture", new=capture), patch(
+            "db.supabase.store_query_run_rows", new=store_rows
+        ), patch(
+            "services.monitoring_runner.store_monitoring_job", new=AsyncMock(return_value=False)
+        ):
+            await monitoring_runner._run_job(
+                job_id=job_id,
+                config_id="config_1",
+                email="user@example.com",
+                profile=PROFILE,
+                selected_competitors=[],
+                active_queries=[_query(text) for text in texts],
+                platforms=[Platform.CHATGPT],
+                mode="delta",
+            )
+        job = await monitoring_runner.get_monitoring_job_status(job_id)
+        return job, capture
+
+    async def test_unchanged_sample_carries_other_queries_forward(self):
+        job, capture = await self._run("delta_unchanged", answers={})
+
+        self.assertEqual(capture.await_count, 1)
+        self.assertEqual(job.snapshot.run_mode, "delta")
+        self.assertEqual(len(job.snapshot.carried_queries), 3)
+        self.assertEqual(len(job.snapshot.query_runs), 4)
+        self.assertEqual(len(job.snapshot.aggregated_entities), 4)
+        self.assertEqual(job.progress.completed_queries, 4)
+        self.assertEqual(set(job.snapshot.carried_runs.values()), {1})
+
+        # Carried queries still get a query_runs row for this job, flagged as carried.
+        self.assertEqual(len(self.stored_rows), 4)
+        self.assertEqual(sum(row["carried"] for row in self.stored_rows), 3)
+        self.assertEqual({row["job_id"] for row in self.stored_rows}, {"delta_unchanged"})
+        carried = [
+            run for run in job.snapshot.query_runs if run.query in job.snapshot.carried_queries
+        ]
+        self.assertTrue(all(run.run_id != "run_prev" for run in carried))
+        self.assertTrue(all(run.created_at > "2026-10-01T00:00:00+00:00" for run in carried))
+
+    async def test_drifted_sample_escalates_to_full_run(self):
+        answers = {f"spørring {i}": "1. B" for i in range(4)}
+        job, capture = await self._run("delta_drifted", answers=answers)
+
+        self.assertEqual(capture.await_count, 4)
+        self.assertEqual(job.snapshot.run_mode, "escalated")
+        self.assertEqual(job.snapshot.carried_queries, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import AsyncMock, patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from models.schemas import (
+    BusinessProfile,
+    EntityIndexItem,
+    MonitoringJobProgress,
+    MonitoringJobStatusResponse,
+    MonitoringSnapshot,
+    Platform,
+    SuggestedQuery,
+)
+from services import monitoring_runner
+from services.job_events import JobEventBus
+
+
+class JobEventBusTests(unittest.IsolatedAsyncioTestCase):
+    async def test_fans_out_and_drops_oldest_for_slow_subscribers(self):
+        bus = JobEventBus(max_queue=2)
+        first = bus.subscribe("job")
+        second = bus.subscribe("job")
+
+        for index in range(3):
+            bus.publish("job", "progress", {"completed_queries": index})
+        bus.publish("other", "progress", {})
+
+        for queue in (first, second):
+            self.assertEqual(queue.get_nowait()["data"], {"completed_queries": 1})
+            self.assertEqual(queue.get_nowait()["data"], {"completed_queries": 2})
+        self.assertEqual(bus.dropped, 2)
+
+        bus.unsubscribe("job", first)
+        bus.unsubscribe("job", second)
+        self.assertEqual(bus.stats["subscribers"], 0)
+
+
+class JobEventStreamTests(unittest.IsolatedAsyncioTestCase):
+    async def test_local_job_streams_deltas_until_completed(self):
+        job = MonitoringJobStatusResponse(
+            job_id="events_job",
+            status="running",
+            progress=MonitoringJobProgress(total_queries=2, completed_queries=0, failed_queries=0),
+        )
+        monitoring_runner._JOBS.put(job)
+        state = monitoring_runner._JobState(job)
+
+        events: list[dict] = []
+
+        async def consume():
+            async for event in monitoring_runner.stream_job_events("events_job"):
+                events.append(event)
+
+        consumer = asyncio.create_task(consume())
+        await asyncio.sleep(0)
+
+        entity = EntityIndexItem(
+            platform=Platform.CHATGPT,
+            entity="Grov Sykkel",
+            position=1,
+            mention_type="list",
+            sentiment="neutral",
+            confidence=0.9,
+        )
+        state.record_result([entity])
+        state.record_failure(RuntimeError("timeout"))
+        state.complete(
+            MonitoringSnapshot(
+                config_id="config_1",
+                run_id="run_1",
+                created_at="2026-10-18T00:00:00+00:00",
+                profile=BusinessProfile(
+                    business_name="Grov Sykkel", industry="bike_shop", size_band="local"
+                ),
+                selected_competitors=[],
+                active_queries=[],
+                platforms=[Platform.CHATGPT],
+                query_runs=[],
+                aggregated_entities=[entity],
+                summary="ferdig",
+            )
+        )
+        await asyncio.wait_for(consumer, timeout=1)
+
+        names = [event["event"] for event in events]
+        self.assertEqual(names[:3], ["status", "progress", "entities"])
+        self.assertEqual(names[3:], ["progress", "entities", "progress", "completed"])
+        self.assertEqual(events[-2]["data"]["failed_queries"], 1)
+        self.assertEqual(events[-1]["data"]["summary"], "ferdig")
+        self.assertNotIn("snapshot", events[-1]["data"])
+
+    async def test_inline_job_crash_fails_job_and_ends_stream(self):
+        events: list[dict] = []
+        with patch(
+            "services.monitoring_runner._run_job",
+            new=AsyncMock(side_effect=RuntimeError("boom")),
+        ), patch(
+            "services.monitoring_runner.store_monitoring_job",
+            new=AsyncMock(return_value=False),
+        ), patch.object(monitoring_runner, "job_queue", None):
+            job_id = await monitoring_runner.start_onboarding_job(
+                config_id="config_1",
+                email="user@example.com",
+                profile=BusinessProfile(
+                    business_name="Grov Sykkel", industry="bike_shop", size_band="local"
+                ),
+                selected_competitors=[],
+                active_queries=[
+                    SuggestedQuery(text="beste sykkelbutikk", category="discovery", priority=1)
+                ],
+                platforms=[Platform.CHATGPT],
+            )
+
+            async def consume():
+                async for event in monitoring_runner.stream_job_events(job_id):
+                    events.append(event)
+
+            await asyncio.wait_for(consume(), timeout=1)
+            job = await monitoring_runner.get_monitoring_job_status(job_id)
+
+        self.assertEqual(job.status, "failed")
+        self.assertEqual(job.error, "boom")
+        self.assertEqual(events[-1], {"event": "failed", "data": {"error": "boom"}})
+
+    async def test_quiet_stream_sends_keepalives_then_times_out(self):
+        job = MonitoringJobStatusResponse(
+            job_id="quiet_job",
+            status="running",
+            progress=MonitoringJobProgress(total_queries=1, completed_queries=0, failed_queries=0),
+        )
+        monitoring_runner._JOBS.put(job)
+        events: list[dict] = []
+
+        async def consume():
+            async for event in monitoring_runner.stream_job_events("quiet_job"):
+                events.append(event)
+
+        with patch.object(monitoring_runner.settings, "job_events_keepalive_sec", 0.01), patch.object(
+            monitoring_runner.settings, "job_events_idle_timeout_sec", 0.05
+        ):
+            await asyncio.wait_for(consume(), timeout=1)
+
+        self.assertEqual([event["event"] for event in events[:3]], ["status", "progress", "entities"])
+        self.assertIn(monitoring_runner.KEEPALIVE_EVENT, events[3:])
+        self.assertTrue(all(event["event"] == "keepalive" for event in events[3:]))
+
+
+if __name__ == "__main__":
+    unittest.main()
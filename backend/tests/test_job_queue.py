@@ -0,0 +1,226 @@
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from models.schemas import (
+    BusinessProfile,
+    ModelOutput,
+    Platform,
+    QueryCaptureResult,
+    SuggestedQuery,
+)
+from services import monitoring_runner
+from services.job_queue import SQLiteJobQueue
+
+
+class SQLiteJobQueueTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.queue = SQLiteJobQueue(os.path.join(self._tmp.name, "jobs.sqlite3"), max_attempts=2)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    async def test_claim_leases_job_to_one_worker(self):
+        await self.queue.enqueue("job_1", {"n": 1}, {"status": "queued"})
+
+        claimed = await self.queue.claim("w1", lease_sec=60)
+        self.assertEqual(claimed.job_id, "job_1")
+        self.assertEqual(claimed.payload, {"n": 1})
+        self.assertIsNone(await self.queue.claim("w2", lease_sec=60))
+
+        self.assertTrue(await self.queue.heartbeat("job_1", "w1", lease_sec=60))
+        self.assertFalse(await self.queue.heartbeat("job_1", "w2", lease_sec=60))
+
+        await self.queue.finish("job_1", "w1")
+        self.assertIsNone(await self.queue.claim("w2", lease_sec=60))
+
+    async def test_expired_lease_is_reclaimed_then_failed(self):
+        await self.queue.enqueue("job_1", {}, {"job_id": "job_1", "status": "running"})
+
+        first = await self.queue.claim("w1", lease_sec=-1)
+        second = await self.queue.claim("w2", lease_sec=-1)
+        self.assertEqual(first.attempts, 1)
+        self.assertEqual(second.attempts, 2)
+
+        self.assertIsNone(await self.queue.claim("w3", lease_sec=60))
+        status = await self.queue.load_status("job_1")
+        self.assertEqual(status["status"], "failed")
+        self.assertEqual((await self.queue.stats())["failed"], 1)
+
+    async def test_backlog_counts_remaining_captures_per_platform(self):
+        queries = [{"text": f"q{i}"} for i in range(4)]
+        await self.queue.enqueue(
+            "job_1", {"active_queries": queries, "platforms": ["ChatGPT", "Perplexity"]}, {}
+        )
+        await self.queue.enqueue(
+            "job_2",
+            {"active_queries": queries, "platforms": ["ChatGPT"]},
+            {"progress": {"total_queries": 4, "completed_queries": 2, "failed_queries": 1}},
+        )
+        await self.queue.enqueue("job_3", {"active_queries": queries, "platforms": ["ChatGPT"]}, {})
+        claimed = await self.queue.claim("w1", lease_sec=60)
+        await self.queue.finish(claimed.job_id, "w1")
+
+        # job_1 is done; job_2 has one query left and job_3 has not started.
+        self.assertEqual(await self.queue.backlog(), {"ChatGPT": 5})
+
+
+class QueuedMonitoringJobTests(unittest.IsolatedAsyncioTestCase):
+    async def test_queued_job_status_is_shared_through_queue(self):
+        profile = BusinessProfile(
+            business_name="Grov Sykkel",
+            industry="bike_shop",
+            size_band="local",
+            country="NO",
+            city="Bergen",
+            scope_level="city",
+            confidence=0.8,
+        )
+        query = SuggestedQuery(
+            text="beste sykkelbutikk i Bergen", category="local_discovery", priority=1
+        )
+        result = QueryCaptureResult(
+            query=query.text,
+            query_normalized=query.text.lower(),
+            run_id="run_1",
+            created_at="2026-02-10T12:00:00Z",
+            outputs=[
+                ModelOutput(
+                    platform=Platform.CHATGPT,
+                    model="gpt-4.1-mini",
+                    query=query.text,
+                    raw_output="1. Grov Sykkel",
+                    snippet="1. Grov Sykkel",
+                )
+            ],
+            entity_index=[],
+            summary="ok",
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            queue = SQLiteJobQueue(os.path.join(tmp, "jobs.sqlite3"))
+            with patch.object(monitoring_runner, "job_queue", queue), patch(
+                "services.monitoring_runner.run_query_capture",
+                new=AsyncMock(return_value=result),
+            ), patch("db.supabase.store_query_run_rows", new=AsyncMock(return_value=1)), patch(
+                "services.monitoring_runner.store_monitoring_job",
+                new=AsyncMock(return_value=False),
+            ), patch(
+                "services.monitoring_runner.load_monitoring_job", new=AsyncMock(return_value=None)
+            ):
+                job_id = await monitoring_runner.start_onboarding_job(
+                    config_id="config_1",
+                    email="user@example.com",
+                    profile=profile,
+                    selected_competitors=[],
+                    active_queries=[query],
+                    platforms=[Platform.CHATGPT],
+                )
+                queued = await monitoring_runner.get_monitoring_job_status(job_id)
+                self.assertEqual(queued.status, "queued")
+
+                claimed = await queue.claim("worker_1", lease_sec=60)
+                await monitoring_runner.run_queued_job(claimed, "worker_1")
+
+                # Read back as another API process would: from the queue only.
+                monitoring_runner._JOBS._drop(job_id)
+                final = await monitoring_runner.get_monitoring_job_status(job_id)
+
+        self.assertEqual(final.status, "completed")
+        self.assertEqual(final.progress.completed_queries, 1)
+        self.assertIsNotNone(final.snapshot)
+
+    async def test_queue_mode_estimate_includes_queue_backlog(self):
+        queue = AsyncMock()
+        queue.backlog.return_value = {}
+        queries = [
+            SuggestedQuery(text=f"q{i}", category="local_discovery", priority=1) for i in range(5)
+        ]
+        platforms = [Platform.CHATGPT, Platform.PERPLEXITY]
+        with patch.object(monitoring_runner, "job_queue", queue):
+            idle = await monitoring_runner.estimate_job_duration_sec(queries, platforms)
+            queue.backlog.return_value = {"ChatGPT": 640}
+            busy = await monitoring_runner.estimate_job_duration_sec(queries, platforms)
+
+        # Empty API-process lanes must not make a queued job look instant.
+        self.assertEqual(idle, monitoring_runner.QUEUED_JOB_MIN_SEC)
+        self.assertGreater(busy, idle)
+
+    async def test_lost_lease_stops_job_without_finishing_it(self):
+        payload = {
+            "config_id": "config_1",
+            "email": "user@example.com",
+            "profile": BusinessProfile(
+                business_name="Grov Sykkel", industry="bike_shop", size_band="local"
+            ).model_dump(mode="json"),
+            "selected_competitors": [],
+            "active_queries": [
+                SuggestedQuery(
+                    text="beste sykkelbutikk i Bergen", category="local_discovery", priority=1
+                ).model_dump(mode="json")
+            ],
+            "platforms": ["ChatGPT"],
+        }
+        cancelled = asyncio.Event()
+
+        async def slow_capture(*_args, **_kwargs):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        queue = AsyncMock()
+        queue.load_status.return_value = None
+        queue.heartbeat.return_value = False
+        with patch.object(monitoring_runner, "job_queue", queue), patch.object(
+            monitoring_runner.settings, "job_queue_lease_sec", 0.3
+        ), patch(
+            "services.monitoring_runner.run_query_capture", new=slow_capture
+        ), patch("db.supabase.store_query_run_rows", new=AsyncMock(return_value=1)), patch(
+            "services.monitoring_runner.store_monitoring_job",
+            new=AsyncMock(return_value=False),
+        ):
+            claimed = monitoring_runner.QueuedJob(job_id="job_lost", payload=payload, attempts=1)
+            await asyncio.wait_for(monitoring_runner.run_queued_job(claimed, "worker_1"), 1.0)
+
+        self.assertTrue(cancelled.is_set())
+        queue.heartbeat.assert_awaited()
+        queue.finish.assert_not_awaited()
+
+    async def test_worker_failure_is_persisted_and_finished_as_failed(self):
+        payload = {
+            "config_id": "config_1",
+            "email": "user@example.com",
+            "profile": BusinessProfile(
+                business_name="Grov Sykkel", industry="bike_shop", size_band="local"
+            ).model_dump(mode="json"),
+            "selected_competitors": [],
+            "active_queries": [],
+            "platforms": ["ChatGPT"],
+        }
+        queue = AsyncMock()
+        queue.load_status.return_value = None
+        store = AsyncMock(return_value=True)
+        with patch.object(monitoring_runner, "job_queue", queue), patch(
+            "services.monitoring_runner._run_job",
+            new=AsyncMock(side_effect=RuntimeError("boom")),
+        ), patch("services.monitoring_runner.store_monitoring_job", new=store):
+            claimed = monitoring_runner.QueuedJob(job_id="job_crash", payload=payload, attempts=1)
+            with self.assertRaises(RuntimeError):
+                await monitoring_runner.run_queued_job(claimed, "worker_1")
+
+        persisted = store.await_args.args[0]
+        self.assertEqual((persisted["job_id"], persisted["status"]), ("job_crash", "failed"))
+        self.assertEqual(persisted["error"], "boom")
+        queue.finish.assert_awaited_once_with("job_crash", "worker_1", failed=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import sys
+import time
+import unittest
+from unittest.mock import AsyncMock, patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from models.schemas import (
+    BusinessProfile,
+    MonitoringJobProgress,
+    MonitoringJobStatusResponse,
+    MonitoringSnapshot,
+    Platform,
+)
+from services import monitoring_runner
+from services.job_registry import JobRegistry
+
+
+def _job(job_id: str, status: str = "running") -> MonitoringJobStatusResponse:
+    return MonitoringJobStatusResponse(
+        job_id=job_id,
+        status=status,
+        progress=MonitoringJobProgress(total_queries=1, completed_queries=0, failed_queries=0),
+    )
+
+
+class JobRegistryTests(unittest.TestCase):
+    def test_only_finished_jobs_are_evicted_by_size(self):
+        registry = JobRegistry(max_jobs=2, finished_ttl_sec=3600)
+        registry.put(_job("a"))
+        registry.put(_job("b"))
+        registry.mark_finished("b")
+        registry.put(_job("c"))
+
+        self.assertIn("a", registry)
+        self.assertNotIn("b", registry)
+        self.assertIn("c", registry)
+        self.assertEqual(registry.evictions, 1)
+
+        # Active jobs stay resident even above the bound.
+        registry.put(_job("d"))
+        self.assertEqual(len(registry), 3)
+
+    def test_finished_jobs_expire_after_ttl(self):
+        registry = JobRegistry(max_jobs=10, finished_ttl_sec=60)
+        registry.put(_job("a"))
+        registry.mark_finished("a")
+
+        with patch("services.job_registry.time.monotonic", return_value=time.monotonic() + 61):
+            registry.evict()
+
+        self.assertNotIn("a", registry)
+
+
+class MonitoringJobReloadTests(unittest.IsolatedAsyncioTestCase):
+    async def test_evicted_job_is_loaded_from_storage(self):
+        row = {
+            "job_id": "gone",
+            "status": "completed",
+            "progress_json": {"total_queries": 2, "completed_queries": 2, "failed_queries": 0},
+            "partial_top_entities_json": [],
+            "snapshot_json": None,
+            "error": None,
+        }
+        with patch(
+            "services.monitoring_runner.load_monitoring_job", new=AsyncMock(return_value=row)
+        ):
+            job = await monitoring_runner.get_monitoring_job_status("gone")
+
+        self.assertEqual(job.status, "completed")
+        self.assertEqual(job.progress.completed_queries, 2)
+        self.assertNotIn("gone", monitoring_runner._JOBS)
+
+    async def test_offloaded_snapshot_is_decoded_once_per_ttl(self):
+        snapshot = MonitoringSnapshot(
+            config_id="config_1",
+            run_id="run_1",
+            created_at="2026-10-18T00:00:00+00:00",
+            profile=BusinessProfile(business_name="Grov Sykkel", industry="bike_shop", size_band="local"),
+            selected_competitors=[],
+            active_queries=[],
+            platforms=[Platform.CHATGPT],
+            query_runs=[],
+            aggregated_entities=[],
+            summary="ferdig",
+        )
+        job = _job("hydrated", status="completed")
+        job.snapshot = snapshot
+        monitoring_runner._JOBS.put(job)
+        monitoring_runner._JOBS.mark_finished("hydrated")
+        monitoring_runner._JOBS.offload_snapshot(
+            "hydrated", monitoring_runner.encode_snapshot(snapshot)
+        )
+
+        with patch(
+            "services.monitoring_runner.decode_snapshot",
+            wraps=monitoring_runner.decode_snapshot,
+        ) as decode:
+            first = await monitoring_runner.get_monitoring_job_status("hydrated")
+            second = await monitoring_runner.get_monitoring_job_status("hydrated")
+
+        self.assertEqual(decode.call_count, 1)
+        self.assertEqual(first.snapshot.summary, "ferdig")
+        self.assertIs(second.snapshot, first.snapshot)
+        self.assertIsNone(monitoring_runner._JOBS.get("hydrated").snapshot)
+
+
+if __name__ == "__main__":
+    unittest.main()
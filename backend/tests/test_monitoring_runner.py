@@ -14,6 +14,7 @@ from models.schemas import (
     QueryCaptureResult,
     SuggestedQuery,
 )
+from services import monitoring_runner
 from services.monitoring_runner import get_monitoring_job_status, start_onboarding_job
 
 
@@ -63,13 +64,14 @@ class MonitoringRunnerTests(unittest.IsolatedAsyncioTestCase):
             summary="ok",
         )
 
+        store_rows = AsyncMock(return_value=1)
         with patch(
             "services.monitoring_runner.run_query_capture",
             new=AsyncMock(return_value=query_result),
         ), patch(
-            "services.monitoring_runner.store_query_capture", new=AsyncMock()
+            "db.supabase.store_query_run_rows", new=store_rows
         ), patch(
-            "services.monitoring_runner.store_monitoring_job", new=AsyncMock()
+            "services.monitoring_runner.store_monitoring_job", new=AsyncMock(return_value=False)
         ):
             job_id = await start_onboarding_job(
                 config_id="config_1",
@@ -93,6 +95,119 @@ class MonitoringRunnerTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(final.status, "completed")
         self.assertEqual(final.progress.completed_queries, 1)
         self.assertIsNotNone(final.snapshot)
+        store_rows.assert_awaited_once()
+
+    async def test_resumed_job_only_queries_missing_platforms(self):
+        profile = BusinessProfile(
+            business_name="Grov Sykkel",
+            industry="bike_shop",
+            size_band="local",
+            country="NO",
+            city="Bergen",
+            scope_level="city",
+            confidence=0.8,
+        )
+        query = SuggestedQuery(
+            text="beste sykkelbutikk i Bergen",
+            category="local_discovery",
+            priority=1,
+            scope_tags=["city"],
+        )
+        stored_row = {
+            "query": query.text,
+            "query_normalized": query.text.lower(),
+            "platform": "ChatGPT",
+            "model": "gpt-4.1-mini",
+            "raw_output": "1. Grov Sykkel\n2. Bergen Bike Shop",
+            "citations_json": [],
+        }
+        fetch_platform = AsyncMock(
+            return_value={
+                "platform": Platform.PERPLEXITY,
+                "model": "sonar",
+                "query": query.text,
+                "raw_output": "1. Bergen Bike Shop",
+                "snippet": "1. Bergen Bike Shop",
+                "citations": [],
+                "error": None,
+            }
+        )
+        store_rows = AsyncMock(return_value=1)
+        job_id = "resumed_job"
+        monitoring_runner._JOBS.put(
+            monitoring_runner.MonitoringJobStatusResponse(
+                job_id=job_id,
+                status="queued",
+                progress=monitoring_runner.MonitoringJobProgress(
+                    total_queries=1, completed_queries=0, failed_queries=0
+                ),
+            )
+        )
+
+        with patch(
+            "services.monitoring_runner.fetch_query_runs",
+            new=AsyncMock(return_value=[stored_row]),
+        ), patch(
+            "services.query_capture._fetch_platform", new=fetch_platform
+        ), patch(
+            "db.supabase.store_query_run_rows", new=store_rows
+        ), patch(
+            "services.monitoring_runner.store_monitoring_job", new=AsyncMock(return_value=False)
+        ):
+            await monitoring_runner._run_job(
+                job_id=job_id,
+                config_id="config_1",
+                email="user@example.com",
+                profile=profile,
+                selected_competitors=[],
+                active_queries=[query],
+                platforms=[Platform.CHATGPT, Platform.PERPLEXITY],
+                resume=True,
+            )
+
+        fetch_platform.assert_awaited_once()
+        self.assertEqual(fetch_platform.await_args.args[0], Platform.PERPLEXITY)
+        stored = store_rows.await_args.args[0]
+        self.assertEqual([row["platform"] for row in stored], [Platform.PERPLEXITY])
+
+        job = await get_monitoring_job_status(job_id)
+        self.assertEqual(job.status, "completed")
+        outputs = job.snapshot.query_runs[0].outputs
+        self.assertEqual(
+            [output.platform for output in outputs], [Platform.CHATGPT, Platform.PERPLEXITY]
+        )
+
+    async def test_partial_top_entities_match_full_sort(self):
+        state = monitoring_runner._JobState(
+            monitoring_runner.MonitoringJobStatusResponse(
+                job_id="top_k",
+                status="running",
+                progress=monitoring_runner.MonitoringJobProgress(
+                    total_queries=5, completed_queries=0, failed_queries=0
+                ),
+            )
+        )
+        seen: list[EntityIndexItem] = []
+        for batch in range(5):
+            entities = [
+                EntityIndexItem(
+                    platform=Platform.CHATGPT if index % 2 else Platform.PERPLEXITY,
+                    entity=f"Aktør {batch}-{index}",
+                    position=(index * 7 + batch) % 6 or None,
+                    mention_type="mention",
+                    sentiment="neutral",
+                    confidence=0.9,
+                )
+                for index in range(8)
+            ]
+            seen.extend(entities)
+            state.record_result(entities)
+
+        expected = sorted(
+            seen, key=lambda row: ((row.position or 999), row.platform, row.entity.lower())
+        )[:10]
+        self.assertEqual(state.job.partial_top_entities, expected)
+        self.assertEqual(state.job.progress.completed_queries, 5)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,134 @@
+import os
+import sys
+import unittest
+from unittest.mock import AsyncMock, patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from models.schemas import MonitoringJobProgress, MonitoringJobStatusResponse
+from services.monitoring_scheduler import InMemoryConfigStore, MonitoringScheduler
+
+
+def _config(config_id: str, created_at: str, cadence_sec: int | None = None) -> dict:
+    return {
+        "id": config_id,
+        "email": "user@example.com",
+        "profile_json": {
+            "business_name": "Grov Sykkel",
+            "industry": "bike_shop",
+            "size_band": "local",
+            "country": "NO",
+            "city": "Bergen",
+            "scope_level": "city",
+            "confidence": 0.8,
+        },
+        "competitors_json": [],
+        "queries_json": [
+            {"text": "beste sykkelbutikk i Bergen", "category": "local_discovery", "priority": 1}
+        ],
+        "platforms_json": ["ChatGPT"],
+        "cadence_sec": cadence_sec,
+        "created_at": created_at,
+    }
+
+
+class _Clock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class MonitoringSchedulerTests(unittest.IsolatedAsyncioTestCase):
+    def _scheduler(self, configs, clock, start_job, jitter_ratio=0.0, last_runs=None):
+        return MonitoringScheduler(
+            InMemoryConfigStore(configs, last_runs),
+            default_cadence_sec=3600,
+            jitter_ratio=jitter_ratio,
+            start_job=start_job,
+            clock=clock,
+        )
+
+    async def test_runs_config_on_cadence(self):
+        # 2026-01-01T00:00:00Z
+        created = 1767225600.0
+        clock = _Clock(created + 60)
+        start_job = AsyncMock(side_effect=["job_1", "job_2"])
+        scheduler = self._scheduler(
+            [_config("c1", "2026-01-01T00:00:00+00:00", cadence_sec=600)], clock, start_job
+        )
+
+        self.assertEqual(await scheduler.tick(), [])
+        self.assertEqual(scheduler.stats["next_runs"][0]["in_sec"], 540)
+
+        clock.now = created + 600
+        with patch(
+            "services.monitoring_scheduler.get_monitoring_job_status",
+            new=AsyncMock(return_value=None),
+        ):
+            self.assertEqual(await scheduler.tick(), ["job_1"])
+            self.assertEqual(await scheduler.tick(), [])
+            clock.now = created + 1230
+            self.assertEqual(await scheduler.tick(), ["job_2"])
+
+        kwargs = start_job.await_args.kwargs
+        self.assertEqual(kwargs["config_id"], "c1")
+        self.assertEqual(kwargs["profile"].business_name, "Grov Sykkel")
+        self.assertEqual(scheduler.stats["last_lag_sec"], 30)
+
+    async def test_skips_run_while_previous_job_active(self):
+        clock = _Clock(0.0)
+        start_job = AsyncMock(return_value="job_1")
+        scheduler = self._scheduler([_config("c1", None)], clock, start_job)
+        running = MonitoringJobStatusResponse(
+            job_id="job_1",
+            status="running",
+            progress=MonitoringJobProgress(total_queries=1, completed_queries=0, failed_queries=0),
+        )
+
+        await scheduler.tick()
+        clock.now = 3600
+        await scheduler.tick()
+        clock.now = 7200
+        with patch(
+            "services.monitoring_scheduler.get_monitoring_job_status",
+            new=AsyncMock(return_value=running),
+        ):
+            self.assertEqual(await scheduler.tick(), [])
+
+        start_job.assert_awaited_once()
+        self.assertEqual(scheduler.stats["skipped_active"], 1)
+
+    async def test_restart_resumes_from_latest_stored_job(self):
+        # Config created 2026-01-01, last job ran 2026-01-10T00:00Z; restart 1h later.
+        last_run = 1768003200.0
+        clock = _Clock(last_run + 3600)
+        start_job = AsyncMock(return_value="job_1")
+        scheduler = self._scheduler(
+            [_config("c1", "2026-01-01T00:00:00+00:00", cadence_sec=86400)],
+            clock,
+            start_job,
+            last_runs={"c1": "2026-01-10T00:00:00+00:00"},
+        )
+
+        self.assertEqual(await scheduler.tick(), [])
+        self.assertEqual(scheduler.stats["next_runs"][0]["in_sec"], 86400 - 3600)
+        clock.now = last_run + 7200
+        self.assertEqual(await scheduler.tick(), [])
+        start_job.assert_not_awaited()
+
+    async def test_jitter_spreads_first_runs(self):
+        clock = _Clock(0.0)
+        configs = [_config(f"c{i}", None) for i in range(20)]
+        scheduler = self._scheduler(configs, clock, AsyncMock(), jitter_ratio=0.5)
+
+        await scheduler.tick()
+
+        offsets = {row["in_sec"] for row in scheduler.stats["next_runs"]}
+        self.assertGreater(len(offsets), 1)
+        self.assertTrue(all(3600 <= offset <= 5400 for offset in offsets))
+
+
+if __name__ == "__main__":
+    unittest.main()
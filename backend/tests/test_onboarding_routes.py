@@ -83,14 +83,8 @@ class OnboardingRouteTests(unittest.TestCase):
         ]
 
         with patch(
-            "api.routes.infer_business_profile",
-            new=AsyncMock(return_value=profile),
-        ), patch(
-            "api.routes.suggest_competitors",
-            new=AsyncMock(return_value=competitors),
-        ), patch(
-            "api.routes.suggest_queries",
-            new=AsyncMock(return_value=queries),
+            "api.routes.bootstrap_onboarding",
+            new=AsyncMock(return_value=(profile, competitors, queries)),
         ):
             response = self.client.post(
                 "/api/v1/onboarding/bootstrap",
@@ -6,14 +6,31 @@ from unittest.mock import AsyncMock, patch
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
 from models.schemas import BusinessProfile, CompetitorCandidate
+from services.competitor_catalog import BUNDLED_CATALOG_PATH, CompetitorCatalog
 from services.onboarding_suggester import (
+    bootstrap_onboarding,
     infer_business_profile,
     suggest_competitors,
     suggest_queries,
 )
 
 
+def _uncataloged_market():
+    # Speculation only matters when the competitor LLM call is not skipped.
+    return patch(
+        "services.onboarding_suggester.competitor_catalog", CompetitorCatalog(promote_mentions=3)
+    )
+
+
 class OnboardingSuggesterTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        # Monitoring runs elsewhere in the suite enrich the shared catalog.
+        catalog = CompetitorCatalog(promote_mentions=3)
+        catalog.load_csv(BUNDLED_CATALOG_PATH)
+        patcher = patch("services.onboarding_suggester.competitor_catalog", catalog)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     async def test_infer_profile_sets_city_scope_for_local_business(self):
         with patch(
             "services.onboarding_suggester._llm_business_profile",
@@ -77,6 +94,106 @@ class OnboardingSuggesterTests(unittest.IsolatedAsyncioTestCase):
         city_mentions = sum(1 for item in queries if "bergen" in item.text.lower())
         self.assertGreaterEqual(city_mentions, 3)
 
+    async def test_bootstrap_keeps_speculative_suggestions_when_profile_agrees(self):
+        llm_profile = BusinessProfile(
+            business_name="Grov Sykkel Bergen",
+            industry="bike_shop",
+            size_band="local",
+            city="Bergen",
+            website="https://grovsykkel.no",
+            confidence=0.9,
+        )
+        competitors_mock = AsyncMock(
+            return_value=[CompetitorCandidate(name="Bergen Bike Shop", relevance_score=0.99)]
+        )
+        queries_mock = AsyncMock(return_value=[])
+
+        with _uncataloged_market(), patch(
+            "services.onboarding_suggester._llm_business_profile",
+            new=AsyncMock(return_value=llm_profile),
+        ), patch(
+            "services.onboarding_suggester._llm_competitors", new=competitors_mock
+        ), patch("services.onboarding_suggester._llm_queries", new=queries_mock):
+            profile, competitors, queries = await bootstrap_onboarding("Grov Sykkel Bergen")
+
+        self.assertEqual(competitors_mock.await_count, 1)
+        self.assertEqual(queries_mock.await_count, 1)
+        self.assertEqual(profile.website, "https://grovsykkel.no")
+        self.assertEqual(profile.scope_level, "city")
+        self.assertEqual(competitors[0].name, "Bergen Bike Shop")
+        self.assertGreaterEqual(
+            sum(1 for item in queries if "bergen" in item.text.lower()), 3
+        )
+
+    async def test_bootstrap_ignores_llm_rewording_of_the_same_profile(self):
+        llm_profile = BusinessProfile(
+            business_name="Grov Sykkel",
+            industry="Sykkelbutikk",
+            size_band="local",
+            country="Norge",
+            city="Bergen",
+            region="Vestland",
+            confidence=0.9,
+        )
+        competitors_mock = AsyncMock(return_value=[])
+        queries_mock = AsyncMock(return_value=[])
+
+        with _uncataloged_market(), patch(
+            "services.onboarding_suggester._llm_business_profile",
+            new=AsyncMock(return_value=llm_profile),
+        ), patch(
+            "services.onboarding_suggester._llm_competitors", new=competitors_mock
+        ), patch("services.onboarding_suggester._llm_queries", new=queries_mock):
+            profile, _, _ = await bootstrap_onboarding("Grov Sykkel Bergen")
+
+        self.assertEqual(profile.industry, "Sykkelbutikk")
+        self.assertEqual(competitors_mock.await_count, 1)
+        self.assertEqual(queries_mock.await_count, 1)
+
+    async def test_bootstrap_reruns_suggestions_when_profile_changes(self):
+        llm_profile = BusinessProfile(
+            business_name="Grov Sykkel",
+            industry="bike_shop",
+            size_band="local",
+            city="Trondheim",
+            region="Trondelag",
+        )
+        competitors_mock = AsyncMock(return_value=[])
+        queries_mock = AsyncMock(return_value=[])
+
+        with _uncataloged_market(), patch(
+            "services.onboarding_suggester._llm_business_profile",
+            new=AsyncMock(return_value=llm_profile),
+        ), patch(
+            "services.onboarding_suggester._llm_competitors", new=competitors_mock
+        ), patch("services.onboarding_suggester._llm_queries", new=queries_mock):
+            profile, _, queries = await bootstrap_onboarding("Grov Sykkel Bergen")
+
+        self.assertEqual(profile.city, "Trondheim")
+        self.assertEqual(competitors_mock.call_count, 2)
+        self.assertEqual(competitors_mock.call_args.args[0].city, "Trondheim")
+        self.assertEqual(queries_mock.call_args.args[0].city, "Trondheim")
+        self.assertTrue(any("trondheim" in item.text.lower() for item in queries))
+
+    async def test_bootstrap_skips_competitor_llm_for_cataloged_markets(self):
+        fetch = AsyncMock(return_value=[])
+
+        for raw_input in ("Grov Sykkel Oslo", "DNB"):
+            with patch(
+                "services.onboarding_suggester._llm_business_profile",
+                new=AsyncMock(return_value=None),
+            ), patch(
+                "services.onboarding_suggester._fetch_competitors", new=fetch
+            ), patch(
+                "services.onboarding_suggester._llm_queries", new=AsyncMock(return_value=[])
+            ):
+                profile, competitors, _ = await bootstrap_onboarding(raw_input)
+
+            self.assertGreaterEqual(len(competitors), 5, raw_input)
+            self.assertNotIn(profile.business_name, [row.name for row in competitors])
+
+        fetch.assert_not_awaited()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,92 @@
+import asyncio
+import os
+import sys
+import unittest
+
+import httpx
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from services.rate_limiter import ProviderLimiter, TokenBucket
+
+
+def _http_error(status_code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://api.example.no")
+    response = httpx.Response(status_code, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+class RateLimiterTests(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrency_never_exceeds_window(self):
+        # max_concurrency caps the window so successes cannot grow it past 2
+        limiter = ProviderLimiter("test", rpm=0, tpm=0, max_concurrency=2)
+        limiter.window = 2.0
+        active = 0
+        peak = 0
+
+        async def call():
+            nonlocal active, peak
+            async with limiter.slot():
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*[call() for _ in range(10)])
+
+        self.assertLessEqual(peak, 2)
+        self.assertEqual(limiter.stats["in_flight"], 0)
+        self.assertEqual(limiter.successes, 10)
+
+    async def test_cancelled_wakeup_is_passed_to_next_waiter(self):
+        limiter = ProviderLimiter("test", rpm=0, tpm=0, max_concurrency=1)
+        held = limiter.slot()
+        await held.__aenter__()
+
+        async def waiter():
+            async with limiter.slot():
+                pass
+
+        first = asyncio.create_task(waiter())
+        second = asyncio.create_task(waiter())
+        await asyncio.sleep(0)
+        self.assertEqual(limiter.stats["waiting"], 2)
+
+        # Releasing wakes ``first``; cancel it before it gets to run.
+        await held.__aexit__(None, None, None)
+        first.cancel()
+
+        await asyncio.wait_for(second, timeout=1.0)
+        self.assertTrue(first.cancelled())
+        self.assertEqual(limiter.stats["in_flight"], 0)
+
+    async def test_window_grows_on_success_and_halves_on_throttle(self):
+        limiter = ProviderLimiter("test", rpm=0, tpm=0, max_concurrency=16)
+        start = limiter.window
+        for _ in range(20):
+            async with limiter.slot():
+                pass
+        grown = limiter.window
+        self.assertGreater(grown, start)
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            async with limiter.slot():
+                raise _http_error(429)
+        self.assertAlmostEqual(limiter.window, max(1.0, grown / 2.0))
+
+        window = limiter.window
+        with self.assertRaises(httpx.HTTPStatusError):
+            async with limiter.slot():
+                raise _http_error(400)
+        self.assertEqual(limiter.window, window)
+        self.assertEqual(limiter.throttles, 1)
+
+    def test_token_bucket_reports_wait_when_empty(self):
+        bucket = TokenBucket(rate_per_min=60, burst_sec=1)
+        self.assertEqual(bucket.reserve(1), 0.0)
+        self.assertGreater(bucket.reserve(1), 0.0)
+        self.assertEqual(TokenBucket(rate_per_min=0).reserve(1000), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from services import perplexity_service
+from services.response_cache import ResponseCache, response_cache, response_cache_key
+
+
+class _FakeResponse:
+    def raise_for_status(self):
+        return None
+
+    def json(self):
+        return {
+            "choices": [{"message": {"content": "1. Grov Sykkel"}}],
+            "citations": ["https://example.no"],
+        }
+
+
+class _FakeClient:
+    def __init__(self):
+        self.calls = 0
+
+    async def post(self, *_args, **_kwargs):
+        self.calls += 1
+        return _FakeResponse()
+
+
+class ResponseCacheTests(unittest.IsolatedAsyncioTestCase):
+    def tearDown(self):
+        response_cache.clear()
+
+    def test_key_uses_normalized_query_and_system_prompt(self):
+        key = response_cache_key("Perplexity", "sonar", "Beste  sykkelbutikk i BERGEN")
+        self.assertEqual(key, response_cache_key("Perplexity", "sonar", "beste sykkelbutikk i bergen"))
+        self.assertNotEqual(
+            key,
+            response_cache_key("Perplexity", "sonar", "beste sykkelbutikk i bergen", "system"),
+        )
+        self.assertNotEqual(key, response_cache_key("ChatGPT", "sonar", "beste sykkelbutikk i bergen"))
+
+    async def test_memory_tier_is_lru_bounded_and_expires(self):
+        cache = ResponseCache(ttl_sec=60, max_entries=2)
+        await cache.set("a", {"response": "a"})
+        await cache.set("b", {"response": "b"})
+        await cache.get("a")
+        await cache.set("c", {"response": "c"})
+
+        self.assertIsNotNone(await cache.get("a"))
+        self.assertIsNone(await cache.get("b"))
+
+        expired = ResponseCache(ttl_sec=0, max_entries=2)
+        await expired.set("a", {"response": "a"})
+        self.assertIsNone(await expired.get("a"))
+
+    async def test_sqlite_tier_survives_new_instance(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "llm_cache.sqlite3")
+            await ResponseCache(ttl_sec=60, max_entries=8, path=path).set("k", {"response": "svar"})
+            restored = ResponseCache(ttl_sec=60, max_entries=8, path=path)
+            self.assertEqual(await restored.get("k"), {"response": "svar"})
+
+    async def test_repeated_query_is_served_from_cache(self):
+        client = _FakeClient()
+        with patch.object(perplexity_service, "get_http_client", return_value=client), patch.object(
+            perplexity_service, "settings", MagicMock(perplexity_api_key="key")
+        ):
+            first = await perplexity_service.query_perplexity("beste sykkelbutikk i Bergen")
+            second = await perplexity_service.query_perplexity("Beste sykkelbutikk i  Bergen")
+
+        self.assertEqual(client.calls, 1)
+        self.assertNotIn("cached", first)
+        self.assertTrue(second["cached"])
+        self.assertEqual(second["query"], "Beste sykkelbutikk i  Bergen")
+        self.assertEqual(second["response"], first["response"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import AsyncMock, patch
+
+import httpx
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from services.retry import RetryController, retry_after_seconds
+
+
+def _http_error(status_code: int, headers: dict | None = None) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://api.example.no")
+    response = httpx.Response(status_code, request=request, headers=headers or {})
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+def _controller(**overrides) -> RetryController:
+    options = {
+        "max_attempts": 3,
+        "base_delay_sec": 0.001,
+        "max_delay_sec": 0.01,
+        "budget_ratio": 0.2,
+    }
+    options.update(overrides)
+    return RetryController("test", **options)
+
+
+class RetryTests(unittest.IsolatedAsyncioTestCase):
+    async def test_transient_error_is_retried(self):
+        fn = AsyncMock(side_effect=[_http_error(502), {"ok": True}])
+
+        result = await _controller().run(fn)
+
+        self.assertEqual(result, {"ok": True})
+        self.assertEqual(fn.await_count, 2)
+
+    async def test_client_error_is_not_retried(self):
+        fn = AsyncMock(side_effect=_http_error(400))
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            await _controller().run(fn)
+        self.assertEqual(fn.await_count, 1)
+
+    async def test_retry_after_sets_minimum_delay(self):
+        error = _http_error(429, {"Retry-After": "2"})
+        self.assertEqual(retry_after_seconds(error), 2.0)
+
+        sleep = AsyncMock()
+        fn = AsyncMock(side_effect=[error, {"ok": True}])
+        with patch("services.retry.asyncio.sleep", new=sleep):
+            await _controller().run(fn)
+
+        self.assertGreaterEqual(sleep.await_args.args[0], 2.0)
+
+    async def test_exhausted_budget_stops_retries(self):
+        controller = _controller(budget_cap=1.0, budget_ratio=0.0)
+        fn = AsyncMock(side_effect=_http_error(503))
+
+        with self.assertRaises(httpx.HTTPStatusError):
+            await controller.run(fn)
+
+        self.assertEqual(fn.await_count, 2)
+        self.assertEqual(controller.budget_exhausted, 1)
+
+    async def test_hedged_request_wins_when_primary_is_slow(self):
+        controller = _controller(hedge=True, hedge_min_samples=1)
+        controller._latencies.append(0.01)
+        calls = 0
+
+        async def fn():
+            nonlocal calls
+            calls += 1
+            call = calls
+            async with controller.timed():
+                await asyncio.sleep(1.0 if call == 1 else 0.0)
+            return call
+
+        result = await asyncio.wait_for(controller.run(fn), timeout=0.5)
+
+        self.assertEqual(result, 2)
+        self.assertEqual(controller.hedges, 1)
+        self.assertEqual(controller.hedge_wins, 1)
+
+    async def test_hedge_delay_excludes_time_queued_for_a_slot(self):
+        controller = _controller(hedge=True, hedge_min_samples=1)
+        controller._latencies.append(0.05)
+        slot = asyncio.Lock()
+        calls = 0
+
+        async def fn():
+            nonlocal calls
+            calls += 1
+            async with slot, controller.timed():
+                await asyncio.sleep(0.01)
+            return calls
+
+        async with slot:
+            task = asyncio.ensure_future(controller.run(fn))
+            # Queued well past the p95 without holding a slot: no hedge yet.
+            await asyncio.sleep(0.2)
+            self.assertEqual(controller.hedges, 0)
+
+        self.assertEqual(await task, 1)
+        self.assertEqual(controller.hedges, 0)
+        self.assertEqual(len(controller._latencies), 2)
+        self.assertLess(controller._latencies[-1], 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
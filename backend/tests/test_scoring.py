@@ -0,0 +1,111 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+
+from services.scoring import (
+    analyze_response,
+    calculate_visibility_score,
+    columns_from_analyses,
+    response_points,
+    score_batch,
+)
+
+
+class AnalyzeResponseTests(unittest.TestCase):
+    def test_ranked_recommendation_with_citation(self):
+        text = (
+            "Her er de beste bankene i Norge:\n1. Nordea\n"
+            "2. **DNB** – pålitelig og ledende\n3. Sbanken\n"
+            "Les mer: https://www.dnb.no/privat."
+        )
+        result = analyze_response(text, "DNB")
+
+        self.assertEqual(result["mention_type"], "recommendation")
+        self.assertEqual(result["sentiment"], "positive")
+        self.assertEqual(result["position"], 2)
+        self.assertEqual(result["citation_url"], "https://www.dnb.no/privat")
+        self.assertEqual(result["snippet"], text)
+
+    def test_negative_comparison(self):
+        result = analyze_response(
+            "Sammenlignet med Nordea er DNB dyr, og mange kunder klager på treg kundeservice.",
+            "DNB",
+        )
+
+        self.assertEqual(result["mention_type"], "comparison")
+        self.assertEqual(result["sentiment"], "negative")
+        self.assertIsNone(result["position"])
+        self.assertIsNone(result["citation_url"])
+
+    def test_variation_match_without_brand_in_text(self):
+        result = analyze_response(
+            "Grov har god service, men noen mener prisene er dyre.\n- Grov\n- Bergen Bike Shop",
+            "Grov Sykkel",
+            ["Grov"],
+        )
+
+        self.assertTrue(result["mentioned"])
+        self.assertEqual(result["mention_type"], "mention")
+        self.assertEqual(result["sentiment"], "mixed")
+        self.assertEqual(result["snippet"][:4], "Grov")
+
+    def test_list_position_uses_first_numbered_line_with_a_name(self):
+        text = "DNB er stor.\n1. Nordea\n2. Sbanken\n3) dnb bank\n4. DNB igjen"
+        self.assertEqual(analyze_response(text, "DNB")["position"], 3)
+
+    def test_absent_brand(self):
+        result = analyze_response("Ingen relevante aktører funnet.", "DNB")
+
+        self.assertFalse(result["mentioned"])
+        self.assertEqual(result["mention_type"], "absent")
+        self.assertEqual(result["snippet"], "Ingen relevante aktører funnet.")
+
+
+class ScoreBatchTests(unittest.TestCase):
+    def test_matches_row_by_row_scoring(self):
+        analyses = [
+            {"mentioned": True, "mention_type": "recommendation", "sentiment": "positive",
+             "position": 1, "citation_url": "https://dnb.no"},
+            {"mentioned": True, "mention_type": "comparison", "sentiment": "negative",
+             "position": 3, "citation_url": None},
+            {"mentioned": True, "mention_type": None, "sentiment": "unknown",
+             "position": None, "citation_url": ""},
+            {"mentioned": True, "sentiment": "mixed", "position": 7},
+            {"mentioned": False, "mention_type": "absent", "sentiment": "neutral",
+             "position": None, "citation_url": None},
+        ]
+        groups = ["ChatGPT", "Perplexity", "ChatGPT", "Perplexity", "ChatGPT"]
+
+        result = score_batch(columns_from_analyses(analyses), groups=groups)
+
+        self.assertEqual(result.points.tolist(), [response_points(a) for a in analyses])
+        self.assertEqual(result.visibility_score, calculate_visibility_score(analyses))
+        for label in set(groups):
+            rows = [a for a, group in zip(analyses, groups) if group == label]
+            self.assertEqual(result.group_scores[label], calculate_visibility_score(rows))
+
+    def test_accepts_plain_columns_and_empty_batches(self):
+        result = score_batch(
+            {
+                "mentioned": [True, True],
+                "mention_type": np.array(["mention", "recommendation"]),
+                "sentiment": ["neutral", "positive"],
+                "position": [np.nan, 0],
+                "has_citation": [False, True],
+            }
+        )
+        self.assertEqual(result.points.tolist(), [60, 100])
+        self.assertEqual(result.visibility_score, 80.0)
+
+        empty = score_batch(
+            {"mentioned": [], "mention_type": [], "sentiment": [], "position": [], "has_citation": []}
+        )
+        self.assertEqual(empty.visibility_score, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
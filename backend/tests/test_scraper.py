@@ -0,0 +1,154 @@
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from services import scraper
+
+HEAD = (
+    "<!doctype html><html><head>"
+    "<title>Grov Sykkel | Sykler i Bergen</title>"
+    '<meta name="description" content="Sykler &amp; service i Bergen">'
+    "</head>"
+)
+
+
+class _Body(httpx.AsyncByteStream):
+    def __init__(self, chunks: list[bytes]):
+        self.chunks = chunks
+        self.sent = 0
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            self.sent += 1
+            yield chunk
+
+
+def _client_factory(body: _Body | None = None, handler=None):
+    real_client = httpx.AsyncClient
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, headers={"content-type": "text/html; charset=utf-8"}, stream=body
+        )
+
+    def factory(**kwargs):
+        transport = httpx.MockTransport(handler or respond)
+        return real_client(transport=transport, **kwargs)
+
+    return factory
+
+
+class ScraperTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        scraper.domain_cache.clear()
+
+    async def test_reads_only_until_head_ends(self):
+        body = _Body([HEAD[:40].encode(), HEAD[40:].encode()] + [b"<p>x</p>" * 1000] * 50)
+
+        with patch("services.scraper.httpx.AsyncClient", new=_client_factory(body)):
+            result = await scraper.extract_brand_from_url("www.grovsykkel.no")
+
+        self.assertEqual(result["brand_name"], "Grov Sykkel")
+        self.assertEqual(result["domain"], "grovsykkel.no")
+        self.assertEqual(result["description"], "Sykler & service i Bergen")
+        self.assertEqual(body.sent, 2)
+
+    async def test_stops_at_byte_cap_without_head_end(self):
+        chunk = b"<meta name='x' content='y'>" * 100
+        body = _Body([b"<html><head>"] + [chunk] * 50)
+
+        with patch("services.scraper.httpx.AsyncClient", new=_client_factory(body)), patch.object(
+            scraper.settings, "scraper_max_head_bytes", len(chunk) * 3
+        ):
+            result = await scraper.extract_brand_from_url("https://grovsykkel.no")
+
+        self.assertEqual(result["brand_name"], "Grovsykkel")
+        self.assertLessEqual(body.sent, 4)
+
+
+class DomainCacheTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        scraper.domain_cache.clear()
+
+    async def test_fresh_hit_then_conditional_revalidation(self):
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, headers={"etag": '"v1"'}, content=HEAD.encode())
+
+        with patch("services.scraper.httpx.AsyncClient", new=_client_factory(handler=handler)):
+            first = await scraper.extract_brand_from_url("https://www.dnb.no")
+            second = await scraper.extract_brand_from_url("dnb.no/privat")
+            self.assertEqual(len(requests), 1)
+
+            entry = scraper.domain_cache.get("dnb.no")
+            entry.fresh_until = 0
+            third = await scraper.extract_brand_from_url("https://dnb.no")
+
+        self.assertEqual(first, second)
+        self.assertEqual(third, first)
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(requests[1].headers["if-none-match"], '"v1"')
+        stats = scraper.domain_cache.stats
+        self.assertEqual((stats["hits"], stats["revalidations"], stats["not_modified"]), (1, 1, 1))
+        self.assertTrue(scraper.domain_cache.get("dnb.no").fresh)
+
+    async def test_unreachable_host_is_negatively_cached(self):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            raise httpx.ConnectTimeout("timeout", request=request)
+
+        with patch("services.scraper.httpx.AsyncClient", new=_client_factory(handler=handler)):
+            first = await scraper.extract_brand_from_url("https://nede.no")
+            second = await scraper.extract_brand_from_url("https://nede.no")
+
+        self.assertEqual(first["brand_name"], "Nede")
+        self.assertEqual(second, first)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(scraper.domain_cache.stats["negative_hits"], 1)
+
+    async def test_http_error_is_not_negatively_cached(self):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(403, text="blocked")
+
+        with patch("services.scraper.httpx.AsyncClient", new=_client_factory(handler=handler)):
+            first = await scraper.extract_brand_from_url("https://blokkert.no")
+            await scraper.extract_brand_from_url("https://blokkert.no")
+
+        self.assertEqual(first["brand_name"], "Blokkert")
+        self.assertEqual(len(calls), 2)
+        self.assertFalse(scraper.domain_cache.is_unreachable("blokkert.no"))
+
+    async def test_concurrent_misses_share_one_fetch(self):
+        calls = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, headers={"content-type": "text/html"}, text=HEAD)
+
+        with patch("services.scraper.httpx.AsyncClient", new=_client_factory(handler=handler)):
+            results = await asyncio.gather(
+                *[scraper.extract_brand_from_url("https://grovsykkel.no") for _ in range(5)]
+            )
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result["brand_name"] == "Grov Sykkel" for result in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import AsyncMock, patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from models.schemas import Platform
+from services import query_capture
+from services.single_flight import SingleFlight
+
+
+class SingleFlightTests(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_identical_keys_share_one_call(self):
+        flight = SingleFlight("test")
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return {"response": "svar"}
+
+        results = await asyncio.gather(
+            *[flight.do("same", fetch) for _ in range(5)],
+            flight.do("other", fetch),
+        )
+
+        self.assertEqual(calls, 2)
+        self.assertEqual(flight.coalesced, 4)
+        self.assertEqual(flight.stats["inflight"], 0)
+        self.assertTrue(all(row["response"] == "svar" for row in results))
+
+    async def test_query_platform_coalesces_normalized_queries(self):
+        async def slow_answer(query):
+            await asyncio.sleep(0.02)
+            return {"model": "sonar", "response": "1. Grov Sykkel", "citations": [], "error": None}
+
+        provider = AsyncMock(side_effect=slow_answer)
+        with patch("services.query_capture.query_perplexity", new=provider):
+            first, second = await asyncio.gather(
+                query_capture.capture_platform(Platform.PERPLEXITY, "beste sykkelbutikk i Bergen"),
+                query_capture.capture_platform(Platform.PERPLEXITY, "Beste sykkelbutikk i bergen"),
+            )
+
+        self.assertEqual(provider.await_count, 1)
+        self.assertEqual(first["raw_output"], second["raw_output"])
+        self.assertEqual(second["query"], "Beste sykkelbutikk i bergen")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import json
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from models.schemas import (
+    BusinessProfile,
+    EntityIndexItem,
+    ModelOutput,
+    MonitoringSnapshot,
+    Platform,
+    QueryCaptureResult,
+    SuggestedQuery,
+)
+from services.snapshot_codec import decode_snapshot, encode_snapshot, is_compact
+
+
+def _run(text: str, answer: str, entities: list[str]) -> QueryCaptureResult:
+    return QueryCaptureResult(
+        query=text,
+        query_normalized=text.lower(),
+        run_id=f"run_{text}",
+        created_at="2026-10-18T00:00:00+00:00",
+        outputs=[
+            ModelOutput(
+                platform=platform,
+                model="gpt-4.1-mini",
+                query=text,
+                raw_output=answer,
+                snippet=answer[:20],
+                citations=["https://grovsykkel.no"],
+                error="timeout" if platform == Platform.PERPLEXITY else None,
+                cached=platform == Platform.CHATGPT,
+            )
+            for platform in (Platform.CHATGPT, Platform.PERPLEXITY)
+        ],
+        entity_index=[
+            EntityIndexItem(
+                platform=Platform.CHATGPT,
+                entity=name,
+                position=index + 1 if index else None,
+                mention_type="list",
+                sentiment="positive",
+                confidence=0.8,
+            )
+            for index, name in enumerate(entities)
+        ],
+        summary="ok",
+    )
+
+
+def _snapshot(runs: list[QueryCaptureResult], aggregated=None) -> MonitoringSnapshot:
+    return MonitoringSnapshot(
+        config_id="config_1",
+        run_id="run_1",
+        created_at="2026-10-18T00:00:00+00:00",
+        profile=BusinessProfile(
+            business_name="Grov Sykkel", industry="bike_shop", size_band="local"
+        ),
+        selected_competitors=[],
+        active_queries=[
+            SuggestedQuery(text=run.query, category="local_discovery", priority=1) for run in runs
+        ],
+        platforms=[Platform.CHATGPT, Platform.PERPLEXITY],
+        query_runs=runs,
+        aggregated_entities=(
+            aggregated
+            if aggregated is not None
+            else [row for run in runs for row in run.entity_index]
+        ),
+        summary="ferdig",
+        run_mode="delta",
+        carried_queries=["b"],
+        carried_runs={"b": 2},
+        drift=0.05,
+    )
+
+
+class SnapshotCodecTests(unittest.TestCase):
+    def test_round_trip_and_text_stored_once(self):
+        answer = "1. Grov Sykkel\n2. Bergen Bike Shop " * 20
+        snapshot = _snapshot(
+            [_run("a", answer, ["Grov Sykkel", "Bergen Bike Shop"]), _run("b", answer, ["X"])]
+        )
+
+        compact = json.loads(json.dumps(encode_snapshot(snapshot)))
+
+        self.assertTrue(is_compact(compact))
+        self.assertEqual(len(compact["texts"]), 1)
+        self.assertIsNone(compact["aggregated_entities"])
+        self.assertEqual(len(compact["entities"]["entity"]), 3)
+        self.assertEqual(decode_snapshot(compact), snapshot)
+
+    def test_aggregated_entities_that_differ_from_runs_are_kept(self):
+        runs = [_run("a", "svar", ["Grov Sykkel"])]
+        aggregated = list(reversed(runs[0].entity_index)) + runs[0].entity_index
+        snapshot = _snapshot(runs, aggregated=aggregated)
+
+        decoded = decode_snapshot(encode_snapshot(snapshot))
+
+        self.assertEqual(decoded.aggregated_entities, aggregated)
+
+    def test_plain_snapshot_json_still_decodes(self):
+        snapshot = _snapshot([_run("a", "svar", ["Grov Sykkel"])])
+        self.assertEqual(decode_snapshot(snapshot.model_dump(mode="json")), snapshot)
+
+
+if __name__ == "__main__":
+    unittest.main()
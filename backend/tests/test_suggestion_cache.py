@@ -0,0 +1,98 @@
+import os
+import sys
+import unittest
+from unittest.mock import AsyncMock, patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from models.schemas import BusinessProfile, CompetitorCandidate, SuggestedQuery
+from services.onboarding_suggester import suggest_queries
+from services.suggestion_cache import (
+    SuggestionCache,
+    competitor_fingerprint,
+    profile_fingerprint,
+    suggestion_cache,
+)
+
+
+def _profile(**overrides):
+    data = {
+        "business_name": "Grov Sykkel",
+        "industry": "bike_shop",
+        "size_band": "local",
+        "country": "NO",
+        "city": "Bergen",
+        "scope_level": "city",
+        "confidence": 0.7,
+    }
+    data.update(overrides)
+    return BusinessProfile(**data)
+
+
+class SuggestionCacheTests(unittest.IsolatedAsyncioTestCase):
+    def tearDown(self):
+        suggestion_cache.clear()
+
+    def test_fingerprints_ignore_confidence_case_and_order(self):
+        self.assertEqual(
+            profile_fingerprint(_profile()),
+            profile_fingerprint(_profile(business_name=" grov  sykkel ", confidence=0.95)),
+        )
+        self.assertNotEqual(
+            profile_fingerprint(_profile()), profile_fingerprint(_profile(city="Oslo"))
+        )
+
+        first = CompetitorCandidate(name="Bergen Bike Shop", domain="bike.no", relevance_score=0.9)
+        second = CompetitorCandidate(name="Sykkelhuset Bergen", relevance_score=0.8)
+        self.assertEqual(
+            competitor_fingerprint([first, second]), competitor_fingerprint([second, first])
+        )
+        self.assertNotEqual(
+            competitor_fingerprint([first, second]), competitor_fingerprint([first])
+        )
+
+    async def test_empty_results_are_not_cached_and_hits_are_copies(self):
+        cache = SuggestionCache(ttl_sec=60, max_entries=4)
+        fetch = AsyncMock(return_value=[])
+        await cache.get_or_fetch("key", fetch)
+        await cache.get_or_fetch("key", fetch)
+        self.assertEqual(fetch.await_count, 2)
+
+        row = SuggestedQuery(text="beste sykkelbutikk i Bergen", category="local", priority=7)
+        fetch = AsyncMock(return_value=[row])
+        first = await cache.get_or_fetch("other", fetch)
+        first[0].priority = 1
+        second = await cache.get_or_fetch("other", fetch)
+        self.assertEqual(fetch.await_count, 1)
+        self.assertEqual(second[0].priority, 7)
+
+    async def test_recompute_with_reordered_competitors_hits_cache(self):
+        competitors = [
+            CompetitorCandidate(name="Bergen Bike Shop", relevance_score=0.9),
+            CompetitorCandidate(name="Sykkelhuset Bergen", relevance_score=0.8),
+            CompetitorCandidate(name="Pedal & Co Bergen", relevance_score=0.7),
+        ]
+        fetch = AsyncMock(
+            return_value=[
+                SuggestedQuery(text="Grov Sykkel vs Bergen Bike Shop", category="comparison", priority=1)
+            ]
+        )
+
+        with patch("services.onboarding_suggester._fetch_queries", new=fetch):
+            first = await suggest_queries(_profile(), competitors, limit=12)
+            second = await suggest_queries(
+                _profile(confidence=0.9), list(reversed(competitors)), limit=12
+            )
+
+        self.assertEqual(fetch.await_count, 1)
+        self.assertEqual(first[0].text, "Grov Sykkel vs Bergen Bike Shop")
+        self.assertEqual(second[0].text, "Grov Sykkel vs Bergen Bike Shop")
+        self.assertEqual(
+            [row.name for row in fetch.call_args.args[1]],
+            ["Bergen Bike Shop", "Sykkelhuset Bergen", "Pedal & Co Bergen"],
+        )
+        self.assertEqual(suggestion_cache.stats["hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import asyncio
+import os
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from db import supabase as supabase_db
+
+
+class _FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class _FakeRequest:
+    def __init__(self, table, delay_sec=0.0):
+        self._table = table
+        self._delay_sec = delay_sec
+        self.payload = None
+
+    def select(self, *_args):
+        return self
+
+    def eq(self, *_args):
+        return self
+
+    def insert(self, payload):
+        self.payload = payload
+        return self
+
+    def upsert(self, payload, on_conflict=None):
+        self.payload = payload
+        return self
+
+    def execute(self):
+        if self._delay_sec:
+            time.sleep(self._delay_sec)
+        rows = self.payload if isinstance(self.payload, list) else [self.payload]
+        if any(isinstance(row, dict) and row.get("query") == "bad" for row in rows):
+            raise ValueError("invalid row")
+        self._table.executed.append(self.payload)
+        return _FakeResponse([])
+
+
+class _FakeTable:
+    def __init__(self, delay_sec=0.0):
+        self.delay_sec = delay_sec
+        self.executed = []
+
+    def request(self):
+        return _FakeRequest(self, self.delay_sec)
+
+
+class _FakeClient:
+    def __init__(self, delay_sec=0.0):
+        self.tables = {}
+        self.delay_sec = delay_sec
+
+    def table(self, name):
+        table = self.tables.setdefault(name, _FakeTable(self.delay_sec))
+        return table.request()
+
+
+class SupabaseDbTests(unittest.IsolatedAsyncioTestCase):
+    async def test_blocking_execute_does_not_stall_event_loop(self):
+        client = _FakeClient(delay_sec=0.2)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        with patch("db.supabase.get_client", return_value=client):
+            ticker_task = asyncio.create_task(ticker())
+            allowed = await asyncio.gather(
+                *[supabase_db.check_free_limit(f"user{idx}@example.com") for idx in range(4)]
+            )
+            ticker_task.cancel()
+
+        self.assertTrue(all(allowed))
+        self.assertGreaterEqual(ticks, 10)
+
+    async def test_write_buffer_batches_rows_and_retries_bad_rows_individually(self):
+        client = _FakeClient()
+        buffer = supabase_db.QueryRunWriteBuffer(max_rows=100, flush_interval_sec=60)
+
+        def capture(query):
+            return {
+                "query": query,
+                "query_normalized": query,
+                "created_at": "2026-02-10T12:00:00Z",
+                "outputs": [
+                    {"platform": "ChatGPT", "model": "gpt-4.1-mini", "raw_output": "a"},
+                    {"platform": "Perplexity", "model": "sonar", "raw_output": "b"},
+                ],
+                "entity_index": [],
+            }
+
+        with patch("db.supabase.get_client", return_value=client):
+            for idx in range(12):
+                await buffer.add("User@Example.com", capture(f"query {idx}"))
+            await buffer.close()
+
+            executed = client.tables["query_runs"].executed
+            self.assertEqual(len(executed), 1)
+            self.assertEqual(len(executed[0]), 24)
+            self.assertEqual(buffer.stored_rows, 24)
+
+            stored = await supabase_db.store_query_run_rows(
+                supabase_db.build_query_run_rows("user@example.com", capture("ok"))
+                + supabase_db.build_query_run_rows("user@example.com", capture("bad"))
+            )
+
+        self.assertEqual(stored, 2)
+        self.assertEqual(len(executed), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
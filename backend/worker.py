@@ -0,0 +1,66 @@
+"""Monitoring job worker entry point.
+
+Run one or more of these next to the API when ``job_queue_backend`` is a
+durable queue:
+
+    python worker.py
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import socket
+from uuid import uuid4
+
+from config import settings
+from db import supabase as supabase_db
+from services import perplexity_service
+from services.capture_scheduler import capture_scheduler
+from services.job_queue import job_queue
+from services.monitoring_runner import run_queued_job
+
+logger = logging.getLogger("worker")
+
+
+async def run_worker(worker_id: str, *, once: bool = False) -> None:
+    """Claim and run queued monitoring jobs until cancelled (or drained with ``once``)."""
+    if job_queue is None:
+        raise SystemExit("job_queue_backend is 'inline'; jobs run inside the API process.")
+
+    await perplexity_service.open_http_client()
+    try:
+        while True:
+            queued = await job_queue.claim(worker_id, settings.job_queue_lease_sec)
+            if queued is None:
+                if once:
+                    return
+                await asyncio.sleep(settings.job_queue_poll_interval_sec)
+                continue
+
+            logger.info("Running job %s (attempt %d)", queued.job_id, queued.attempts)
+            try:
+                await run_queued_job(queued, worker_id)
+            except Exception:
+                logger.exception("Job %s failed", queued.job_id)
+    finally:
+        await capture_scheduler.close()
+        await perplexity_service.close_http_client()
+        supabase_db.shutdown_executor()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run monitoring jobs from the job queue.")
+    parser.add_argument(
+        "--worker-id",
+        default=f"{socket.gethostname()}-{os.getpid()}-{uuid4().hex[:6]}",
+    )
+    parser.add_argument("--once", action="store_true", help="Exit when the queue is empty.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_worker(args.worker_id, once=args.once))
+
+
+if __name__ == "__main__":
+    main()